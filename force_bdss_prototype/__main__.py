@@ -1,3 +1,15 @@
+import argparse
+import os
+
+parser = argparse.ArgumentParser(prog="force_bdss_prototype")
+parser.add_argument("--workers", type=int, default=1,
+                    help="number of forked processes solving the weights "
+                         "concurrently (Linux only), 1 to solve them in "
+                         "this process")
+args = parser.parse_args()
+#the arguments are not Kivy's
+os.environ["KIVY_NO_ARGS"] = "1"
+
 from force_bdss_prototype.mco.MCOwrapper import MCOwrapper
 
 A = {"name": "eductA", "manufacturer": "", "pdi": 0}
@@ -6,5 +18,5 @@ C = {"name": "contamination", "manufacturer": "", "pdi": 0}
 P = {"name": "product", "manufacturer": "", "pdi": 0}
 RP = {"reactants": [A, B], "products": [P]}
 
-MCO = MCOwrapper(RP, C)
+MCO = MCOwrapper(RP, C, workers=args.workers)
 MCO.solve()
@@ -22,9 +22,9 @@ class Attributes:
 
         Returns
         -------
-        (a, grad_y_a): tuple[numpy.array, sympy.Matrix]
+        (a, grad_y_a): tuple[numpy.array, numpy.array]
             A tuple consisting of a numpy array containing the attribute values
-            calculated from the y-dimension and a sympy.Matrix containing the
+            calculated from the y-dimension and a numpy array containing the
             y_a gradient matrix 
         """
         a = np.zeros(9, dtype=np.float)
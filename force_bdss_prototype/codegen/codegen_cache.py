@@ -0,0 +1,170 @@
+import hashlib
+import os
+
+import sympy
+from sympy import cse, numbered_symbols
+try:
+    from sympy.printing.numpy import NumPyPrinter
+except ImportError:
+    from sympy.printing.pycode import NumPyPrinter
+
+#: Environment variable overriding the cache directory. An empty value
+#: disables the on-disk cache.
+CACHE_DIR_ENV = "FORCE_BDSS_PROTOTYPE_CACHE_DIR"
+
+#: Version of the generated source, part of every cache key
+CODEGEN_VERSION = 2
+
+
+def cache_dir():
+    """
+    Directory of the generated functions
+
+    Returns
+    -------
+    String
+        The directory named by FORCE_BDSS_PROTOTYPE_CACHE_DIR, or
+        ~/.cache/force_bdss_prototype if it is not set. An empty string
+        means that generated functions are not cached.
+    """
+    default = os.path.join(os.path.expanduser("~"), ".cache",
+                           "force_bdss_prototype")
+    return os.environ.get(CACHE_DIR_ENV, default)
+
+
+def cache_key(key_parts, args):
+    """
+    SHA-256 key of a set of generated functions
+
+    Parameters
+    ----------
+    key_parts: list
+        Everything the expressions depend on, e.g. the expression strings
+        and the values of the fixed parameters
+    args: list[String]
+        Names of the arguments of the functions
+
+    Returns
+    -------
+    String
+        Hexadecimal digest of the key parts, the arguments, the sympy
+        version and the code generation version
+    """
+    text = repr((list(key_parts), list(args), sympy.__version__,
+                 CODEGEN_VERSION))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def generate_source(args, expressions, fused=False):
+    """
+    Generates the source of a module of NumPy functions f0, f1, ... of
+    `args`, one per expression
+
+    With `fused`, the module contains a single function f0 instead, which
+    returns the tuple of the values of all expressions. Common
+    subexpressions are eliminated across all expressions, so that each
+    intermediate value is computed once.
+
+    Parameters
+    ----------
+    args: list[String]
+        Names of the arguments of the functions
+    expressions: list
+        Sympy expressions or matrices, in the symbols named by `args`
+    fused: bool
+        Generate a single function of all expressions
+
+    Returns
+    -------
+    String
+        Python source of the module
+    """
+    printer = NumPyPrinter()
+    signature = ", ".join(args)
+    lines = ["import numpy", ""]
+    if fused:
+        replacements, reduced = cse(
+            list(expressions), symbols=numbered_symbols("_cse"))
+        lines += ["", "def f0({}):".format(signature)]
+        for symbol, expression in replacements:
+            lines.append("    {} = {}".format(
+                symbol, printer.doprint(expression)))
+        lines += ["    return ({},)".format(
+            ", ".join(printer.doprint(expression)
+                      for expression in reduced)), ""]
+    else:
+        for i, expression in enumerate(expressions):
+            lines += ["", "def f{}({}):".format(i, signature),
+                      "    return " + printer.doprint(expression), ""]
+    return "\n".join(lines)
+
+
+def load_source(source, filename="<codegen>"):
+    """
+    Executes a module generated by `generate_source`
+
+    Returns
+    -------
+    list[function]
+        The functions f0, f1, ... of the module
+    """
+    namespace = {}
+    exec(compile(source, filename, "exec"), namespace)
+    functions = []
+    while "f{}".format(len(functions)) in namespace:
+        functions.append(namespace["f{}".format(len(functions))])
+    return functions
+
+
+def cached_functions(key_parts, args, build, fused=False):
+    """
+    Numeric functions of sympy expressions, generated once and cached on
+    disk
+
+    The functions are loaded from the cache directory when a module with
+    the same key exists there. Otherwise `build` is called to construct
+    the expressions, and the generated module is written to the cache
+    directory for the next start. A cache directory that cannot be
+    written to only disables the cache.
+
+    Parameters
+    ----------
+    key_parts: list
+        Everything the expressions depend on, see `cache_key`
+    args: list[String]
+        Names of the arguments of the functions
+    build: callable
+        Returns the list of sympy expressions or matrices. Only called
+        when the functions are not cached.
+    fused: bool
+        Generate a single function returning the values of all
+        expressions from shared intermediates, see `generate_source`
+
+    Returns
+    -------
+    list[function]
+        One NumPy function of `args` per expression, or the single fused
+        function
+    """
+    directory = cache_dir()
+    path = None
+    if directory:
+        path = os.path.join(directory,
+                            cache_key([key_parts, fused], args) + ".py")
+        try:
+            with open(path) as fil:
+                return load_source(fil.read(), path)
+        except (OSError, SyntaxError):
+            pass
+
+    source = generate_source(args, build(), fused)
+    if path is not None:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = "{}.{}.tmp".format(path, os.getpid())
+            with open(tmp_path, "w") as fil:
+                fil.write(source)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return load_source(source, path or "<codegen>")
@@ -0,0 +1,246 @@
+from sympy import Matrix, Symbol, SympifyError, sympify
+
+from .codegen_cache import cached_functions
+
+
+class Expression_engine:
+    """
+    Compile-once engine for a set of named, user-edited functions
+
+    Functions are given as strings in the attributes, the fixed parameters
+    and the names of other functions, e.g. mc = "mcA + mcB". Each function
+    is parsed at most once per edit, when it is first needed. The references between functions form a
+    directed acyclic graph, along which the fully resolved expressions
+    and their gradients with respect to the attributes are memoized.
+    Editing a function only invalidates the memoized results of that
+    function and of the functions depending on it.
+    """
+
+    def __init__(self, attributes, parameters=()):
+        self.attributes = [str(a) for a in attributes]
+        self.parameters = [str(p) for p in parameters]
+        self._texts = {}
+        self._parsed = {}
+        self._resolved = {}
+        self._gradients = {}
+
+    @property
+    def functions(self):
+        """
+        Names of the functions, in the order they were added
+        """
+        return list(self._texts)
+
+    def set_function(self, name, text):
+        """
+        Adds or edits a function. Nothing is invalidated if its text did
+        not change.
+
+        Parameters
+        ----------
+        name: String
+            Name of the function
+        text: String
+            Expression of the function
+
+        Returns
+        -------
+        bool
+            True if the function was added or changed
+        """
+        name, text = str(name), str(text)
+        if self._texts.get(name) == text:
+            return False
+        # dependents are found with the previous expression of the
+        # function, and the new name is already known to them
+        self._texts[name] = text
+        self._invalidate(name)
+        self._parsed.pop(name, None)
+        return True
+
+    def remove_function(self, name):
+        """
+        Removes a function
+        """
+        name = str(name)
+        if name in self._texts:
+            self._invalidate(name)
+            del self._texts[name]
+            self._parsed.pop(name, None)
+
+    def dependencies(self, name):
+        """
+        Names of the functions referenced by a function
+
+        Returns
+        -------
+        set[String]
+        """
+        name = str(name)
+        if name not in self._texts or self._expression(name) is None:
+            return set()
+        expression = self._expression(name)
+        return {str(s) for s in expression.free_symbols}.intersection(
+            self._texts)
+
+    def errors(self):
+        """
+        Validates all functions: syntax errors, unknown identifiers and
+        recursive calls, direct or through other functions
+
+        Returns
+        -------
+        dict[String, String]
+            Error message by function name, for the invalid functions
+        """
+        known = set(self.attributes).union(self.parameters, self._texts)
+        errors = {}
+        for name in self._texts:
+            expression = self._expression(name)
+            if expression is None:
+                errors[name] = "contains a syntax error"
+                continue
+            symbols = sorted(str(s) for s in expression.free_symbols)
+            if name in symbols:
+                errors[name] = "contains a direct recursive call"
+                continue
+            unknown = [s for s in symbols if s not in known]
+            if unknown:
+                errors[name] = "contains unknown identifier: " + unknown[0]
+                continue
+            if self._in_cycle(name):
+                errors[name] = "contains a recursive call through other functions"
+        return errors
+
+    def resolve(self, name):
+        """
+        Expression of a function with all references to other functions
+        substituted, memoized
+
+        Returns
+        -------
+        sympy expression
+        """
+        name = str(name)
+        if name not in self._resolved:
+            if self._expression(name) is None:
+                raise ValueError(name + " contains a syntax error")
+            if self._in_cycle(name):
+                raise ValueError(name + " contains a recursive call")
+            references = {Symbol(dependency): self.resolve(dependency)
+                          for dependency in self.dependencies(name)}
+            self._resolved[name] = self._expression(name).xreplace(
+                references)
+        return self._resolved[name]
+
+    def gradient(self, name):
+        """
+        Derivatives of the resolved function with respect to the
+        attributes, memoized
+
+        Returns
+        -------
+        list[sympy expression]
+        """
+        name = str(name)
+        if name not in self._gradients:
+            expression = self.resolve(name)
+            self._gradients[name] = [expression.diff(Symbol(a))
+                                     for a in self.attributes]
+        return self._gradients[name]
+
+    def matrices(self, outputs):
+        """
+        Symbolic values and gradient of the output functions
+
+        Parameters
+        ----------
+        outputs: list[String]
+            Names of the output functions
+
+        Returns
+        -------
+        (values, gradient): tuple[sympy.Matrix, sympy.Matrix]
+            (n_outputs, 1) values and (n_attributes, n_outputs) gradient
+        """
+        values = Matrix([self.resolve(name) for name in outputs])
+        gradient = Matrix([self.gradient(name) for name in outputs])
+        return values, gradient.transpose()
+
+    def compile(self, outputs, fixed_values=None):
+        """
+        Single numeric evaluator of the output functions and their
+        gradient, with the fixed parameters substituted
+
+        The evaluator is generated with common subexpressions shared
+        between the values and the gradient, and cached on disk (see
+        `cached_functions`). The cache key only depends on the texts of
+        the functions, so that no symbolic work at all is done when the
+        evaluator is cached. The functions are validated when the
+        evaluator is generated.
+
+        Parameters
+        ----------
+        outputs: list[String]
+            Names of the output functions
+        fixed_values: dict[String, float]
+            Values of the fixed parameters
+
+        Returns
+        -------
+        function
+            Function of the attributes returning the (n_outputs, 1) values
+            and the (n_attributes, n_outputs) gradient
+        """
+        outputs = [str(name) for name in outputs]
+        fixed_values = dict(fixed_values or {})
+
+        def build():
+            unknown = [name for name in outputs if name not in self._texts]
+            if unknown:
+                raise ValueError(unknown[0] + " is not a function")
+            errors = self.errors()
+            invalid = [name for name in self._closure(outputs)
+                       if name in errors]
+            if invalid:
+                raise ValueError(invalid[0] + " " + errors[invalid[0]])
+            substitutions = {Symbol(p): v for p, v in fixed_values.items()}
+            values, gradient = self.matrices(outputs)
+            return [values.subs(substitutions).evalf(),
+                    gradient.subs(substitutions).evalf()]
+
+        key = ["expression_engine", outputs, sorted(self._texts.items()),
+               sorted(fixed_values.items())]
+        evaluator, = cached_functions(key, self.attributes, build, fused=True)
+        return evaluator
+
+    def _expression(self, name):
+        # parsed function, None if it contains a syntax error
+        if name not in self._parsed:
+            try:
+                self._parsed[name] = sympify(self._texts[name])
+            except SympifyError:
+                self._parsed[name] = None
+        return self._parsed[name]
+
+    def _closure(self, names):
+        # names and all the functions they reference, directly or not
+        closure = set()
+        stack = [str(name) for name in names]
+        while stack:
+            name = stack.pop()
+            if name not in closure:
+                closure.add(name)
+                stack.extend(self.dependencies(name))
+        return closure
+
+    def _in_cycle(self, name):
+        # True if name is reachable from its own references
+        return name in self._closure(self.dependencies(name))
+
+    def _invalidate(self, name):
+        # drops the memoized results of name and its dependents
+        for memo in (self._resolved, self._gradients):
+            for memoized in list(memo):
+                if memoized == name or name in self._closure([memoized]):
+                    del memo[memoized]
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from sympy import Matrix, sympify
+
+from force_bdss_prototype.codegen.codegen_cache import CACHE_DIR_ENV, cache_key, cached_functions, generate_source, load_source
+
+args = ["V_a", "T"]
+expressions = [sympify("ln(V_a) * (T - 290)^2"), Matrix([[sympify("V_a * T"), 0], [1, sympify("T")]])]
+
+class Codegen_cacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {CACHE_DIR_ENV: self.tmp_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return expressions
+
+    def test_cache_key(self):
+        key = cache_key(["f", 1.0], args)
+        self.assertEqual(len(key), 64)
+        self.assertEqual(key, cache_key(["f", 1.0], args))
+        self.assertNotEqual(key, cache_key(["f", 2.0], args))
+        self.assertNotEqual(key, cache_key(["f", 1.0], args[::-1]))
+
+    def test_generate_source(self):
+        f0, f1 = load_source(generate_source(args, expressions))
+        self.assertAlmostEqual(f0(2., 300.), np.log(2.) * 100.)
+        np.testing.assert_allclose(f1(2., 300.), [[600., 0.], [1., 300.]])
+
+    def test_generate_fused_source(self):
+        source = generate_source(args, expressions, fused=True)
+        functions = load_source(source)
+        self.assertEqual(len(functions), 1)
+        f0, f1 = load_source(generate_source(args, expressions))
+        value, matrix = functions[0](2., 300.)
+        self.assertAlmostEqual(value, f0(2., 300.))
+        np.testing.assert_allclose(matrix, f1(2., 300.))
+
+    def test_fused_cse(self):
+        shared = sympify("ln(V_a + T)")
+        source = generate_source(args, [shared**2, Matrix([shared, 2 * shared])], fused=True)
+        self.assertEqual(source.count("numpy.log"), 1)
+
+    def test_cached_functions(self):
+        f0, f1 = cached_functions(["test"], args, self.build)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 1)
+
+        g0, g1 = cached_functions(["test"], args, self.build)
+        self.assertEqual(self.builds, 1)
+        self.assertAlmostEqual(f0(2., 300.), g0(2., 300.))
+        np.testing.assert_allclose(f1(2., 300.), g1(2., 300.))
+
+        cached_functions(["other"], args, self.build)
+        self.assertEqual(self.builds, 2)
+
+        functions = cached_functions(["test"], args, self.build, fused=True)
+        self.assertEqual(self.builds, 3)
+        self.assertEqual(len(functions), 1)
+
+    def test_cache_disabled(self):
+        with mock.patch.dict(os.environ, {CACHE_DIR_ENV: ""}):
+            cached_functions(["test"], args, self.build)
+            cached_functions(["test"], args, self.build)
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
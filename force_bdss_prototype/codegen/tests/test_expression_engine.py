@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from sympy import sympify
+
+from force_bdss_prototype.codegen.codegen_cache import CACHE_DIR_ENV
+from force_bdss_prototype.codegen.expression_engine import Expression_engine
+
+attributes = ["V_a", "C_e", "T", "t"]
+parameters = ["W", "cost_B"]
+
+class Expression_engineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Expression_engine(attributes, parameters)
+        self.engine.set_function("pc", "t * (T - 290)^2 * W")
+        self.engine.set_function("mc", "mcA + mcB")
+        self.engine.set_function("mcA", "V_a * C_e^2")
+        self.engine.set_function("mcB", "(1 - V_a) * cost_B")
+
+    def test_resolve(self):
+        self.assertEqual(self.engine.dependencies("mc"), {"mcA", "mcB"})
+        self.assertEqual(self.engine.resolve("mc"), sympify("V_a * C_e**2 + (1 - V_a) * cost_B"))
+        self.assertEqual(self.engine.gradient("mc")[1], sympify("2 * V_a * C_e"))
+        self.assertEqual(self.engine.errors(), {})
+
+    def test_matrices(self):
+        values, gradient = self.engine.matrices(["pc", "mc"])
+        self.assertEqual(values.shape, (2, 1))
+        self.assertEqual(gradient.shape, (4, 2))
+
+    def test_errors(self):
+        self.engine.set_function("e1", "V_a +* 2")
+        self.engine.set_function("e2", "e2 + 1")
+        self.engine.set_function("e3", "V_a * unknown")
+        self.engine.set_function("e4", "e5 + 1")
+        self.engine.set_function("e5", "e4 * 2")
+        errors = self.engine.errors()
+        self.assertEqual(errors["e1"], "contains a syntax error")
+        self.assertEqual(errors["e2"], "contains a direct recursive call")
+        self.assertEqual(errors["e3"], "contains unknown identifier: unknown")
+        self.assertIn("recursive", errors["e4"])
+        self.assertIn("recursive", errors["e5"])
+        self.assertNotIn("mc", errors)
+        with self.assertRaises(ValueError):
+            self.engine.resolve("e4")
+
+    def test_incremental(self):
+        pc = self.engine.resolve("pc")
+        self.engine.resolve("mc")
+        mcA = self.engine._parsed["mcA"]
+        self.assertFalse(self.engine.set_function("mcA", "V_a * C_e^2"))
+        self.assertTrue(self.engine.set_function("mcB", "V_a * cost_B"))
+        # only the edited function and its dependents are invalidated
+        self.assertIn("pc", self.engine._resolved)
+        self.assertIn("mcA", self.engine._resolved)
+        self.assertNotIn("mc", self.engine._resolved)
+        self.assertIs(self.engine._parsed["mcA"], mcA)
+        self.assertIs(self.engine.resolve("pc"), pc)
+        self.assertEqual(self.engine.resolve("mc"), sympify("V_a * C_e**2 + V_a * cost_B"))
+
+    def test_remove_function(self):
+        self.engine.remove_function("mcB")
+        self.assertNotIn("mcB", self.engine.functions)
+        self.assertEqual(self.engine.errors()["mc"], "contains unknown identifier: mcB")
+
+    def test_compile(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {CACHE_DIR_ENV: tmp_dir}):
+            evaluator = self.engine.compile(["pc", "mc"], {"W": 2., "cost_B": 3.})
+            values, gradient = evaluator(0.5, 0.1, 300., 10.)
+            np.testing.assert_allclose(values, [[2000.], [0.005 + 1.5]])
+            self.assertEqual(gradient.shape, (4, 2))
+            np.testing.assert_allclose(gradient[:, 1], [0.01 - 3., 0.1, 0., 0.])
+
+            # cached evaluators do not parse the functions again
+            engine = Expression_engine(attributes, parameters)
+            for name in self.engine.functions:
+                engine.set_function(name, self.engine._texts[name])
+            engine.compile(["pc", "mc"], {"W": 2., "cost_B": 3.})
+            self.assertEqual(engine._parsed, {})
+
+            self.engine.set_function("mcB", "mcB")
+            with self.assertRaises(ValueError):
+                self.engine.compile(["pc", "mc"], {"W": 2., "cost_B": 3.})
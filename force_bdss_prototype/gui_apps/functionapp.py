@@ -13,9 +13,10 @@ from kivy.uix.scrollview import ScrollView
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 #sympy
-from sympy import sympify, symbols, Matrix, SympifyError
+from sympy import symbols
 #kvlib
 from .kivy_library import EditableLabel
+from ..codegen.expression_engine import Expression_engine
 
 #window
 class FunctionApp(App):
@@ -39,59 +40,22 @@ class FunctionApp(App):
         root.add_widget(editor)
 
         root.add_widget(FunctionBottomRow())
+        #parses and resolves the functions, only what changed between validations
+        self.engine = Expression_engine(self.attributes.getVariables(), self.parameters.getVariables())
         return root
     
-    #sympifies the given function and checks if all contained symbols are initialized variables or
-    #sub functions. checks for direct recursive calls
-    def validate(self, func, var_set, func_set):
-        out = [sympify('0'), '']
-        func_desc = self.functionWrapper.getFunctionWidgets()[func].getDescription()
-        #if func_set[func] == 'default': return out # @default this enables 'default' as valid input
-        try:
-            function = sympify(func_set[func])
-        except SympifyError:
-            out[1] = func_desc + ' contains a syntax error' 
-            return out
-        for var in function.free_symbols:
-            if var in var_set: continue
-            elif var == func:
-                out[1] = func_desc + ' contains a direct recursive call' 
-                return out
-            elif var in func_set: continue
-            else: 
-                out[1] = func_desc + ' contains unknown identifier: ' + str(var) 
-                return out
-        out[0] = function
-        return out
-
     #validates all functions and checks for recursive functions calls + error handling 
     def validateAll(self):
         errors = []
-        var_set = self.attributes.getVariables() + self.parameters.getVariables()
         func_set = self.functionWrapper.getFunctions()
-        temp = {}
-        for func in func_set:
-            out = self.validate(func, var_set, func_set)
-            temp.update({func: out[0]})
-            if(out[1] != ''):
-                errors.append(out[1])
-        func_set = temp # func_set now contains sympified functions which can be test evaluated
+        widgets = self.functionWrapper.getFunctionWidgets()
+        #update the engine with the edited functions
+        for func in self.engine.functions:
+            if symbols(func) not in func_set: self.engine.remove_function(func)
         for func in func_set:
-            function = func_set[func]
-            #try to substitute all subfunctions
-            try:
-                #if(function == 'default'): continue @default
-                recursion_counter = 0
-                max_recursion_depth = 10000
-                while len(function.free_symbols.intersection(func_set)) != 0:
-                    sub_func = function.free_symbols.intersection(func_set).pop()
-                    function = function.subs(sub_func, func_set[sub_func])
-                    recursion_counter += 1
-                    if recursion_counter > max_recursion_depth: raise RecursionError()
-            except RecursionError:
-                func_desc = self.functionWrapper.getFunctionWidgets()[func].getDescription()
-                message = func_desc + ' exceeded the max-recursion depth, there might be a recursive call.' 
-                errors.append(message)       
+            self.engine.set_function(func, func_set[func])
+        for func, message in self.engine.errors().items():
+            errors.append(widgets[symbols(func)].getDescription() + ' ' + message)
         #Error handling
         if(len(errors)!=0): 
             if(len(errors) == 1): content = 'There is 1 problem: \n'
@@ -104,32 +68,9 @@ class FunctionApp(App):
             popup.open()
             return False
 
-        #remove sub-functions from func_set + func derivatives
-        attributes = self.attributes.getVariables()
-        AO = []
-
-        for func in func_set:
-            if self.functionWrapper.getFunctionWidgets()[func].isEditable(): continue
-            function = func_set[func]
-            while len(function.free_symbols.intersection(func_set)) != 0:
-                    sub_func = function.free_symbols.intersection(func_set).pop()
-                    function = function.subs(sub_func, func_set[sub_func])
-            # func derivatives with KPIs
-            # create output + add original function
-
-            AO.append(function)
-
-        grad_A_AO = []
-
-        for func in AO:
-            temp = attributes[:]
-            i = 0
-            for a in attributes:
-                temp[i] = func.diff(a) 
-                i += 1
-            grad_A_AO += [temp]
-                
-        self.output = (Matrix(AO),Matrix(grad_A_AO).transpose()) 
+        #sub-functions are not outputs, they are resolved by the engine
+        outputs = [str(func) for func in func_set if not widgets[func].isEditable()]
+        self.output = (self.engine, outputs)
         return True
     
     #adds a new editable function #TODO: no name duplications
@@ -147,24 +88,6 @@ class FunctionApp(App):
     def stop_with_output(self):
         if self.validateAll():
             self.stop()
-    
-    def validateNoGui(attributes, func_set):
-        AO = []
-        for func in func_set:
-            function = sympify(func)
-            AO.append(function)
-        
-        grad_A_AO = []
-
-        for func in AO:
-            temp = attributes[:]
-            i = 0
-            for a in attributes:
-                temp[i] = func.diff(a) 
-                i += 1
-            grad_A_AO += [temp]
-                
-        return (Matrix(AO),Matrix(grad_A_AO).transpose()) 
 
 #Widgets
 class FunctionWrapperWidget(ScrollView):
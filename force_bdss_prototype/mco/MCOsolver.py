@@ -1,6 +1,7 @@
 import numpy as np
 import sys
 import scipy.optimize as sp_opt
+from itwm_example.mco.fork_pool import fork_pool, shared_object
 
 
 class MCOsolver:
@@ -17,16 +18,17 @@ class MCOsolver:
         - O-dimension = (Imp_conc, prod_cost, mat_cost)\n
             Objective space, contains all objectives for the MCO workflow
     """
-    def __init__(self, y0, constr, obj_f, obj_jac):
+    def __init__(self, y0, constr, obj_f, obj_jac, archive=None):
         self.constr = constr
         self.y0 = y0
         self.obj_f = obj_f
         self.obj_jac = obj_jac
-        self.w = np.array([0.4, 0.4, 0.2])
-        self.res = np.zeros((100, 4))
-        self.i = 0
+        #Pareto archive of the objectives, fed with each stored record
+        self.archive = archive
+        #one record per weight vector, allocated by solve
+        self.res = np.zeros(0, dtype=result_dtype(len(y0)))
 
-    def solve(self, N=7):
+    def solve(self, N=7, workers=1):
         """
         Executes the MCO workflow and returns the results it computes.
 
@@ -34,62 +36,145 @@ class MCOsolver:
         ----------
         N: int
             Number of data points per objective
+        workers: int
+            Number of worker processes solving the weights concurrently.
+            The weights are solved in this process if workers is 1.
+            The workers are forked, see fork_pool, which is only safe on
+            Linux.
 
         Returns
         -------
         numpy.array
-            A numpy array containing all computed results
+            A numpy array containing all computed results. The full
+            records of the solves, see result_dtype, are stored in res.
         """
-        new_obj = lambda y: np.dot(self.w, self.obj_f(y))
-        #if np.any(y == float("nan")) else False
-        new_obj_jac = lambda y: np.dot(self.w, self.obj_jac(y))
         print("Calculating optimal parameters...")
-        i = 0
-        for self.w[0] in np.linspace(0, 1, N):
-            for self.w[1] in np.linspace(0, 1 - self.w[0],
-                                         int(N - round((N - 1)*self.w[0]))):
-                self.w[2] = 1 - self.w[0] - self.w[1]
-                i += 1
-                progress(i, (N*N + N)/2)
-                #if not np.any(self.w == 0):
-                self.store_curr_res(self.KKTsolver(new_obj, new_obj_jac))
-        return self.res[:self.i]
-
-    def KKTsolver(self, new_obj, new_obj_jac):
+        weights = weight_grid(N)
+        self.res = np.zeros(len(weights), dtype=self.res.dtype)
+        if workers > 1:
+            with fork_pool(workers, self) as pool:
+                if pool is not None:
+                    records = pool.imap_unordered(_solve_weight,
+                                                  enumerate(weights))
+                    for count, (i, record) in enumerate(records):
+                        self.store_curr_res(i, record)
+                        progress(count + 1, len(weights))
+                    return self.res["y"]
+        for i, w in enumerate(weights):
+            self.store_curr_res(i, self.solve_weight(w))
+            progress(i + 1, len(weights))
+        return self.res["y"]
+
+    def solve_weight(self, w):
         """
-        Calculates new starting values for the simulation
+        Solves the problem scalarised with one weight vector, independently
+        of the other weights
 
         Parameters
         ----------
-        new_obj: numpy.array
-            Current objective results 
-        new_obj_jac: numpy.array
-            y_O gradient matrix 
+        w: numpy.array
+            Weights of the objectives
 
         Returns
         -------
         numpy.array
-            A numpy array containing new starting values
+            Record of the solve, see result_dtype
         """
-        opt_res = sp_opt.minimize(new_obj, self.y0, method="SLSQP",
-                                  jac=new_obj_jac , bounds=self.constr).x
-        return opt_res
+        new_obj = lambda y: np.dot(w, self.obj_f(y))
+        new_obj_jac = lambda y: np.dot(w, self.obj_jac(y))
+        opt_res = self.minimize(new_obj, new_obj_jac)
+        record = np.zeros((), dtype=self.res.dtype)
+        record["w"] = w
+        record["y"] = opt_res.x
+        record["O"] = np.asarray(self.obj_f(opt_res.x), dtype=float).flatten()
+        record["jac_norm"] = np.linalg.norm(opt_res.jac)
+        record["nit"] = opt_res.nit
+        record["nfev"] = opt_res.nfev
+        record["success"] = opt_res.success
+        return record
 
-    def store_curr_res(self, y):
+    def minimize(self, new_obj, new_obj_jac):
         """
-        Stores the current objective results to the data array
+        Minimizes the scalarised objective from the starting values
 
         Parameters
         ----------
-        y: numpy.array
-            Current objective results 
+        new_obj: function
+            Scalarised objective of the y-dimension
+        new_obj_jac: function
+            Gradient of the scalarised objective
+
+        Returns
+        -------
+        scipy.optimize.OptimizeResult
+            The SLSQP result
         """
-        if self.i >= self.res.shape[0]:
-            res = np.zeros((2*self.res.shape[0], 4))
-            res[:self.res.shape[0]] = self.res
-            self.res = res
-        self.res[self.i] = y
-        self.i = self.i + 1
+        return sp_opt.minimize(new_obj, self.y0, method="SLSQP",
+                               jac=new_obj_jac , bounds=self.constr)
+
+    def store_curr_res(self, i, record):
+        """
+        Stores the current result record to the row of its weight vector in
+        res, and inserts its objectives in the archive with the row index
+
+        Parameters
+        ----------
+        i: int
+            Index of the weight vector of the solve
+        record: numpy.array
+            Record of the current solve, see result_dtype
+        """
+        self.res[i] = record
+        if self.archive is not None:
+            self.archive.insert(record["O"], i)
+
+def result_dtype(n_y, n_O=3):
+    """
+    Record type of the solve of one weight vector: the weights w, the
+    optimal y-dimension values y, the objectives O there, the norm of the
+    scalarised objective gradient jac_norm, the SLSQP iteration and
+    function evaluation counts nit and nfev, and its success flag
+
+    Parameters
+    ----------
+    n_y: int
+        Size of the y-dimension
+    n_O: int
+        Number of objectives
+
+    Returns
+    -------
+    numpy.dtype
+    """
+    return np.dtype([("w", float, (n_O,)), ("y", float, (n_y,)),
+                     ("O", float, (n_O,)), ("jac_norm", float),
+                     ("nit", int), ("nfev", int), ("success", bool)])
+
+def weight_grid(N):
+    """
+    Triangular grid of the weight vectors of three objectives, with N
+    values of the first weight
+
+    Parameters
+    ----------
+    N: int
+        Number of data points per objective
+
+    Returns
+    -------
+    list[numpy.array]
+        The (N*N + N)/2 weight vectors, each summing to 1
+    """
+    weights = []
+    for w0 in np.linspace(0, 1, N):
+        for w1 in np.linspace(0, 1 - w0, int(N - round((N - 1)*w0))):
+            weights.append(np.array([w0, w1, 1 - w0 - w1]))
+    return weights
+
+def _solve_weight(indexed_weight):
+    #solves a weight vector with the solver inherited by the forked worker
+    i, w = indexed_weight
+    return i, shared_object().solve_weight(w)
 
 def progress(count, total, status=''):
     """
@@ -8,6 +8,7 @@ from ..databases.process_db_access import Process_db_access
 import kivy.core.window as window
 from kivy.base import EventLoop
 from kivy.cache import Cache
+from itwm_example.mco.pareto_archive import ParetoArchive
 
 class MCOwrapper:
     """
@@ -15,17 +16,22 @@ class MCOwrapper:
     """
 
     # default constructor
-    def __init__(self, R, C, enable_gui = False):
+    def __init__(self, R, C, enable_gui = False, workers = 1):
         # mco setup: trasform to impl. data structures.
         self.R = R
         self.C = C
+        # number of processes solving the weights concurrently
+        self.workers = workers
         self.obj = Objectives(self.R, self.C, enable_gui = enable_gui) 
         _reset()
         self.constraints = Constraints(self.R)
         _reset()
         self.ini = Initializer.getInstance(self.R)
-        obj_f = lambda y: self.obj.obj_calc(y)[0]
-        obj_jac = lambda y: self.obj.obj_calc(y)[1]
+        # SLSQP asks for the objectives and their gradient at the same
+        # point: evaluate obj_calc once per point
+        self.obj_calc = Last_point_cache(self.obj.obj_calc)
+        obj_f = lambda y: self.obj_calc(y)[0]
+        obj_jac = lambda y: self.obj_calc(y)[1]
         constr = self.constraints.get_editor_constraints(enable_gui = enable_gui) #<-- calls constraints editor
         X0 = self.ini.get_init_data_kin_model(self.R, self.C)
         p_db_access = Process_db_access.getInstance(R)
@@ -50,18 +56,46 @@ class MCOwrapper:
         numpy.array
             A numpy array containing all computed results
         """
-        results = self.mcosolver.solve(N=10)
+        # Pareto front of the results, fed by the solver as it stores them
+        self.archive = ParetoArchive()
+        self.mcosolver.archive = self.archive
+        results = self.mcosolver.solve(N=10, workers=self.workers)
+        # objectives of the results, as recorded by the solver
+        res_O = self.mcosolver.res["O"][:results.shape[0]]
         res = np.empty((results.shape[0], results.shape[1] + 3))
-        for i in range(results.shape[0]):
-            y = results[i, :]
-            O, _ = self.obj.obj_calc(y)
-            res[i, :results.shape[1]] = results[i, :]
-            res[i, results.shape[1]:] = O.flatten()
+        res[:, :results.shape[1]] = results
+        res[:, results.shape[1]:] = res_O
         res[:, results.shape[1]] = self.C_supplier * np.exp(res[:, results.shape[1]])
-        self.pp_db = Pareto_process_db(res)
+        self.pp_db = Pareto_process_db(res, archive=self.archive)
         self.pp_db.dump_data()
         return res
 
+class Last_point_cache:
+    """
+    Caches the result of a function of the y-dimension at the last point
+    it was called with
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.y = None
+        self.value = None
+
+    def __call__(self, y):
+        """
+        Returns f(y), calling f only if y differs from the last point
+
+        Parameters
+        ----------
+        y: numpy.array
+            Numpy array containing the y-dimension values
+        """
+        y = np.asarray(y, dtype=float)
+        if self.y is None or not np.array_equal(y, self.y):
+            self.value = self.f(y)
+            self.y = y.copy()
+        return self.value
+
 def _reset():
     #clears the Kivy EventLoop cache to avoid issues when executing the different GUIs in succession
     if not EventLoop.event_listeners:
@@ -1,7 +1,9 @@
 import unittest
 import numpy as np
 
-from force_bdss_prototype.mco.MCOsolver import MCOsolver
+from force_bdss_prototype.mco.MCOsolver import MCOsolver, weight_grid
+from force_bdss_prototype.pareto_process.non_dominated import non_dominated
+from itwm_example.mco.pareto_archive import ParetoArchive
 
 y0 = np.array([0.5, 0.1, 330, 3600])
 va_range = (0, 1)
@@ -48,21 +50,62 @@ class MCOsolverTestCase(unittest.TestCase):
         mcosolver = MCOsolver(y0, constr, obj_f, obj_jac)
         self.assertEqual(mcosolver.solve(N=4).shape, (10,4))
 
-    def test_KKTsolver_return_type(self):
+    def test_solve_records(self):
         mcosolver = MCOsolver(y0, constr, obj_f, obj_jac)
-        self.assertEqual(type(mcosolver.KKTsolver(f, jac)), nptype)
+        res = mcosolver.solve(N=4)
+        self.assertEqual(mcosolver.res.shape, (10,))
+        np.testing.assert_allclose(mcosolver.res["y"], res)
+        np.testing.assert_allclose(mcosolver.res["w"], weight_grid(4))
+        for record in mcosolver.res:
+            np.testing.assert_allclose(record["O"], obj_f(record["y"]))
+            self.assertGreater(record["nfev"], 0)
+        self.assertEqual(mcosolver.res["success"].dtype, bool)
+        self.assertTrue(np.all(mcosolver.res["jac_norm"] >= 0))
 
-    def test_KKTsolver_return_shape(self):
+    def test_solve_workers(self):
+        serial = MCOsolver(y0, constr, obj_f, obj_jac)
+        parallel = MCOsolver(y0, constr, obj_f, obj_jac)
+        res = serial.solve(N=4)
+        np.testing.assert_allclose(parallel.solve(N=4, workers=2), res)
+        for name in serial.res.dtype.names:
+            np.testing.assert_array_equal(parallel.res[name],
+                                          serial.res[name])
+
+    def test_solve_archive(self):
+        archive = ParetoArchive()
+        mcosolver = MCOsolver(y0, constr, obj_f, obj_jac, archive=archive)
+        mcosolver.solve(N=4)
+        points, idx = archive.snapshot()
+        np.testing.assert_array_equal(points, mcosolver.res["O"][idx])
+        front = non_dominated(mcosolver.res["O"])
+        np.testing.assert_array_equal(sorted(idx), np.flatnonzero(front))
+
+    def test_solve_weight(self):
         mcosolver = MCOsolver(y0, constr, obj_f, obj_jac)
-        self.assertEqual(mcosolver.KKTsolver(f, jac).shape, (4,))
+        record = mcosolver.solve_weight(np.array([0.2, 0.3, 0.5]))
+        self.assertEqual(record.dtype, mcosolver.res.dtype)
+        np.testing.assert_allclose(record["w"], [0.2, 0.3, 0.5])
+        np.testing.assert_allclose(record["O"], obj_f(record["y"]))
+        self.assertEqual(mcosolver.res.shape, (0,))
+
+    def test_weight_grid(self):
+        weights = weight_grid(4)
+        self.assertEqual(len(weights), 10)
+        np.testing.assert_allclose(weights[0], [0, 0, 1])
+        np.testing.assert_allclose(weights[3], [0, 1, 0])
+        np.testing.assert_allclose(weights[-1], [1, 0, 0])
+        for w in weights:
+            self.assertAlmostEqual(w.sum(), 1)
+            self.assertTrue(np.all(w >= -1e-12))
 
     def test_store_curr_res_side_effects(self):
-        mcosolver = MCOsolver(y0, constr, obj_f, obj_jac)
-        iprime = mcosolver.i
-        mcosolver.store_curr_res(y0)
-        i = mcosolver.i
-        mcosolver.i = mcosolver.res.shape[0]
-        reslenprime = mcosolver.res.shape[0]
-        mcosolver.store_curr_res(y0)
-        self.assertEqual(iprime + 1, i)
-        self.assertEqual(reslenprime * 2, mcosolver.res.shape[0])
+        archive = ParetoArchive()
+        mcosolver = MCOsolver(y0, constr, obj_f, obj_jac, archive=archive)
+        mcosolver.res = np.zeros(2, dtype=mcosolver.res.dtype)
+        record = mcosolver.solve_weight(np.array([0.2, 0.3, 0.5]))
+        mcosolver.store_curr_res(1, record)
+        self.assertEqual(mcosolver.res.shape, (2,))
+        np.testing.assert_array_equal(mcosolver.res[1], record)
+        self.assertEqual(archive.snapshot()[1], [1])
+        with self.assertRaises(IndexError):
+            mcosolver.store_curr_res(2, record)
@@ -1,7 +1,9 @@
+import os
+import tempfile
 import unittest
 import numpy as np
 
-from force_bdss_prototype.mco.MCOwrapper import MCOwrapper
+from force_bdss_prototype.mco.MCOwrapper import MCOwrapper, Last_point_cache
 
 A = { "name": "eductA", "manufacturer": "", "pdi": 0 }
 B = { "name": "eductB", "manufacturer": "", "pdi": 0 }
@@ -15,3 +17,35 @@ class MCOwrapperTestCase(unittest.TestCase):
     def test_instance(self):
         mcowrapper = MCOwrapper(R, C)
         self.assertIsInstance(mcowrapper, MCOwrapper)
+
+    def test_solve_archive_front(self):
+        mcowrapper = MCOwrapper(R, C)
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                res = mcowrapper.solve()
+                with np.load("pareto_data.npz") as dump:
+                    front = dump["rank"] == 1
+                    O = np.column_stack([dump[name][front] for name in
+                                         ("impurity_conc", "prod_cost", "mat_cost")])
+            finally:
+                os.chdir(cwd)
+        points, idx = mcowrapper.archive.snapshot()
+        np.testing.assert_array_equal(sorted(idx), np.flatnonzero(front))
+        np.testing.assert_array_equal(points, mcowrapper.mcosolver.res["O"][idx])
+        np.testing.assert_array_equal(O, res[front, 4:])
+
+    def test_last_point_cache(self):
+        calls = []
+        def f(y):
+            calls.append(y)
+            return (y.sum(), 2 * y)
+        cache = Last_point_cache(f)
+        y = np.array([0.5, 0.1, 330., 3600.])
+        self.assertEqual(cache(y)[0], y.sum())
+        self.assertEqual(cache(y.copy())[0], y.sum())
+        self.assertEqual(len(calls), 1)
+        y[0] = 0.6
+        self.assertEqual(cache(y)[0], y.sum())
+        self.assertEqual(len(calls), 2)
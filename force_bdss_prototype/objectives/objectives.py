@@ -3,7 +3,17 @@ from ..databases.process_db_access import Process_db_access
 from ..databases.material_db_access import Material_db_access
 from ..gui_apps.functionapp import FunctionApp
 from ..attributes.attributes import Attributes
-from sympy import symbols, Matrix, sympify, diff, evalf, lambdify
+from ..codegen.expression_engine import Expression_engine
+from sympy import symbols
+
+#: attributes (a-dimension) the objectives are functions of
+ATTRIBUTES = ["V_a", "C_e", "T", "t", "conc_A", "conc_B", "conc_P", "conc_S", "conc_C"]
+
+#: fixed parameters the objectives depend on
+FIXED_PARAMETERS = ["p_A", "p_B", "p_C", "V_r", "W", "const_A", "cost_B", "quad_coeff", "C_supplier", "cost_purification"]
+
+#: default objective functions, used without the function editor
+FUNCTIONS = [("pc", 't * (T - 290)^2 * W'), ("mc", '(cost_purification * (C_e / C_supplier -1)^2 + const_A) * V_a + V_r * quad_coeff * (V_a - 0.6 * V_r)**2 + (V_r - V_a) * cost_B'), ("imp", 'ln((conc_A + conc_B + conc_C + conc_S )/ C_supplier)')]
 
 class Objectives:
     """ 
@@ -16,9 +26,12 @@ class Objectives:
         self.p_db_access = Process_db_access.getInstance(self.R)
         self.m_db_access = Material_db_access.getInstance()
         if enable_gui:
-            self.O, self.grad_a_O = FunctionApp().run_with_output(self._function_editor_input(), -1)
+            self.engine, self.outputs = FunctionApp().run_with_output(self._function_editor_input(), -1)
         else:
-            self.O, self.grad_a_O = FunctionApp.validateNoGui([*symbols("V_a, C_e, T, t, conc_A, conc_B, conc_P, conc_S, conc_C")],['t * (T - 290)^2 * W', '(cost_purification * (C_e / C_supplier -1)^2 + const_A) * V_a + V_r * quad_coeff * (V_a - 0.6 * V_r)**2 + (V_r - V_a) * cost_B', 'ln((conc_A + conc_B + conc_C + conc_S )/ C_supplier)'])
+            self.engine = Expression_engine(ATTRIBUTES, FIXED_PARAMETERS)
+            for name, function in FUNCTIONS:
+                self.engine.set_function(name, function)
+            self.outputs = [name for name, _ in FUNCTIONS]
         self.attributes = Attributes(R, C)
         self._obj_calc_init()
 
@@ -29,20 +42,14 @@ class Objectives:
         p_B_value = self.m_db_access.get_pure_component_density(self.R["reactants"][1])
         p_C_value = self.m_db_access.get_pure_component_density(self.C)
         V_r_value, W_value, const_A_value, cost_B_value, quad_coeff_value, C_supplier_value, cost_purification_value = self.p_db_access._get_process_params()
-        #fixed value symbols
-        p_A, p_B, p_C, V_r, W, const_A, cost_B, quad_coeff, C_supplier, cost_purification = symbols("p_A, p_B, p_C, V_r, W, const_A, cost_B, quad_coeff, C_supplier, cost_purification")
-    
+        fixed_values = dict(zip(FIXED_PARAMETERS, [p_A_value, p_B_value, p_C_value, V_r_value, W_value, const_A_value, cost_B_value, quad_coeff_value, C_supplier_value, cost_purification_value]))
+
         #a setup
-        V_a, C_e, T, t = symbols("V_a, C_e, T, t")
-        conc_A, conc_B, conc_P, conc_S, conc_C = symbols("conc_A, conc_B, conc_P, conc_S, conc_C")
-        self.a = [V_a, C_e, T, t, conc_A, conc_B, conc_P, conc_S, conc_C]
+        self.a = [*symbols(", ".join(ATTRIBUTES))]
 
-        #substitute fixed values
-        self.O = self.O.subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value).subs(W, W_value).subs(const_A, const_A_value).subs(cost_B, cost_B_value).subs(quad_coeff, quad_coeff_value).subs(C_supplier,C_supplier_value).subs(cost_purification, cost_purification_value).evalf()
-        self.grad_a_O = self.grad_a_O.subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value).subs(W, W_value).subs(const_A, const_A_value).subs(cost_B, cost_B_value).subs(quad_coeff, quad_coeff_value).subs(C_supplier,C_supplier_value).subs(cost_purification, cost_purification_value).evalf()
-        
-        self.O = lambdify(self.a, self.O)
-        self.grad_a_O = lambdify(self.a, self.grad_a_O)
+        #numeric objectives and gradient, generated as a single function
+        #by the expression engine or loaded from the code generation cache
+        self.O_grad_a_O = self.engine.compile(self.outputs, fixed_values)
 
     def obj_calc(self, y):
         """
@@ -60,8 +67,7 @@ class Objectives:
             objective values and a 2D numpy array containing y_O gradient matrix
         """
         a, grad_y_a = self.attributes.calc_attributes(y)
-        O = self.O(*a)
-        grad_a_O = self.grad_a_O(*a)
+        O, grad_a_O = self.O_grad_a_O(*a)
         grad_y_O = np.dot(grad_y_a, grad_a_O)
         return (O, grad_y_O.T)
 
@@ -0,0 +1,186 @@
+from bisect import bisect_right
+import numpy as np
+
+
+def non_dominated(O, block_size=2**20):
+    """
+    Finds the non-dominated rows of an objective matrix, all objectives
+    being minimized. A row is dominated by another one that is not larger
+    in any objective and smaller in at least one. Identical rows do not
+    dominate each other, they are all kept.
+
+    Three objectives are filtered by a sweep in O(n log n) comparisons,
+    any other number of objectives by block-wise NumPy comparisons.
+
+    Parameters
+    ----------
+    O: numpy.array
+        (n, m) objective values
+    block_size: int
+        Number of row comparisons done at once by the NumPy filter
+
+    Returns
+    -------
+    numpy.array
+        (n,) boolean mask of the non-dominated rows
+    """
+    O = np.asarray(O, dtype=float)
+    if O.shape[0] == 0:
+        return np.zeros(0, dtype=bool)
+    if O.shape[1] == 3:
+        return _sweep_non_dominated(O)
+    return _block_non_dominated(O, block_size)
+
+def non_dominated_ranks(O):
+    """
+    Non-dominated rank of each row of an objective matrix: 1 for the rows
+    of the Pareto front, 2 for the front of the remaining rows, and so on.
+
+    Three objectives are ranked in a single sweep, in O(n log^2 n)
+    comparisons. For any other number of objectives the fronts are peeled
+    one after the other with non_dominated.
+
+    Parameters
+    ----------
+    O: numpy.array
+        (n, m) objective values
+
+    Returns
+    -------
+    numpy.array
+        (n,) integer ranks
+    """
+    O = np.asarray(O, dtype=float)
+    if O.shape[0] and O.shape[1] == 3:
+        return _sweep_ranks(O)
+    ranks = np.zeros(O.shape[0], dtype=int)
+    remaining = np.arange(O.shape[0])
+    rank = 0
+    while remaining.size:
+        rank += 1
+        front = non_dominated(O[remaining])
+        ranks[remaining[front]] = rank
+        remaining = remaining[~front]
+    return ranks
+
+def crowding_distances(O, ranks):
+    """
+    Crowding distance of each row within its front: the sum over the
+    objectives of the distance between its two neighbours in the front,
+    relative to the extent of the front. The extreme rows of a front have
+    an infinite distance.
+
+    Parameters
+    ----------
+    O: numpy.array
+        (n, m) objective values
+    ranks: numpy.array
+        (n,) front of each row, see non_dominated_ranks
+
+    Returns
+    -------
+    numpy.array
+        (n,) crowding distances
+    """
+    O = np.asarray(O, dtype=float)
+    ranks = np.asarray(ranks)
+    n = O.shape[0]
+    distances = np.zeros(n)
+    if n == 0:
+        return distances
+    for j in range(O.shape[1]):
+        #rows sorted by front, then by objective j within each front
+        order = np.lexsort((O[:, j], ranks))
+        values = O[order, j]
+        boundary = ranks[order][1:] != ranks[order][:-1]
+        first = np.r_[True, boundary]
+        last = np.r_[boundary, True]
+        group = np.cumsum(first) - 1
+        extent = (values[last] - values[first])[group]
+        gaps = np.full(n, np.inf)
+        interior = np.flatnonzero(~(first | last))
+        spread = values[interior + 1] - values[interior - 1]
+        gaps[interior] = np.divide(spread, extent[interior],
+                                   out=np.zeros(interior.size),
+                                   where=extent[interior] > 0)
+        distances[order] += gaps
+    return distances
+
+def _sweep_non_dominated(O):
+    #rows in lexicographic order can only be dominated by previous rows
+    mask = np.zeros(O.shape[0], dtype=bool)
+    rows = O.tolist()
+    staircase = _Staircase()
+    for i in np.lexsort((O[:, 2], O[:, 1], O[:, 0])).tolist():
+        if not staircase.dominates(*rows[i]):
+            mask[i] = True
+            staircase.add(*rows[i])
+    return mask
+
+def _sweep_ranks(O):
+    #a row dominated by a front is dominated by all the previous fronts,
+    #the rank of a row is found by bisection over the fronts
+    ranks = np.zeros(O.shape[0], dtype=int)
+    rows = O.tolist()
+    fronts = []
+    for i in np.lexsort((O[:, 2], O[:, 1], O[:, 0])).tolist():
+        low, high = 0, len(fronts)
+        while low < high:
+            middle = (low + high) // 2
+            if fronts[middle].dominates(*rows[i]):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(fronts):
+            fronts.append(_Staircase())
+        fronts[low].add(*rows[i])
+        ranks[i] = low + 1
+    return ranks
+
+class _Staircase:
+    """
+    Dominance test against a set of rows of three objectives, for rows
+    visited in lexicographic order. The (O1, O2) staircase of the set is
+    kept in keys, ascending O1, and mins, strictly descending O2, with
+    firsts the smallest O0 of each step.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.mins = []
+        self.firsts = []
+
+    def dominates(self, o0, o1, o2):
+        #True if a row of the set dominates the row, which is not before
+        #any row of the set in lexicographic order
+        k = bisect_right(self.keys, o1) - 1
+        if k < 0 or self.mins[k] > o2:
+            return False
+        #rows identical to the step k do not dominate
+        return (self.mins[k] < o2 or self.keys[k] < o1
+                or self.firsts[k] < o0)
+
+    def add(self, o0, o1, o2):
+        #adds a row not dominated by the set
+        k = bisect_right(self.keys, o1) - 1
+        if k >= 0 and self.mins[k] <= o2:
+            #duplicate of the step k
+            return
+        start = k if k >= 0 and self.keys[k] == o1 else k + 1
+        end = start
+        while end < len(self.keys) and self.mins[end] >= o2:
+            end += 1
+        self.keys[start:end] = [o1]
+        self.mins[start:end] = [o2]
+        self.firsts[start:end] = [o0]
+
+def _block_non_dominated(O, block_size):
+    n = O.shape[0]
+    mask = np.zeros(n, dtype=bool)
+    step = max(1, block_size // n)
+    for start in range(0, n, step):
+        block = O[start:start + step, np.newaxis, :]
+        not_larger = np.all(O <= block, axis=2)
+        smaller = np.any(O < block, axis=2)
+        mask[start:start + step] = ~np.any(not_larger & smaller, axis=1)
+    return mask
@@ -1,47 +1,66 @@
 # Transferred
 import numpy as np
+from .non_dominated import crowding_distances, non_dominated, non_dominated_ranks
 
 
 class Pareto_process_db:
 
-    def __init__(self, data):
+    def __init__(self, data, archive=None):
         self.data = data
+        # Pareto archive of the rows of data, archived with their index
+        self.archive = archive
+        self.ranks = None
+        self.crowding = None
 
     def dump_data(self, fil=None):
         """
-        Dumps the calculated data to a numpy savez file
+        Dumps the calculated data to a numpy savez file, with the
+        non-dominated rank and the crowding distance of each data point
 
         Parameters
         ----------
         fil: String
-            Filename the data is saved to
+            Filename the data is saved to, as a single array with the
+            ranks and crowding distances as its last two columns
         """
-        self.pareto_filter()
+        self.rank()
         if fil:
-            np.savez(fil, self.data)
+            np.savez(fil, np.column_stack([self.data, self.ranks, self.crowding]))
         else:
-            np.savez("pareto_data.npz", volume_A_tilde=self.data[:, 0], conc_e=self.data[:, 1], temperature=self.data[:, 2], reaction_time=self.data[:, 3], impurity_conc=self.data[:, 4], prod_cost=self.data[:, 5], mat_cost=self.data[:, 6])
+            np.savez("pareto_data.npz", volume_A_tilde=self.data[:, 0], conc_e=self.data[:, 1], temperature=self.data[:, 2], reaction_time=self.data[:, 3], impurity_conc=self.data[:, 4], prod_cost=self.data[:, 5], mat_cost=self.data[:, 6], rank=self.ranks, crowding_distance=self.crowding)
+
+    def rank(self):
+        """
+        Computes the non-dominated rank of all data points in the
+        objectives, columns 4 to 6, and their crowding distance in their
+        front. The Pareto front is the one kept by the archive if it is
+        given.
+
+        Returns
+        -------
+        (ranks, crowding): tuple[numpy.array, numpy.array]
+            Ranks, 1 for the Pareto front, and crowding distances
+        """
+        O = self.data[:, 4:7]
+        front = self._front()
+        self.ranks = np.ones(O.shape[0], dtype=int)
+        self.ranks[~front] = non_dominated_ranks(O[~front]) + 1
+        self.crowding = crowding_distances(O, self.ranks)
+        return self.ranks, self.crowding
 
     def pareto_filter(self):
         """
-        Removes all non-optimal data points 
+        Removes all data points dominated in the objectives, columns 4 to 6.
+        The rows kept by the archive are taken if it is given.
         """
-        idx = []
-        for i in range(self.data.shape[0]):
-            loc_min = False
-            for j in range(self.data.shape[0]):
-                lm = True
-                if self.data[i, 4] <= self.data[j, 4]:
-                    lm = False
-                if self.data[i, 5] <= self.data[j, 5]:
-                    lm = False
-                if self.data[i, 6] <= self.data[j, 6]:
-                    lm = False
-                if lm:
-                    loc_min = True
-                    break
-            if not loc_min:
-                idx.append(i)
-        idx = np.array(idx)
-        self.data = self.data[idx]
+        self.data = self.data[self._front()]
         return
+
+    def _front(self):
+        #mask of the non-dominated data points, read from the archive
+        if self.archive is None:
+            return non_dominated(self.data[:, 4:7])
+        _, idx = self.archive.snapshot()
+        front = np.zeros(self.data.shape[0], dtype=bool)
+        front[np.array(idx, dtype=int)] = True
+        return front
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+
+from force_bdss_prototype.pareto_process.non_dominated import crowding_distances, non_dominated, non_dominated_ranks, _block_non_dominated
+
+O = np.array([[1., 2., 3.],
+              [1., 2., 3.],
+              [1., 2., 4.],
+              [2., 1., 3.],
+              [0., 3., 3.],
+              [2., 2., 2.],
+              [3., 3., 3.]])
+
+class Non_dominatedTestCase(unittest.TestCase):
+
+    def test_ties_and_duplicates(self):
+        expected = [True, True, False, True, True, True, False]
+        np.testing.assert_array_equal(non_dominated(O), expected)
+        np.testing.assert_array_equal(_block_non_dominated(O, 4), expected)
+
+    def test_order_independent(self):
+        order = np.random.default_rng(0).permutation(O.shape[0])
+        np.testing.assert_array_equal(non_dominated(O[order]),
+                                      non_dominated(O)[order])
+
+    def test_sweep_matches_block(self):
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            data = rng.integers(0, 4, (rng.integers(1, 60), 3)).astype(float)
+            np.testing.assert_array_equal(non_dominated(data),
+                                          _block_non_dominated(data, 100))
+
+    def test_other_dimensions(self):
+        data = np.array([[1., 2.], [2., 1.], [2., 2.], [1., 2.]])
+        np.testing.assert_array_equal(non_dominated(data),
+                                      [True, True, False, True])
+        self.assertEqual(non_dominated(np.zeros((0, 3))).shape, (0,))
+
+    def test_ranks(self):
+        np.testing.assert_array_equal(non_dominated_ranks(O),
+                                      [1, 1, 2, 1, 1, 1, 2])
+        rng = np.random.default_rng(2)
+        data = rng.random((200, 3))
+        ranks = non_dominated_ranks(data)
+        for rank in range(1, ranks.max() + 1):
+            remaining = ranks >= rank
+            np.testing.assert_array_equal(
+                non_dominated(data[remaining]), ranks[remaining] == rank)
+        self.assertEqual(non_dominated_ranks(np.zeros((0, 3))).shape, (0,))
+
+    def test_crowding_distances(self):
+        data = np.array([[0., 4.], [1., 2.], [2., 1.], [4., 0.],
+                         [2., 4.], [4., 2.], [3., 3.]])
+        ranks = np.array([1, 1, 1, 1, 2, 2, 2])
+        distances = crowding_distances(data, ranks)
+        np.testing.assert_allclose(distances[[1, 2, 6]],
+                                   [2 / 4 + 3 / 4, 3 / 4 + 2 / 4, 2 / 2 + 2 / 2])
+        self.assertTrue(np.all(np.isinf(distances[[0, 3, 4, 5]])))
+        # fronts without extent
+        distances = crowding_distances(np.ones((3, 2)), np.ones(3, dtype=int))
+        np.testing.assert_array_equal(distances, [np.inf, 0, np.inf])
@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
+from unittest import mock
 import numpy as np
 
 from force_bdss_prototype.pareto_process.pareto_process_db import Pareto_process_db
+from itwm_example.mco.pareto_archive import ParetoArchive
 
 data = np.arange(10)
 
@@ -14,3 +18,57 @@ class Pareto_process_dbTestCase(unittest.TestCase):
     def test_init(self):
         pp_db = Pareto_process_db(np.copy(data))
         self.assertTrue(np.all(data == pp_db.data))
+
+    def test_pareto_filter(self):
+        data = np.zeros((4, 7))
+        data[:, 0] = np.arange(4)
+        data[:, 4:] = [[1., 2., 3.], [1., 2., 4.], [2., 1., 3.], [1., 2., 3.]]
+        pp_db = Pareto_process_db(data)
+        pp_db.pareto_filter()
+        np.testing.assert_array_equal(pp_db.data[:, 0], [0, 2, 3])
+
+    def test_pareto_filter_archive(self):
+        data = np.zeros((4, 7))
+        data[:, 0] = np.arange(4)
+        data[:, 4:] = [[1., 2., 3.], [1., 2., 4.], [2., 1., 3.], [1., 2., 3.]]
+        archive = ParetoArchive()
+        for i in range(3, -1, -1):
+            archive.insert(data[i, 4:], i)
+        pp_db = Pareto_process_db(data, archive=archive)
+        pp_db.pareto_filter()
+        np.testing.assert_array_equal(pp_db.data[:, 0], [0, 2, 3])
+
+    def test_rank(self):
+        data = np.zeros((4, 7))
+        data[:, 4:] = [[1., 2., 3.], [1., 2., 4.], [2., 1., 3.], [1., 2., 3.]]
+        pp_db = Pareto_process_db(data)
+        ranks, crowding = pp_db.rank()
+        np.testing.assert_array_equal(ranks, [1, 2, 1, 1])
+        np.testing.assert_array_equal(pp_db.ranks, ranks)
+        self.assertEqual(crowding.shape, (4,))
+        self.assertTrue(np.isinf(crowding[1]))
+
+    def test_dump_data_ranks(self):
+        data = np.zeros((4, 7))
+        data[:, 4:] = [[1., 2., 3.], [1., 2., 4.], [2., 1., 3.], [1., 2., 3.]]
+        pp_db = Pareto_process_db(data)
+        with tempfile.TemporaryDirectory() as tmp:
+            fil = os.path.join(tmp, "data.npz")
+            pp_db.dump_data(fil)
+            with np.load(fil) as saved:
+                dump = saved["arr_0"]
+        self.assertEqual(dump.shape, (4, 9))
+        np.testing.assert_array_equal(dump[:, :7], data)
+        np.testing.assert_array_equal(dump[:, 7], [1, 2, 1, 1])
+        np.testing.assert_array_equal(dump[:, 8], pp_db.crowding)
+
+    def test_rank_archive(self):
+        data = np.zeros((4, 7))
+        data[:, 4:] = [[1., 2., 3.], [1., 2., 4.], [2., 1., 3.], [1., 2., 3.]]
+        archive = mock.Mock()
+        archive.snapshot.return_value = (data[[2, 3], 4:], [2, 3])
+        pp_db = Pareto_process_db(data, archive=archive)
+        ranks, _ = pp_db.rank()
+        # the front is taken from the archive, the other points are ranked
+        archive.snapshot.assert_called_once_with()
+        np.testing.assert_array_equal(ranks, [2, 3, 1, 1])
@@ -3,7 +3,11 @@ from ..databases.process_db_access import Process_db_access
 from ..databases.material_db_access import Material_db_access
 from ..initializer.initializer import Initializer
 from .reaction_kinetics import Reaction_kinetics
-from sympy import symbols, Matrix, sympify, diff, evalf, lambdify
+from ..codegen.codegen_cache import cached_functions
+from sympy import symbols, Matrix, sympify
+
+#: initial state (X-Dim) as functions of the y-dimension
+X_FUNCTIONS = ["p_A * (1 - C_e / p_C) * V_a / V_r", "p_B * (V_r - V_a) / V_r", "0", "0", "C_e * V_a / V_r", "T", "t"]
 
 class Reaction_kineticswrapper():
     """
@@ -28,17 +32,8 @@ class Reaction_kineticswrapper():
         #fixed value symbols
         p_A, p_B, p_C, V_r, W, const_A, cost_B, quad_coeff, C_supplier, cost_purification = symbols("p_A, p_B, p_C, V_r, W, const_A, cost_B, quad_coeff, C_supplier, cost_purification")
 
-        #grad_X_x setup
-        grad_X_x = Matrix([
-            [*symbols("dAdA0, dBdA0, dPdA0, dSdA0, dCdA0, dTdA0, dtdA0")],
-            [*symbols("dAdB0, dBdB0, dPdB0, dSdB0, dCdB0, dTdB0, dtdB0]")],
-            [*symbols("dAdP0, dBdP0, dPdP0, dSdP0, dCdP0, dTdP0, dtdP0]")],
-            [*symbols("dAdS0, dBdS0, dPdS0, dSdS0, dCdS0, dTdS0, dtdS0]")],
-            [*symbols("dAdC0, dBdC0, dPdC0, dSdC0, dCdC0, dTdC0, dtdC0]")],
-            [*symbols("dAdT0, dBdT0, dPdT0, dSdT0, dCdT0, dTdT0, dtdT0]")],
-            [*symbols("dAdt0, dBdt0, dPdt0, dSdt0, dCdt0, dTdt0, dtdt0]")]
-        ])
-    
+        fixed_values = [p_A_value, p_B_value, p_C_value, V_r_value]
+
         #y setup
         V_a, C_e, T, t = symbols("V_a, C_e, T, t")
         self.y = [V_a, C_e, T, t]
@@ -46,48 +41,26 @@ class Reaction_kineticswrapper():
         #X-Dim setup
         conc_A, conc_B, conc_P, conc_S, conc_C, T, t = symbols("conc_A, conc_B, conc_P, conc_S, conc_C, T, t")
         self.X_Dim = [conc_A, conc_B, conc_P, conc_S, conc_C, T, t]
-        conc_A = sympify("p_A * (1 - C_e / p_C) * V_a / V_r").subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value)
-        conc_B = sympify("p_B * (V_r - V_a) / V_r").subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value)
-        conc_P = sympify("0").subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value)
-        conc_S = sympify("0").subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value)
-        conc_C = sympify("C_e * V_a / V_r").subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value)
-        T = sympify("T").subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value)
-        t = sympify("t").subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value)
-
-        #grad_y_X setup
-        grad_y_X = []
-        for y_h in self.y: grad_y_X.append([conc_A.diff(y_h), conc_B.diff(y_h), conc_P.diff(y_h), conc_S.diff(y_h), conc_C.diff(y_h), T.diff(y_h), t.diff(y_h)])
-        grad_y_X = Matrix(grad_y_X)
-
-        #grad_y_XO setup
-        self.grad_y_x = grad_y_X * grad_X_x
-
-        #lambdify X-Dim
-        conc_A = lambdify(self.y, conc_A)
-        conc_B = lambdify(self.y, conc_B)
-        conc_P = lambdify(self.y, conc_P)
-        conc_S = lambdify(self.y, conc_S)
-        conc_C = lambdify(self.y, conc_C)
-        T      = lambdify(self.y, T)
-        t      = lambdify(self.y, t)
 
-        #X setup
-        self.X = lambda y: np.array([conc_A(*y),
-                                     conc_B(*y),
-                                     conc_P(*y),
-                                     conc_S(*y),
-                                     conc_C(*y),
-                                     T(*y),
-                                     t(*y),
-                                    ], dtype=np.float)
+        def build():
+            X = [sympify(x).subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value) for x in X_FUNCTIONS]
+
+            #grad_y_X setup
+            grad_y_X = []
+            for y_h in self.y: grad_y_X.append([x.diff(y_h) for x in X])
+            grad_y_X = Matrix(grad_y_X)
 
-        #substitute fixed values
-        self.grad_y_x = self.grad_y_x.subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value).subs(W, W_value).subs(const_A, const_A_value).subs(cost_B, cost_B_value).subs(quad_coeff, quad_coeff_value).subs(C_supplier,C_supplier_value).subs(cost_purification, cost_purification_value).evalf()
+            #substitute fixed values
+            grad_y_X = grad_y_X.subs(p_A, p_A_value).subs(p_B, p_B_value).subs(p_C, p_C_value).subs(V_r, V_r_value).evalf()
+            return [Matrix(X), grad_y_X]
 
+        #numeric X-Dim and grad_y_X, generated from the symbolic ones or
+        #loaded from the code generation cache
+        X, grad_y_X = cached_functions(["reaction_kinetics", X_FUNCTIONS, fixed_values], [str(y_h) for y_h in self.y], build)
 
-        #lambdify objectives
-        #use grad_X_x.transpose() because grad_X_x in calc is transposed
-        self.grad_y_x = lambdify(self.y+self.X_Dim[:5]+grad_X_x.transpose().values(), self.grad_y_x)
+        #X setup
+        self.X = lambda y: np.array(X(*y), dtype=float).flatten()
+        self.grad_y_X = lambda y: np.array(grad_y_X(*y), dtype=float)
 
 
     def calc_x(self, y):
@@ -116,7 +89,29 @@ class Reaction_kineticswrapper():
         grad_X_x[:5, :] = grad_X_x_mat
         grad_X_x[5, 5] = 1
         grad_X_x[6, 6] = 1
-        grad_y_x = Matrix(self.grad_y_x(*y,*x_mat, *grad_X_x.flatten()))
+        grad_y_x = self.grad_y_x(y, grad_X_x)
         return (x, grad_y_x)
 
+    def grad_y_x(self, y, grad_X_x):
+        """
+        Chains the y_X gradient of the initial state with the Jacobian of
+        the simulation
+
+        Parameters
+        ----------
+        y: numpy.array
+            Numpy array containing the y-dimension values
+        grad_X_x: numpy.array
+            (7, 7) numpy array of the derivatives of the simulation results
+            (rows) with respect to the initial state (columns), or the same
+            values flattened
+
+        Returns
+        -------
+        grad_y_x: numpy.array
+            (4, 7) numpy array containing the y_x gradient matrix
+        """
+        grad_X_x = np.reshape(grad_X_x, (7, 7))
+        return self.grad_y_X(y) @ grad_X_x.T
+
 
@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+
+from force_bdss_prototype.reaction_kinetics.reaction_kineticswrapper import Reaction_kineticswrapper
+
+A = { "name": "eductA", "manufacturer": "", "pdi": 0 }
+B = { "name": "eductB", "manufacturer": "", "pdi": 0 }
+C = { "name": "contamination", "manufacturer": "", "pdi": 0 }
+P = { "name": "product", "manufacturer": "", "pdi": 0 }
+R = { "reactants": [A, B], "products": [P] }
+nptype = type(np.array([]))
+
+
+class Reaction_kineticswrapperTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.wrapper = Reaction_kineticswrapper(R, C)
+        self.y = np.array([0.5, 0.05, 350., 2670.])
+
+    def test_calc_x_return_type(self):
+        x, grad_y_x = self.wrapper.calc_x(self.y)
+        self.assertEqual(type(x), nptype)
+        self.assertEqual(type(grad_y_x), nptype)
+
+    def test_calc_x_return_shape(self):
+        x, grad_y_x = self.wrapper.calc_x(self.y)
+        self.assertEqual(x.shape, (7, ))
+        self.assertEqual(grad_y_x.shape, (4, 7))
+
+    def test_grad_y_x(self):
+        grad_X_x = np.arange(49, dtype=float).reshape(7, 7)
+        grad_y_X = self.wrapper.grad_y_X(self.y)
+        self.assertEqual(grad_y_X.shape, (4, 7))
+        np.testing.assert_allclose(
+            self.wrapper.grad_y_x(self.y, grad_X_x.flatten()),
+            grad_y_X @ grad_X_x.T)
@@ -1,13 +1,16 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from force_bdss.api import BaseDataSourceFactory
+from itwm_example.core.constant_data_source_factory import (
+    ConstantDataSourceFactory
+)
 
 from .arrhenius_parameters_model import ArrheniusParametersModel
 from .arrhenius_parameters import ArrheniusParameters
 
 
-class ArrheniusParametersFactory(BaseDataSourceFactory):
+class ArrheniusParametersFactory(ConstantDataSourceFactory):
+
     def get_identifier(self):
         return "arrhenius_parameters"
 
@@ -0,0 +1,25 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from traits.api import Bool
+
+from force_bdss.api import BaseDataSourceFactory
+
+
+class ConstantDataSourceFactory(BaseDataSourceFactory):
+    """ Factory of a data source whose outputs only depend on its model,
+    so that they can be computed once and reused for every MCO
+    evaluation."""
+
+    #: Flags the data source as constant, see `is_constant_data_source`
+    is_constant = Bool(True)
+
+
+def is_constant_data_source(model):
+    """ Whether the outputs of the data source `model` are the same for
+    every MCO evaluation: its factory is flagged `is_constant` and it
+    takes no inputs from the workflow."""
+    return (
+        getattr(model.factory, "is_constant", False)
+        and len(model.input_slot_info) == 0
+    )
@@ -0,0 +1,30 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+from itwm_example.core.constant_data_source_factory import (
+    ConstantDataSourceFactory,
+    is_constant_data_source,
+)
+from itwm_example.itwm_example_plugin import ITWMExamplePlugin
+
+
+class TestConstantDataSourceFactory(TestCase):
+    def setUp(self):
+        self.plugin = ITWMExamplePlugin()
+
+    def test_is_constant_data_source(self):
+        factories = self.plugin.data_source_factories
+        self.assertTrue(is_constant_data_source(factories[2].create_model()))
+        self.assertFalse(
+            is_constant_data_source(factories[1].create_model()))
+
+    def test_constant_factories(self):
+        constant = [
+            factory for factory in self.plugin.data_source_factories
+            if isinstance(factory, ConstantDataSourceFactory)
+        ]
+        self.assertEqual(3, len(constant))
+        for factory in constant:
+            self.assertTrue(factory.is_constant)
@@ -1,13 +1,16 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from force_bdss.api import BaseDataSourceFactory
+from itwm_example.core.constant_data_source_factory import (
+    ConstantDataSourceFactory
+)
 
 from .fixed_value_data_source_model import FixedValueDataSourceModel
 from .fixed_value_data_source import FixedValueDataSource
 
 
-class FixedValueDataSourceFactory(BaseDataSourceFactory):
+class FixedValueDataSourceFactory(ConstantDataSourceFactory):
+
     def get_identifier(self):
         return "fixed_value_data_source"
 
@@ -0,0 +1,155 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+""" Optional Numba compiled backend of the impurity concentration kinetics.
+
+The kinetics of a single initial state are compiled into a generalized
+ufunc, `(n),(m)->(n),(n,n),(n,m)`, that maps the 7 component initial state
+and the two rate constants onto the final state and its Jacobians with
+respect to both. NumPy broadcasting then evaluates any number of states in
+compiled code.
+
+Numba is not a requirement of the plugin. When it cannot be imported,
+`compiled_kernel` returns None and callers fall back to the NumPy kernels.
+"""
+
+from functools import lru_cache
+import logging
+import os
+
+import numpy as np
+
+from .reaction_kinetics import (
+    _exponential_kernel,
+    _horner_sums,
+    _series_terms,
+    series_coefficients,
+)
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+log = logging.getLogger(__name__)
+
+#: Kinetics backends available to the impurity concentration data source
+KINETICS_BACKENDS = ("NumPy", "Numba")
+
+#: Environment variable selecting the default kinetics backend
+KINETICS_BACKEND_ENV = "ITWM_EXAMPLE_KINETICS_BACKEND"
+
+
+def default_kinetics_backend():
+    """ Kinetics backend named by the `ITWM_EXAMPLE_KINETICS_BACKEND`
+    environment variable, "NumPy" if it is unset or not recognised."""
+    backend = os.environ.get(KINETICS_BACKEND_ENV, "NumPy")
+    for name in KINETICS_BACKENDS:
+        if backend.lower() == name.lower():
+            return name
+    log.warning(
+        f"Unknown kinetics backend {backend!r} in {KINETICS_BACKEND_ENV}, "
+        "using NumPy"
+    )
+    return "NumPy"
+
+
+@lru_cache(maxsize=None)
+def compiled_kernel():
+    """ Compiles the kinetics on first use.
+
+    Returns
+    -------
+    kernel: callable or None
+        Function with the same signature and results as the NumPy
+        `_kinetics_kernel` of the impurity concentration data source, or
+        None if Numba is not available.
+    """
+    if numba is None:
+        log.warning("Numba is not installed, using the NumPy kinetics")
+        return None
+
+    gufunc = _build_gufunc()
+
+    def kernel(X0, k_ps):
+        X, grad_x_X, grad_k_X = gufunc(
+            np.asarray(X0, dtype=float),
+            np.asarray(k_ps, dtype=float)
+        )
+        return X[..., :5], grad_x_X[..., :5, :], grad_k_X[..., :5, :]
+
+    return kernel
+
+
+def _build_gufunc():
+    tol = 8e-2
+    sum1_coeffs, sum2_coeffs, sum3_coeffs = series_coefficients(5)
+    exponential_kernel = numba.njit(_exponential_kernel)
+    horner_sums = numba.njit(_horner_sums)
+    series_terms = numba.njit(_series_terms)
+
+    @numba.guvectorize(
+        ["void(float64[:], float64[:], "
+         "float64[:], float64[:, :], float64[:, :])"],
+        "(n),(m)->(n),(n,n),(n,m)",
+        nopython=True
+    )
+    def gufunc(X0, k_ps, X, grad_x_X, grad_k_X):
+        A0, B0, P0, S0, C0, T, t = (
+            X0[0], X0[1], X0[2], X0[3], X0[4], X0[5], X0[6])
+        kp = k_ps[0]
+        ks = k_ps[1]
+        k = kp + ks
+        kpk = kp / k
+        ksk = ks / k
+
+        if abs((A0 - B0) * k * t) > tol:
+            al, da, db, dk, dt = exponential_kernel(A0, B0, k, t)
+        else:
+            sum1ab, sum2ab, sum3ab = horner_sums(
+                A0, B0, k, t, sum1_coeffs, sum2_coeffs, sum3_coeffs)
+            sum1ba, sum2ba, sum3ba = horner_sums(
+                B0, A0, k, t, sum1_coeffs, sum2_coeffs, sum3_coeffs)
+            al, da, db, dk, dt = series_terms(
+                A0, B0, k, t,
+                sum1ab, sum2ab, sum3ab, sum1ba, sum2ba, sum3ba)
+
+        X[0] = A0 - al
+        X[1] = B0 - al
+        X[2] = P0 + kpk * al
+        X[3] = S0 + ksk * al
+        X[4] = C0
+        X[5] = T
+        X[6] = t
+
+        # The temperature only enters through the rate constants
+        grad_x_X[:, :] = 0.
+        grad_x_X[0, 0] = 1 - da
+        grad_x_X[0, 1] = - db
+        grad_x_X[0, 6] = - dt
+        grad_x_X[1, 0] = - da
+        grad_x_X[1, 1] = 1 - db
+        grad_x_X[1, 6] = - dt
+        grad_x_X[2, 0] = kpk * da
+        grad_x_X[2, 1] = kpk * db
+        grad_x_X[2, 2] = 1
+        grad_x_X[2, 6] = kpk * dt
+        grad_x_X[3, 0] = ksk * da
+        grad_x_X[3, 1] = ksk * db
+        grad_x_X[3, 3] = 1
+        grad_x_X[3, 6] = ksk * dt
+        grad_x_X[4, 4] = 1
+        grad_x_X[5, 5] = 1
+        grad_x_X[6, 6] = 1
+
+        grad_k_X[:, :] = 0.
+        grad_k_X[0, 0] = - dk
+        grad_k_X[0, 1] = - dk
+        grad_k_X[1, 0] = - dk
+        grad_k_X[1, 1] = - dk
+        grad_k_X[2, 0] = ksk / k * al + kpk * dk
+        grad_k_X[2, 1] = - kpk / k * al + kpk * dk
+        grad_k_X[3, 0] = - ksk / k * al + ksk * dk
+        grad_k_X[3, 1] = kpk / k * al + ksk * dk
+
+    return gufunc
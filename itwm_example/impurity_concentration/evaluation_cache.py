@@ -0,0 +1,80 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EvaluationCache:
+    """ Least recently used cache of data source evaluations, keyed on
+    the input values rounded to a fixed number of decimals.
+
+    Optimizers often evaluate the same, or almost the same, point more
+    than once. Rounding the inputs lets such repeated evaluations be
+    served from the cache, and the `hits` and `misses` counters show
+    whether it pays off.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of stored evaluations. A cache of size 0 stores
+        nothing and every lookup is a miss.
+    decimals: int
+        Number of decimals the input values are rounded to
+    """
+
+    def __init__(self, maxsize=128, decimals=10):
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, values):
+        """ Hashable key of the input `values`."""
+        return tuple(
+            np.round(np.asarray(values, dtype=float), self.decimals).tolist()
+        )
+
+    def lookup(self, values):
+        """ Returns the stored outputs of the input `values`, or None if
+        they have not been evaluated yet."""
+        key = self.key(values)
+        try:
+            outputs = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _copy_outputs(outputs)
+
+    def store(self, values, outputs):
+        """ Stores the `outputs` of the input `values`, discarding the
+        least recently used evaluation if the cache is full."""
+        if self.maxsize <= 0:
+            return
+        key = self.key(values)
+        self._entries[key] = _copy_outputs(outputs)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """ Removes all stored evaluations and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _copy_outputs(outputs):
+    # Stored arrays must not be shared with the callers, who may
+    # modify them in place
+    return tuple(
+        output.copy() if isinstance(output, np.ndarray) else output
+        for output in outputs
+    )
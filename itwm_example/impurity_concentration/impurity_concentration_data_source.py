@@ -2,57 +2,76 @@
 #  All rights reserved.
 
 import numpy as np
-from scipy.special import factorial
-
 from force_bdss.api import DataValue, Slot, BaseDataSource
 
+from .compiled_kinetics import compiled_kernel
+from .reaction_kinetics import alpha_and_derivatives
+
 
 class ImpurityConcentrationDataSource(BaseDataSource):
     def run(self, model, parameters):
-        V_a_tilde = parameters[0].value
-        C_conc_e = parameters[1].value
-        temperature = parameters[2].value
-        reaction_time = parameters[3].value
-        arrhenius_nu_main_reaction = parameters[4].value
-        arrhenius_delta_H_main_reaction = parameters[5].value
-        arrhenius_nu_secondary_reaction = parameters[6].value
-        arrhenius_delta_H_secondary_reaction = parameters[7].value
-        reactor_volume = parameters[8].value
-        A_density = parameters[9].value
-        B_density = parameters[10].value
-        C_density = parameters[11].value
-
-        X = np.zeros(7, float)
-        X[0] = A_density * (1 -
-                            C_conc_e / C_density) * V_a_tilde / reactor_volume
-        X[1] = B_density * (reactor_volume - V_a_tilde) / reactor_volume
-        X[2] = 0
-        X[3] = 0
-        X[4] = C_conc_e * V_a_tilde / reactor_volume
-        X[5] = temperature
-        X[6] = reaction_time
-
-        M = (
-            np.array([arrhenius_nu_main_reaction,
-                      arrhenius_nu_secondary_reaction]),
-            np.array([arrhenius_delta_H_main_reaction,
-                      arrhenius_delta_H_secondary_reaction])
-        )
-        X_mat, grad_x_X_mat = _run(X, M)
-        impurity_conc = float(X_mat[3] + X_mat[4] + X_mat[0] + X_mat[1])
-        dIda = np.sum(grad_x_X_mat[0:2, 0] + grad_x_X_mat[3:5, 0])
-        dIdb = np.sum(grad_x_X_mat[0:2, 1] + grad_x_X_mat[3:5, 1])
-        dIdp = np.sum(grad_x_X_mat[0:2, 2] + grad_x_X_mat[3:5, 2])
-        dIds = np.sum(grad_x_X_mat[0:2, 3] + grad_x_X_mat[3:5, 3])
-        dIdc = np.sum(grad_x_X_mat[0:2, 4] + grad_x_X_mat[3:5, 4])
-        dIdT = np.sum(grad_x_X_mat[0:2, 5] + grad_x_X_mat[3:5, 5])
-        dIdt = np.sum(grad_x_X_mat[0:2, 6] + grad_x_X_mat[3:5, 6])
-        grad_x_I = np.array([dIda, dIdb, dIdp, dIds, dIdc, dIdT, dIdt])
+        values = [parameter.value for parameter in parameters]
+        if model.cache_size > 0:
+            cached = model.evaluation_cache.lookup(values)
+        else:
+            cached = None
+
+        if cached is None:
+            X_mat, grad_x_X_mat, grad_M_X_mat = _run(
+                *_kinetics_inputs(values), kernel=_kinetics_backend(model))
+            impurity_conc = float(_impurity_concentration(X_mat))
+            grad_I = _input_gradient(
+                values,
+                _impurity_concentration_gradient(grad_x_X_mat),
+                _impurity_concentration_gradient(grad_M_X_mat)
+            )
+            if model.cache_size > 0:
+                model.evaluation_cache.store(
+                    values, (impurity_conc, grad_I))
+        else:
+            impurity_conc, grad_I = cached
+
         return [
             DataValue(value=impurity_conc, type="CONCENTRATION"),
-            DataValue(value=grad_x_I, type="CONCENTRATION_GRADIENT")
+            DataValue(value=grad_I, type="CONCENTRATION_GRADIENT")
         ]
 
+    def run_batch(self, model, parameter_matrix):
+        """ Evaluates the data source for many sets of input slot values
+        at once, without building any intermediate `DataValue` objects.
+
+        Parameters
+        ----------
+        model: ImpurityConcentrationDataSourceModel
+            Model of the data source
+        parameter_matrix: array_like
+            (N, 12) array of input slot values, one row per evaluation
+            point and one column per input slot, in `slots` order
+
+        Returns
+        -------
+        impurity_conc: np.ndarray
+            (N,) array of impurity concentrations
+        grad_I: np.ndarray
+            (N, 12) array of impurity concentration gradients with respect
+            to the input slots
+        """
+        parameter_matrix = np.atleast_2d(
+            np.asarray(parameter_matrix, dtype=float))
+        values = parameter_matrix.T
+        X_mat, grad_x_X_mat, grad_M_X_mat = _run_batch(
+            *_kinetics_inputs(values),
+            kernel=_kinetics_backend(model)
+        )
+        return (
+            _impurity_concentration(X_mat),
+            _input_gradient(
+                values,
+                _impurity_concentration_gradient(grad_x_X_mat),
+                _impurity_concentration_gradient(grad_M_X_mat)
+            )
+        )
+
     def slots(self, model):
         return (
             (
@@ -82,195 +101,235 @@ class ImpurityConcentrationDataSource(BaseDataSource):
         )
 
 
-def _analytical_solution(A0, B0, P0, S0, C0, k_ps, t):
-    a = _alpha(A0, B0, np.sum(k_ps), t)
-    A = A0 - a
-    B = B0 - a
-    P = P0 + k_ps[0] / np.sum(k_ps) * a
-    S = S0 + k_ps[1] / np.sum(k_ps) * a
-    C = C0
-    return np.array([A, B, P, S, C])
-
-
-def _sum1(A0, B0, k, t, n=5):
-    exponent = np.arange(1, n + 1, 1)
-    denominator = factorial(exponent)
-    result = ((B0 - A0) ** (exponent - 1)) * (k * t) ** exponent
-    return np.sum(result / denominator)
-
-
-def _sum2(A0, B0, k, t, n=5):
-    exponent = np.arange(2, n + 1, 1)
-    denominator = factorial(exponent) / (exponent - 1)
-    result = ((B0 - A0) ** (exponent - 2)) * (k * t) ** exponent
-    return np.sum(result / denominator)
-
-
-def _sum3(A0, B0, k, t, n=5):
-    exponent = np.arange(1, n + 1, 1)
-    denominator = factorial(exponent) / exponent
-    result = ((B0 - A0) ** (exponent - 1)) * (k * t) ** (exponent - 1)
-    return np.sum(result / denominator)
-
-
-def _alpha(A0, B0, k, t):
-    epsilon = np.abs((A0 - B0) * k * t)
-    if epsilon > 8e-2:
-        multiplier = np.exp((B0 - A0) * k * t)
-        result = A0 * B0 * (multiplier - 1) / (B0 * multiplier - A0)
-    else:
-        sum1ab = _sum1(A0, B0, k, t)
-        sum1ba = _sum1(B0, A0, k, t)
-        result = (A0 * B0 * sum1ab) / (1. + (B0 * sum1ab))
-        result += (A0 * B0 * sum1ba) / (1. + (A0 * sum1ba))
-        result /= 2
-    return result
-
-
-def _dalda(A0, B0, k, t):
-    epsilon = np.abs((A0 - B0) * k * t)
-    if epsilon > 8e-2:
-        B0expo = B0 * np.exp((B0 - A0) * k * t)
-        result = B0expo * (B0expo + k * t * A0**2 - k * t * A0 * B0 - B0)
-        result /= (B0expo - A0)**2
-    else:
-        sum1ab = _sum1(A0, B0, k, t)
-        sum1ba = _sum1(B0, A0, k, t)
-        sum2ab = _sum2(A0, B0, k, t)
-        sum2ba = _sum2(B0, A0, k, t)
-        p1 = (B0 * sum1ab - A0 * B0 * sum2ab) * (1 + B0 * sum1ab)
-        p2 = (-B0 * sum2ab) * (A0 * B0 * sum1ab)
-        p3 = (B0 * sum1ba + A0 * B0 * sum2ba) * (1 + A0 * sum1ba)
-        p4 = (sum1ba + A0 * sum2ba) * (A0 * B0 * sum1ba)
-        result = (p1 - p2) / (1 + B0 * sum1ab)**2
-        result += (p3 - p4) / (1 + A0 * sum1ba)**2
-        result /= 2
-    return result
-
-
-def _daldb(A0, B0, k, t):
-    epsilon = np.abs((A0 - B0) * k * t)
-    if epsilon > 8e-2:
-        expo = np.exp((B0 - A0) * k * t)
-        B0expo = B0 * expo
-        result = A0 * ((k * t * B0**2 - k * t * A0 * B0 - A0) * expo + A0)
-        result /= (B0expo - A0)**2
-    else:
-        sum1ab = _sum1(A0, B0, k, t)
-        sum1ba = _sum1(B0, A0, k, t)
-        sum2ab = _sum2(A0, B0, k, t)
-        sum2ba = _sum2(B0, A0, k, t)
-        p1 = (A0 * sum1ab + A0 * B0 * sum2ab) * (1 + B0 * sum1ab)
-        p2 = (sum1ab + B0 * sum2ab) * A0 * B0 * sum1ab
-        p3 = (A0 * sum1ba - A0 * B0 * sum2ba) * (1 + A0 * sum1ba)
-        p4 = A0 * (-sum2ba) * A0 * B0 * sum1ba
-        result = (p1 - p2) / (1 + B0 * sum1ab)**2
-        result += (p3 - p4) / (1 + A0 * sum1ba)**2
-        result /= 2
-    return result
-
-
-def _daldk(A0, B0, k, t):
-    epsilon = np.abs((A0 - B0) * k * t)
-    if epsilon > 8e-2:
-        B0expo = B0 * np.exp((B0 - A0) * k * t)
-        result = t * A0 * B0expo * (B0 - A0)**2 / (B0expo - A0)**2
-    else:
-        sum1ab = _sum1(A0, B0, k, t)
-        sum1ba = _sum1(B0, A0, k, t)
-        sum3ab = _sum3(A0, B0, k, t)
-        sum3ba = _sum3(B0, A0, k, t)
-        p1 = A0 * B0 * t * sum3ab * (1 + B0 * sum1ab)
-        p2 = B0 * t * sum3ab * A0 * B0 * sum1ab
-        p3 = A0 * B0 * t * sum3ba * (1 + A0 * sum1ba)
-        p4 = A0 * t * sum3ba * A0 * B0 * sum1ba
-        result = (p1 - p2) / (1 + B0 * sum1ab)**2
-        result += (p3 - p4) / (1 + A0 * sum1ba)**2
-        result /= 2
-    return result
-
-
-def _daldt(A0, B0, k, t):
-    epsilon = np.abs((A0 - B0) * k * t)
-    if epsilon > 8e-2:
-        B0expo = B0 * np.exp((B0 - A0) * k * t)
-        result = k * A0 * B0expo * (B0 - A0)**2 / (B0expo - A0)**2
-    else:
-        sum1ab = _sum1(A0, B0, k, t)
-        sum1ba = _sum1(B0, A0, k, t)
-        sum3ab = _sum3(A0, B0, k, t)
-        sum3ba = _sum3(B0, A0, k, t)
-        p1 = A0 * B0 * k * sum3ab * (1 + B0 * sum1ab)
-        p2 = B0 * k * sum3ab * A0 * B0 * sum1ab
-        p3 = A0 * B0 * k * sum3ba * (1 + A0 * sum1ba)
-        p4 = A0 * k * sum3ba * A0 * B0 * sum1ba
-        result = (p1 - p2) / (1 + B0 * sum1ab)**2
-        result += (p3 - p4) / (1 + A0 * sum1ba)**2
-        result /= 2
-    return result
-
-
-def _grad_x(A0, B0, P0, S0, C0, k_ps, t):
-    grad_x_X_mat = np.empty((5, 7))
-    kp, ks = k_ps
-    k = np.sum(k_ps)
+def _kinetics_backend(model):
+    """ Kinetics kernel selected by the `kinetics_backend` of the model,
+    the NumPy `_kinetics_kernel` unless a compiled backend is available."""
+    if model.kinetics_backend == "Numba":
+        kernel = compiled_kernel()
+        if kernel is not None:
+            return kernel
+    return _kinetics_kernel
+
+
+def _kinetics_inputs(values):
+    """ Converts the input slot values of the data source into the initial
+    state X and Arrhenius parameters M of the reaction kinetics. Each entry
+    of `values` may be a scalar or an array of per-point values."""
+    (V_a_tilde, C_conc_e, temperature, reaction_time,
+     arrhenius_nu_main_reaction, arrhenius_delta_H_main_reaction,
+     arrhenius_nu_secondary_reaction, arrhenius_delta_H_secondary_reaction,
+     reactor_volume, A_density, B_density, C_density) = values
+
+    X = np.zeros(np.shape(V_a_tilde) + (7,))
+    X[..., 0] = A_density * (1 -
+                             C_conc_e / C_density) * V_a_tilde / reactor_volume
+    X[..., 1] = B_density * (reactor_volume - V_a_tilde) / reactor_volume
+    X[..., 4] = C_conc_e * V_a_tilde / reactor_volume
+    X[..., 5] = temperature
+    X[..., 6] = reaction_time
+
+    M = (
+        np.stack([arrhenius_nu_main_reaction,
+                  arrhenius_nu_secondary_reaction], axis=-1),
+        np.stack([arrhenius_delta_H_main_reaction,
+                  arrhenius_delta_H_secondary_reaction], axis=-1)
+    )
+    return X, M
+
+
+def _kinetics_inputs_gradient(values):
+    """ Jacobian of the initial state X with respect to the input slot
+    values, as a (..., 7, 12) array. The Arrhenius parameters do not enter
+    the initial state, they are accounted for by `_run`."""
+    (V_a_tilde, C_conc_e, temperature, reaction_time,
+     _, _, _, _,
+     reactor_volume, A_density, B_density, C_density) = values
+
+    grad = np.zeros(np.shape(V_a_tilde) + (7, 12))
+    a_fraction = 1 - C_conc_e / C_density
+    # dA0/dvalues
+    grad[..., 0, 0] = A_density * a_fraction / reactor_volume
+    grad[..., 0, 1] = - A_density / C_density * V_a_tilde / reactor_volume
+    grad[..., 0, 8] = - (A_density * a_fraction * V_a_tilde
+                         / reactor_volume**2)
+    grad[..., 0, 9] = a_fraction * V_a_tilde / reactor_volume
+    grad[..., 0, 11] = (A_density * C_conc_e / C_density**2
+                        * V_a_tilde / reactor_volume)
+    # dB0/dvalues
+    grad[..., 1, 0] = - B_density / reactor_volume
+    grad[..., 1, 8] = B_density * V_a_tilde / reactor_volume**2
+    grad[..., 1, 10] = (reactor_volume - V_a_tilde) / reactor_volume
+    # dC0/dvalues
+    grad[..., 4, 0] = C_conc_e / reactor_volume
+    grad[..., 4, 1] = V_a_tilde / reactor_volume
+    grad[..., 4, 8] = - C_conc_e * V_a_tilde / reactor_volume**2
+    # dT/dvalues and dt/dvalues
+    grad[..., 5, 2] = 1
+    grad[..., 6, 3] = 1
+    return grad
+
+
+def _input_gradient(values, grad_x_I, grad_M_I):
+    """ Chains the impurity concentration gradients with respect to the
+    initial state and to the Arrhenius parameters into the gradient with
+    respect to the 12 input slots."""
+    grad = np.einsum(
+        "...i,...ij->...j", grad_x_I, _kinetics_inputs_gradient(values))
+    grad[..., 4:8] += grad_M_I
+    return grad
+
+
+def _impurity_concentration(X_mat):
+    """ Impurity concentration from the final concentrations: all species
+    other than the product P."""
+    return (X_mat[..., 3] + X_mat[..., 4]
+            + X_mat[..., 0] + X_mat[..., 1])
+
+
+def _impurity_concentration_gradient(grad_x_X_mat):
+    """ Gradient of the impurity concentration from the gradient of the
+    final concentrations, with respect to the same variables."""
+    return (grad_x_X_mat[..., 0:2, :].sum(axis=-2)
+            + grad_x_X_mat[..., 3:5, :].sum(axis=-2))
+
+
+def _analytical_solution(A0, B0, P0, S0, C0, k_ps, alpha):
+    kp, ks = k_ps.T
+    k = kp + ks
+    X_mat = np.empty(np.shape(alpha) + (5,))
+    X_mat[..., 0] = A0 - alpha
+    X_mat[..., 1] = B0 - alpha
+    X_mat[..., 2] = P0 + kp / k * alpha
+    X_mat[..., 3] = S0 + ks / k * alpha
+    X_mat[..., 4] = C0
+    return X_mat
+
+
+def _grad_x(k_ps, al, da, db, dt):
+    """ Gradient of the final concentrations with respect to the initial
+    state at fixed rate constants. The temperature column is left at zero
+    and is filled in by `_run` through the rate constants."""
+    kp, ks = k_ps.T
+    k = kp + ks
     kpk = kp / k
     ksk = ks / k
-    da = _dalda(A0, B0, k, t)
-    db = _daldb(A0, B0, k, t)
-    dk = _daldk(A0, B0, k, t)
-    dt = _daldt(A0, B0, k, t)
-    al = _alpha(A0, B0, k, t)
-    dada = 1 - da
-    dadb = - db
-    dadk = - dk
-    dadt = - dt
-    grad_x_X_mat[0, :] = np.array([dada, dadb, 0, 0, 0, dadk, dadt])
-    dbda = - da
-    dbdb = 1 - db
-    dbdk = - dk
-    dbdt = - dt
-    grad_x_X_mat[1, :] = np.array([dbda, dbdb, 0, 0, 0, dbdk, dbdt])
-    dpda = kpk * da
-    dpdb = kpk * db
-    dpdp = 1
-    dpdk = ksk / k * al + kpk * dk
-    dpdt = kpk * dt
-    grad_x_X_mat[2, :] = np.array([dpda, dpdb, dpdp, 0, 0, dpdk, dpdt])
-    dsda = ksk * da
-    dsdb = ksk * db
-    dsds = 1
-    dsdk = kpk / k * al + ksk * dk
-    dsdt = ksk * dt
-    grad_x_X_mat[3, :] = np.array([dsda, dsdb, 0, dsds, 0, dsdk, dsdt])
-    grad_x_X_mat[4, :] = np.array([0, 0, 0, 0, 1, 0, 0])
+    grad_x_X_mat = np.zeros(np.shape(al) + (5, 7))
+    # dA/dX
+    grad_x_X_mat[..., 0, 0] = 1 - da
+    grad_x_X_mat[..., 0, 1] = - db
+    grad_x_X_mat[..., 0, 6] = - dt
+    # dB/dX
+    grad_x_X_mat[..., 1, 0] = - da
+    grad_x_X_mat[..., 1, 1] = 1 - db
+    grad_x_X_mat[..., 1, 6] = - dt
+    # dP/dX
+    grad_x_X_mat[..., 2, 0] = kpk * da
+    grad_x_X_mat[..., 2, 1] = kpk * db
+    grad_x_X_mat[..., 2, 2] = 1
+    grad_x_X_mat[..., 2, 6] = kpk * dt
+    # dS/dX
+    grad_x_X_mat[..., 3, 0] = ksk * da
+    grad_x_X_mat[..., 3, 1] = ksk * db
+    grad_x_X_mat[..., 3, 3] = 1
+    grad_x_X_mat[..., 3, 6] = ksk * dt
+    # dC/dX
+    grad_x_X_mat[..., 4, 4] = 1
     return grad_x_X_mat
 
 
-def _calc_k(T, M):
-    M_v, M_delta_H = M
-    R = 8.3144598e-3
-    k_ps = M_v * np.exp(-M_delta_H / (R * T))
-    return k_ps
+def _grad_k(k_ps, al, dk):
+    """ Gradient of the final concentrations with respect to the main and
+    secondary rate constants."""
+    kp, ks = k_ps.T
+    k = kp + ks
+    kpk = kp / k
+    ksk = ks / k
+    grad_k_X_mat = np.zeros(np.shape(al) + (5, 2))
+    # dA/dk and dB/dk
+    grad_k_X_mat[..., 0:2, :] = - np.asarray(dk)[..., np.newaxis, np.newaxis]
+    # dP/dk
+    grad_k_X_mat[..., 2, 0] = ksk / k * al + kpk * dk
+    grad_k_X_mat[..., 2, 1] = - kpk / k * al + kpk * dk
+    # dS/dk
+    grad_k_X_mat[..., 3, 0] = - ksk / k * al + ksk * dk
+    grad_k_X_mat[..., 3, 1] = kpk / k * al + ksk * dk
+    return grad_k_X_mat
+
+
+def _kinetics_kernel(X0, k_ps):
+    """ Evaluates the reaction kinetics at given rate constants, for a (7,)
+    initial state and (2,) rate constants, or for each row of (N, 7) and
+    (N, 2) arrays of them.
 
+    Returns the (..., 5) final concentrations, their (..., 5, 7) gradient
+    with respect to the initial state, without the temperature column,
+    and their (..., 5, 2) gradient with respect to the rate constants.
+    """
+    A0, B0, P0, S0, C0, T, t = X0.T
+    kp, ks = k_ps.T
+    al, da, db, dk, dt = alpha_and_derivatives(A0, B0, kp + ks, t)
+    X_mat = _analytical_solution(A0, B0, P0, S0, C0, k_ps, al)
+    return X_mat, _grad_x(k_ps, al, da, db, dt), _grad_k(k_ps, al, dk)
 
-def _run(X0, M):
+
+def _run(X0, M, kernel=_kinetics_kernel):
+    """ Evaluates the reaction kinetics for a (7,) initial state, or for
+    each row of an (N, 7) array of initial states.
+
+    Returns the (..., 5) final concentrations, their (..., 5, 7) gradient
+    with respect to the initial state and their (..., 5, 4) gradient with
+    respect to the Arrhenius parameters, ordered as (nu, delta_H) of the
+    main reaction followed by (nu, delta_H) of the secondary reaction.
+    """
     R = 8.3144598e-3
-    k_ps = _calc_k(X0[5], M)
-    X_mat = _analytical_solution(X0[0],
-                                 X0[1],
-                                 X0[2],
-                                 X0[3],
-                                 X0[4],
-                                 k_ps,
-                                 X0[6])
-    grad_x_X_mat = _grad_x(X0[0],
-                           X0[1],
-                           X0[2],
-                           X0[3],
-                           X0[4],
-                           k_ps,
-                           X0[6])
-    dkdT = 1 / (R * X0[5])**2 * np.sum(k_ps * M[0])
-    grad_x_X_mat[:, 5] = dkdT * grad_x_X_mat[:, 5]
-    return X_mat, grad_x_X_mat
+    M_v, M_delta_H = M
+    T = np.asarray(X0[..., 5])[..., np.newaxis]
+    arrhenius = np.exp(-M_delta_H / (R * T))
+    k_ps = M_v * arrhenius
+    X_mat, grad_x_X_mat, grad_k_X_mat = kernel(X0, k_ps)
+
+    # Arrhenius law: dk/dT = k delta_H / (R T^2), dk/dnu = k / nu and
+    # dk/d(delta_H) = - k / (R T)
+    dk_dT = k_ps * M_delta_H / (R * T * T)
+    grad_x_X_mat[..., 5] = (
+        grad_k_X_mat * dk_dT[..., np.newaxis, :]).sum(axis=-1)
+    grad_M_X_mat = np.empty(np.shape(X_mat) + (4,))
+    grad_M_X_mat[..., 0::2] = grad_k_X_mat * arrhenius[..., np.newaxis, :]
+    grad_M_X_mat[..., 1::2] = (
+        grad_k_X_mat * (- k_ps / (R * T))[..., np.newaxis, :])
+    return X_mat, grad_x_X_mat, grad_M_X_mat
+
+
+def _run_batch(X0, M, kernel=_kinetics_kernel):
+    """Evaluates the reaction kinetics for many initial states in a
+    single vectorised pass.
+
+    Parameters
+    ----------
+    X0: array_like
+        (N, 7) array of initial states, one row per evaluation point
+    M: tuple of array_like
+        Arrhenius (nu, delta_H) parameters of the main and secondary
+        reactions, either as two (2,) arrays shared by every row or as
+        two (N, 2) arrays with per-row values
+    kernel: callable
+        Kinetics kernel evaluating the broadcast arrays at given rate
+        constants, `_kinetics_kernel` by default
+
+    Returns
+    -------
+    X_mat: np.ndarray
+        (N, 5) array of final concentrations
+    grad_x_X_mat: np.ndarray
+        (N, 5, 7) array of concentration gradients with respect to
+        the initial state
+    grad_M_X_mat: np.ndarray
+        (N, 5, 4) array of concentration gradients with respect to
+        the Arrhenius parameters
+    """
+    X0 = np.atleast_2d(np.asarray(X0, dtype=float))
+    M = tuple(
+        np.broadcast_to(np.asarray(values, dtype=float), (X0.shape[0], 2))
+        for values in M
+    )
+    return _run(X0, M, kernel=kernel)
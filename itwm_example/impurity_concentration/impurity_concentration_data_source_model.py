@@ -1,8 +1,59 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+from traits.api import Enum, Instance, Int, Property, on_trait_change
+from traitsui.api import View, Item
+
 from force_bdss.data_sources.base_data_source_model import BaseDataSourceModel
 
+from .compiled_kinetics import KINETICS_BACKENDS, default_kinetics_backend
+from .evaluation_cache import EvaluationCache
+
 
 class ImpurityConcentrationDataSourceModel(BaseDataSourceModel):
-    pass
+
+    #: Implementation of the reaction kinetics. "Numba" evaluates them in
+    #: compiled code and falls back to "NumPy" if Numba is not installed.
+    #: The default is read from the ITWM_EXAMPLE_KINETICS_BACKEND
+    #: environment variable.
+    kinetics_backend = Enum(*KINETICS_BACKENDS)
+
+    #: Maximum number of evaluations kept in the evaluation cache. The
+    #: cache is disabled when 0.
+    cache_size = Int(0)
+
+    #: Number of decimals the input values are rounded to before looking
+    #: them up in the evaluation cache
+    cache_decimals = Int(10)
+
+    #: Least recently used cache of the data source evaluations
+    evaluation_cache = Instance(EvaluationCache, transient=True)
+
+    #: Number of evaluations served from the cache
+    cache_hits = Property(Int)
+
+    #: Number of evaluations not found in the cache
+    cache_misses = Property(Int)
+
+    traits_view = View(
+        Item("kinetics_backend"),
+        Item("cache_size"),
+        Item("cache_decimals"),
+    )
+
+    def _kinetics_backend_default(self):
+        return default_kinetics_backend()
+
+    def _evaluation_cache_default(self):
+        return EvaluationCache(
+            maxsize=self.cache_size, decimals=self.cache_decimals)
+
+    def _get_cache_hits(self):
+        return self.evaluation_cache.hits
+
+    def _get_cache_misses(self):
+        return self.evaluation_cache.misses
+
+    @on_trait_change("cache_size,cache_decimals")
+    def _reset_evaluation_cache(self):
+        self.evaluation_cache = self._evaluation_cache_default()
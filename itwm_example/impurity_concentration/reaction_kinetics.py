@@ -0,0 +1,176 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+""" Numerical kernels of the analytical reaction kinetics model, shared by
+the impurity concentration data source and the prototype reaction
+kinetics module. They depend on NumPy only."""
+
+from functools import lru_cache
+from math import factorial
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def series_coefficients(n):
+    """ Coefficient tables of the truncated Taylor series used to evaluate
+    alpha near the equimolar limit, A0 = B0.
+
+    With z = (B0 - A0) * k * t, the three series of order `n` are
+    polynomials in z:
+
+    .. math::
+        sum_1 = k t \\sum_{j=0}^{n-1} z^j / (j + 1)!
+
+        sum_2 = (k t)^2 \\sum_{j=0}^{n-2} (j + 1) z^j / (j + 2)!
+
+        sum_3 = \\sum_{j=0}^{n-1} z^j / j!
+
+    The tables are computed once per series order and cached.
+
+    Parameters
+    ----------
+    n: int
+        Order of the series
+
+    Returns
+    -------
+    coefficients: tuple of tuple(float)
+        The (sum_1, sum_2, sum_3) polynomial coefficients, ordered by
+        increasing power of z
+    """
+    sum1 = tuple(1. / factorial(j + 1) for j in range(n))
+    sum2 = tuple((j + 1.) / factorial(j + 2) for j in range(n - 1))
+    sum3 = tuple(1. / factorial(j) for j in range(n))
+    return sum1, sum2, sum3
+
+
+def taylor_sums(A0, B0, k, t, n=5):
+    """ Evaluates the three Taylor series of order `n` together, with a
+    single Horner scheme in z = (B0 - A0) * k * t that shares the powers
+    of z between them.
+
+    Arguments may be scalars or broadcastable arrays.
+
+    Returns
+    -------
+    sums: tuple
+        The (sum_1, sum_2, sum_3) values, see `series_coefficients`
+    """
+    return _horner_sums(A0, B0, k, t, *series_coefficients(n))
+
+
+def _horner_sums(A0, B0, k, t, sum1_coeffs, sum2_coeffs, sum3_coeffs):
+    n = len(sum1_coeffs)
+    kt = k * t
+    z = (B0 - A0) * kt
+
+    sum1 = sum1_coeffs[n - 1]
+    sum2 = 0.
+    sum3 = sum3_coeffs[n - 1]
+    for j in range(n - 2, -1, -1):
+        sum1 = sum1 * z + sum1_coeffs[j]
+        sum2 = sum2 * z + sum2_coeffs[j]
+        sum3 = sum3 * z + sum3_coeffs[j]
+
+    return kt * sum1, kt * kt * sum2, sum3
+
+
+def alpha_and_derivatives(A0, B0, k, t, tol=8e-2, n=5):
+    """ Computes the reaction extent alpha and its partial derivatives with
+    respect to A0, B0, k and t from a single set of shared intermediates.
+
+    Away from the equimolar limit the closed exponential form is used, and
+    its exponential is evaluated once for all five quantities. When
+    epsilon = |(A0 - B0) * k * t| is not larger than `tol`, the closed form
+    is numerically unstable and the Taylor series of order `n` is used
+    instead, with each direction of the series evaluated once.
+
+    Scalar arguments take a single branch. Array arguments are broadcast
+    together and each element takes its own branch, selected by a mask.
+
+    Parameters
+    ----------
+    A0, B0: float or np.ndarray
+        Initial concentrations of the reactants A and B
+    k: float or np.ndarray
+        Total reaction rate constant
+    t: float or np.ndarray
+        Reaction time
+    tol: float
+        Largest epsilon for which the Taylor series is used
+    n: int
+        Order of the Taylor series
+
+    Returns
+    -------
+    alpha, dalda, daldb, daldk, daldt: float or np.ndarray
+        Reaction extent and its derivatives with respect to A0, B0, k, t
+    """
+    epsilon = np.abs((A0 - B0) * k * t)
+    if np.ndim(epsilon) == 0:
+        if epsilon > tol:
+            return _exponential_kernel(A0, B0, k, t)
+        return _series_kernel(A0, B0, k, t, n)
+
+    A0, B0, k, t = np.broadcast_arrays(A0, B0, k, t)
+    results = np.empty((5,) + epsilon.shape)
+    mask = epsilon > tol
+    results[:, mask] = _exponential_kernel(
+        A0[mask], B0[mask], k[mask], t[mask])
+    mask = ~mask
+    results[:, mask] = _series_kernel(
+        A0[mask], B0[mask], k[mask], t[mask], n)
+    return tuple(results)
+
+
+def _exponential_kernel(A0, B0, k, t):
+    kt = k * t
+    difference = B0 - A0
+    expo = np.exp(difference * kt)
+    B0expo = B0 * expo
+    denominator = B0expo - A0
+    denominator_sq = denominator * denominator
+
+    alpha = A0 * B0 * (expo - 1) / denominator
+    dalda = B0expo * (B0expo - kt * A0 * difference - B0) / denominator_sq
+    daldb = A0 * ((kt * B0 * difference - A0) * expo + A0) / denominator_sq
+    common = A0 * B0expo * difference * difference / denominator_sq
+    return alpha, dalda, daldb, t * common, k * common
+
+
+def _series_kernel(A0, B0, k, t, n):
+    return _series_terms(A0, B0, k, t,
+                         *taylor_sums(A0, B0, k, t, n),
+                         *taylor_sums(B0, A0, k, t, n))
+
+
+def _series_terms(A0, B0, k, t,
+                  sum1ab, sum2ab, sum3ab, sum1ba, sum2ba, sum3ba):
+    A0B0 = A0 * B0
+    denominator_ab = 1 + B0 * sum1ab
+    denominator_ba = 1 + A0 * sum1ba
+    denominator_ab_sq = denominator_ab * denominator_ab
+    denominator_ba_sq = denominator_ba * denominator_ba
+
+    alpha = 0.5 * (A0B0 * sum1ab / denominator_ab
+                   + A0B0 * sum1ba / denominator_ba)
+
+    p1 = (B0 * sum1ab - A0B0 * sum2ab) * denominator_ab
+    p2 = (-B0 * sum2ab) * (A0B0 * sum1ab)
+    p3 = (B0 * sum1ba + A0B0 * sum2ba) * denominator_ba
+    p4 = (sum1ba + A0 * sum2ba) * (A0B0 * sum1ba)
+    dalda = 0.5 * ((p1 - p2) / denominator_ab_sq
+                   + (p3 - p4) / denominator_ba_sq)
+
+    p1 = (A0 * sum1ab + A0B0 * sum2ab) * denominator_ab
+    p2 = (sum1ab + B0 * sum2ab) * A0B0 * sum1ab
+    p3 = (A0 * sum1ba - A0B0 * sum2ba) * denominator_ba
+    p4 = A0 * (-sum2ba) * A0B0 * sum1ba
+    daldb = 0.5 * ((p1 - p2) / denominator_ab_sq
+                   + (p3 - p4) / denominator_ba_sq)
+
+    # d(alpha)/dk and d(alpha)/dt only differ by a factor t / k
+    common = 0.5 * A0B0 * (sum3ab / denominator_ab_sq
+                           + sum3ba / denominator_ba_sq)
+    return alpha, dalda, daldb, t * common, k * common
@@ -0,0 +1,60 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+
+from itwm_example.impurity_concentration.evaluation_cache import \
+    EvaluationCache
+
+
+class TestEvaluationCache(TestCase):
+
+    def setUp(self):
+        self.cache = EvaluationCache(maxsize=2, decimals=3)
+
+    def test_lookup(self):
+        self.assertIsNone(self.cache.lookup([1.0, 2.0]))
+        self.cache.store([1.0, 2.0], (0.5, np.array([1.0, 2.0])))
+
+        value, gradient = self.cache.lookup([1.0001, 2.0])
+        self.assertEqual(0.5, value)
+        np.testing.assert_array_equal([1.0, 2.0], gradient)
+        self.assertIsNone(self.cache.lookup([1.01, 2.0]))
+
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+
+    def test_least_recently_used(self):
+        self.cache.store([1.0], (1.0,))
+        self.cache.store([2.0], (2.0,))
+        self.cache.lookup([1.0])
+        self.cache.store([3.0], (3.0,))
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.lookup([2.0]))
+        self.assertEqual((1.0,), self.cache.lookup([1.0]))
+        self.assertEqual((3.0,), self.cache.lookup([3.0]))
+
+    def test_copies(self):
+        gradient = np.array([1.0, 2.0])
+        self.cache.store([1.0], (0.5, gradient))
+        gradient[0] = 0.0
+        self.cache.lookup([1.0])[1][1] = 0.0
+        np.testing.assert_array_equal(
+            [1.0, 2.0], self.cache.lookup([1.0])[1])
+
+    def test_disabled(self):
+        cache = EvaluationCache(maxsize=0)
+        cache.store([1.0], (1.0,))
+        self.assertEqual(0, len(cache))
+        self.assertIsNone(cache.lookup([1.0]))
+
+    def test_clear(self):
+        self.cache.store([1.0], (1.0,))
+        self.cache.lookup([1.0])
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(0, self.cache.hits)
+        self.assertEqual(0, self.cache.misses)
@@ -1,8 +1,18 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import unittest
+
+import numpy as np
+
+from itwm_example.impurity_concentration.compiled_kinetics import (
+    compiled_kernel, numba)
+from itwm_example.impurity_concentration.impurity_concentration_data_source \
+    import _kinetics_kernel, _run, _run_batch
 from itwm_example.tests.template_test_classes.template_test_data_source \
     import TemplateTestGradientDataSource
+from itwm_example.unittest_tools.gradient_consistency.taylor_convergence \
+    import TaylorTest
 
 
 class TestImpurityConcentrationDataSource(TemplateTestGradientDataSource):
@@ -18,10 +28,165 @@ class TestImpurityConcentrationDataSource(TemplateTestGradientDataSource):
 
         self.assertEqual("CONCENTRATION", self.output_slots[0].type)
 
-    def test_param_to_gradient(self):
-        """ This test requires refactoring this DataSource"""
-        pass
-
     def test_gradient_convergence(self):
-        """ This test requires refactoring this DataSource"""
-        pass
+        """ The input slots range over four orders of magnitude, so the
+        Taylor test is run on relative perturbations of each input."""
+        for input in self.test_inputs:
+            input = np.asarray(input)
+            taylor_test = TaylorTest(
+                lambda scale: self._evaluate_function(input * (1 + scale)),
+                lambda scale: (
+                    self._evaluate_gradient(input * (1 + scale)) * input),
+                len(self.input_slots),
+                step_size=1.e-4
+            )
+            self.assertTrue(
+                taylor_test.is_correct_gradient(np.zeros(len(input))))
+
+    def test_temperature_gradient(self):
+        X0 = np.array([0.5, 0.5, 0.0, 0.0, 0.1, 335.0, 360.0])
+        M = (np.array([0.02, 0.03]), np.array([1.5, 12.0]))
+        step = 1e-4
+        X_mat, grad_x_X_mat, _ = _run(X0, M)
+
+        X_up, X_down = X0.copy(), X0.copy()
+        X_up[5] += step
+        X_down[5] -= step
+        expected = (_run(X_up, M)[0] - _run(X_down, M)[0]) / (2 * step)
+        np.testing.assert_allclose(
+            expected, grad_x_X_mat[:, 5], rtol=1e-6, atol=1e-12)
+
+    def test_arrhenius_gradient(self):
+        X0 = np.array([0.9, 0.1, 0.0, 0.0, 0.1, 335.0, 360.0])
+        M = np.array([[0.02, 0.03], [1.5, 12.0]])
+        step = 1e-6
+        _, _, grad_M_X_mat = _run(X0, M)
+
+        # Columns are ordered as nu, delta_H of each reaction in turn
+        for column, (row, reaction) in enumerate(
+                [(0, 0), (1, 0), (0, 1), (1, 1)]):
+            M_up, M_down = M.copy(), M.copy()
+            M_up[row, reaction] += step
+            M_down[row, reaction] -= step
+            expected = (_run(X0, M_up)[0]
+                        - _run(X0, M_down)[0]) / (2 * step)
+            np.testing.assert_allclose(
+                expected, grad_M_X_mat[:, column], rtol=1e-5, atol=1e-12)
+
+    def test_run_batch(self):
+        # Rows cover both the exponential and the Taylor series branches
+        X0 = np.array([
+            [0.5, 0.5, 0.0, 0.0, 0.1, 335.0, 360.0],
+            [0.5, 0.5001, 0.0, 0.0, 0.1, 300.0, 3600.0],
+            [0.9, 0.1, 0.0, 0.0, 0.1, 335.0, 360.0],
+            [0.2, 0.6, 0.0, 0.0, 0.05, 380.0, 2670.0],
+        ])
+        M_v = np.array([[0.02, 0.02], [0.02, 0.03],
+                        [0.01, 0.02], [0.02, 0.02]])
+        M_delta_H = np.array([[1.5, 12.0], [1.5, 12.0],
+                              [2.0, 10.0], [1.5, 12.0]])
+
+        X_mat, grad_x_X_mat, grad_M_X_mat = _run_batch(X0, (M_v, M_delta_H))
+        self.assertEqual((4, 5), X_mat.shape)
+        self.assertEqual((4, 5, 7), grad_x_X_mat.shape)
+        self.assertEqual((4, 5, 4), grad_M_X_mat.shape)
+
+        for index, row in enumerate(X0):
+            X_row, grad_row, grad_M_row = _run(
+                row, (M_v[index], M_delta_H[index]))
+            np.testing.assert_allclose(X_row, X_mat[index])
+            np.testing.assert_allclose(grad_row, grad_x_X_mat[index])
+            np.testing.assert_allclose(grad_M_row, grad_M_X_mat[index])
+
+    def test_run_batch_shared_parameters(self):
+        X0 = np.array([
+            [0.5, 0.5, 0.0, 0.0, 0.1, 335.0, 360.0],
+            [0.9, 0.1, 0.0, 0.0, 0.1, 335.0, 360.0],
+        ])
+        M = (np.array([0.02, 0.02]), np.array([1.5, 12.0]))
+
+        X_mat, grad_x_X_mat, grad_M_X_mat = _run_batch(X0, M)
+        for index, row in enumerate(X0):
+            X_row, grad_row, grad_M_row = _run(row, M)
+            np.testing.assert_allclose(X_row, X_mat[index])
+            np.testing.assert_allclose(grad_row, grad_x_X_mat[index])
+            np.testing.assert_allclose(grad_M_row, grad_M_X_mat[index])
+
+    def test_data_source_run_batch(self):
+        inputs = self.test_inputs + [
+            [0.3, 0.05, 300.0, 3600.0, 0.02, 1.5, 0.03, 12.0,
+             1.0, 1.2, 0.9, 1.0],
+            [0.55, 0.05, 380.0, 100.0, 0.02, 1.5, 0.03, 12.0,
+             1.0, 1.0, 1.0, 1.0],
+        ]
+        impurity_conc, grad_I = self.data_source.run_batch(
+            self.model, np.array(inputs))
+        self.assertEqual((3,), impurity_conc.shape)
+        self.assertEqual((3, 12), grad_I.shape)
+
+        for index, values in enumerate(inputs):
+            concentration, gradient = self.basic_evaluation(values)
+            self.assertAlmostEqual(
+                concentration.value, impurity_conc[index])
+            np.testing.assert_allclose(gradient.value, grad_I[index])
+
+    def test_evaluation_cache_disabled(self):
+        self.basic_evaluation(self.test_inputs[0])
+        self.basic_evaluation(self.test_inputs[0])
+        self.assertEqual(0, self.model.cache_hits)
+        self.assertEqual(0, self.model.cache_misses)
+        self.assertEqual(0, len(self.model.evaluation_cache))
+
+    def test_evaluation_cache(self):
+        self.model.cache_size = 2
+        concentration, gradient = self.basic_evaluation(self.test_inputs[0])
+        self.assertEqual(0, self.model.cache_hits)
+        self.assertEqual(1, self.model.cache_misses)
+
+        gradient.value[0] = 0.0
+        cached_concentration, cached_gradient = self.basic_evaluation(
+            self.test_inputs[0])
+        self.assertEqual(1, self.model.cache_hits)
+        self.assertEqual(1, self.model.cache_misses)
+        self.assertEqual(concentration.value, cached_concentration.value)
+        self.assertNotEqual(0.0, cached_gradient.value[0])
+
+        # Inputs equal after rounding share their cache entry
+        values = list(self.test_inputs[0])
+        values[2] += 1e-12
+        self.basic_evaluation(values)
+        self.assertEqual(2, self.model.cache_hits)
+
+        values[2] += 1.0
+        self.basic_evaluation(values)
+        self.assertEqual(2, self.model.cache_misses)
+
+        self.model.cache_decimals = 6
+        self.assertEqual(0, self.model.cache_hits)
+        self.assertEqual(0, len(self.model.evaluation_cache))
+
+
+@unittest.skipIf(numba is None, "Numba is not installed")
+class TestCompiledImpurityConcentrationDataSource(
+        TestImpurityConcentrationDataSource):
+
+    def setUp(self):
+        super(TestCompiledImpurityConcentrationDataSource, self).setUp()
+        self.model.kinetics_backend = "Numba"
+
+    def test_compiled_kernel(self):
+        X0 = np.array([
+            [0.5, 0.5, 0.0, 0.0, 0.1, 335.0, 360.0],
+            [0.5, 0.5001, 0.0, 0.0, 0.1, 300.0, 3600.0],
+            [0.9, 0.1, 0.0, 0.0, 0.1, 335.0, 360.0],
+        ])
+        k_ps = np.array([[0.02, 0.01], [0.03, 0.01], [0.02, 0.002]])
+
+        results = compiled_kernel()(X0, k_ps)
+        expected = _kinetics_kernel(X0, k_ps)
+        for value, expected_value in zip(results, expected):
+            np.testing.assert_allclose(expected_value, value)
+
+        results = compiled_kernel()(X0[0], k_ps[0])
+        for value, expected_value in zip(results, expected):
+            np.testing.assert_allclose(expected_value[0], value)
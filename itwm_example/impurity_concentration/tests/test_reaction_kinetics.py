@@ -0,0 +1,106 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from math import factorial
+from unittest import TestCase
+
+import numpy as np
+
+from itwm_example.impurity_concentration.reaction_kinetics import (
+    alpha_and_derivatives,
+    series_coefficients,
+    taylor_sums,
+)
+
+
+def direct_sums(A0, B0, k, t, n):
+    sum1 = sum(
+        (B0 - A0) ** (e - 1) * (k * t) ** e / factorial(e)
+        for e in range(1, n + 1)
+    )
+    sum2 = sum(
+        (B0 - A0) ** (e - 2) * (k * t) ** e * (e - 1) / factorial(e)
+        for e in range(2, n + 1)
+    )
+    sum3 = sum(
+        (B0 - A0) ** (e - 1) * (k * t) ** (e - 1) * e / factorial(e)
+        for e in range(1, n + 1)
+    )
+    return sum1, sum2, sum3
+
+
+class TestReactionKinetics(TestCase):
+    def test_series_coefficients(self):
+        sum1, sum2, sum3 = series_coefficients(4)
+        self.assertEqual(4, len(sum1))
+        self.assertEqual(3, len(sum2))
+        self.assertEqual(4, len(sum3))
+        self.assertEqual((1., 1. / 2, 1. / 6, 1. / 24), sum1)
+        self.assertIs(series_coefficients(4), series_coefficients(4))
+
+    def test_taylor_sums(self):
+        for n in (4, 5):
+            for A0, B0, k, t in [(0.5, 0.5, 1e-3, 360.0),
+                                 (0.5, 0.51, 2e-3, 100.0),
+                                 (0.4, 0.3, 1e-4, 3600.0)]:
+                np.testing.assert_allclose(
+                    direct_sums(A0, B0, k, t, n),
+                    taylor_sums(A0, B0, k, t, n=n),
+                    rtol=1e-14
+                )
+
+    def test_taylor_sums_arrays(self):
+        A0 = np.array([0.5, 0.5, 0.4])
+        B0 = np.array([0.5, 0.51, 0.3])
+        k = np.array([1e-3, 2e-3, 1e-4])
+        t = np.array([360.0, 100.0, 3600.0])
+
+        sums = taylor_sums(A0, B0, k, t)
+        for index in range(3):
+            np.testing.assert_allclose(
+                direct_sums(A0[index], B0[index], k[index], t[index], 5),
+                [values[index] for values in sums],
+                rtol=1e-14
+            )
+
+    def test_alpha_and_derivatives(self):
+        # Exponential and Taylor series branches respectively
+        for A0, B0, k, t in [(0.9, 0.1, 1e-3, 360.0),
+                             (0.5, 0.5001, 1e-3, 360.0)]:
+            alpha, *derivatives = alpha_and_derivatives(A0, B0, k, t)
+            point = np.array([A0, B0, k, t])
+            for index, derivative in enumerate(derivatives):
+                step = 1e-7 * point[index]
+                upper, lower = point.copy(), point.copy()
+                upper[index] += step
+                lower[index] -= step
+                finite_difference = (
+                    alpha_and_derivatives(*upper)[0]
+                    - alpha_and_derivatives(*lower)[0]
+                ) / (2 * step)
+                self.assertAlmostEqual(
+                    finite_difference / derivative, 1.0, places=5)
+
+    def test_alpha_and_derivatives_arrays(self):
+        A0 = np.array([0.9, 0.5, 0.5, 0.2])
+        B0 = np.array([0.1, 0.5001, 0.5, 0.6])
+        k = np.array([1e-3, 1e-3, 2e-3, 1e-4])
+        t = np.array([360.0, 360.0, 100.0, 3600.0])
+
+        results = alpha_and_derivatives(A0, B0, k, t)
+        self.assertEqual(5, len(results))
+        for index in range(4):
+            np.testing.assert_allclose(
+                alpha_and_derivatives(A0[index], B0[index],
+                                      k[index], t[index]),
+                [values[index] for values in results]
+            )
+
+    def test_alpha_and_derivatives_tolerance(self):
+        # With a large tolerance the series is used instead of the closed
+        # form, both of which must agree for small epsilon
+        np.testing.assert_allclose(
+            alpha_and_derivatives(0.5, 0.45, 1e-3, 360.0, tol=8e-2),
+            alpha_and_derivatives(0.5, 0.45, 1e-3, 360.0, tol=1e-2),
+            rtol=1e-5
+        )
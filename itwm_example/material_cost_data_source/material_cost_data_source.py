@@ -1,6 +1,8 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import numpy as np
+
 from force_bdss.api import BaseDataSource, DataValue, Slot
 
 
@@ -10,33 +12,55 @@ class MaterialCostDataSource(BaseDataSource):
     """
 
     def run(self, model, parameters):
-        V_a = parameters[0].value
-        C_e = parameters[1].value
-        V_r = parameters[2].value
-        rho_C = parameters[3].value
+        cost, grad_cost = self.run_batch(
+            model, [[parameter.value for parameter in parameters]])
+        return [
+            DataValue(
+                type="COST",
+                value=float(cost[0])
+            ),
+            DataValue(
+                type="COST_GRADIENT",
+                value=grad_cost[0].tolist()
+            ),
+        ]
+
+    def run_batch(self, model, parameter_matrix):
+        """ Evaluates the data source for many sets of input slot values
+        at once.
+
+        Parameters
+        ----------
+        model: MaterialCostDataSourceModel
+            Model of the data source
+        parameter_matrix: array_like
+            (N, 4) array of input slot values, one row per evaluation
+            point and one column per input slot, in `slots` order
+
+        Returns
+        -------
+        cost: np.ndarray
+            (N,) array of material costs
+        grad_cost: np.ndarray
+            (N, 4) array of material cost gradients
+        """
+        parameter_matrix = np.atleast_2d(
+            np.asarray(parameter_matrix, dtype=float))
+        V_a, C_e, V_r, rho_C = parameter_matrix.T
 
         tot_cost_A = V_a * ((1 - C_e / rho_C) * model.const_A +
                             model.const_C * rho_C / C_e)
         tot_cost_B = (V_r - V_a) * model.cost_B
         cost = tot_cost_A + tot_cost_B
 
-        grad_cost = [
+        grad_cost = np.column_stack([
             ((1 - C_e / rho_C) * model.const_A
              + model.const_C * rho_C / C_e) - model.cost_B,
-            - V_a * model.const_A / rho_C - model.const_C * rho_C / C_e**2,
-            model.cost_B,
+            - V_a * (model.const_A / rho_C + model.const_C * rho_C / C_e**2),
+            np.full_like(V_a, model.cost_B),
             V_a * (model.const_A * C_e / rho_C ** 2.0 + model.const_C / C_e),
-        ]
-        return [
-            DataValue(
-                type="COST",
-                value=cost
-            ),
-            DataValue(
-                type="COST_GRADIENT",
-                value=grad_cost
-            ),
-        ]
+        ])
+        return cost, grad_cost
 
     def slots(self, model):
         return (
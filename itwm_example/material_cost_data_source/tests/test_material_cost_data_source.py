@@ -1,11 +1,25 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import numpy as np
+
 from itwm_example.tests.template_test_classes.template_test_data_source \
     import TemplateTestGradientDataSource
 
 
 class TestMaterialCostDataSource(TemplateTestGradientDataSource):
     _data_source_index = 3
-    test_inputs = [[1.0, 1.0, 1.0, 1.0]]
-    test_outputs = [1.0]
+    test_inputs = [[1.0, 1.0, 1.0, 1.0], [0.5, 0.05, 1.0, 1.2]]
+    test_outputs = [1.0, 12.979166666666664]
+
+    def test_run_batch(self):
+        inputs = [[1.0, 1.0, 1.0, 1.0], [0.5, 0.05, 1.0, 1.2]]
+        cost, grad_cost = self.data_source.run_batch(
+            self.model, np.array(inputs))
+        self.assertEqual((2,), cost.shape)
+        self.assertEqual((2, 4), grad_cost.shape)
+
+        for index, values in enumerate(inputs):
+            value, gradient = self.basic_evaluation(values)
+            self.assertAlmostEqual(value.value, cost[index])
+            np.testing.assert_allclose(gradient.value, grad_cost[index])
@@ -0,0 +1,65 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+
+def refinement_candidates(weights, kpis, threshold, decimals=10):
+    """ Pairs of neighbouring weight vectors whose scaled KPI distance
+    exceeds `threshold`, by decreasing distance. Pairs whose midpoint
+    has already been optimized are left out.
+
+    Distances between KPIs are measured after scaling each KPI by its
+    range over the given points, so `threshold` is a fraction of the
+    extent of the front. Two weight vectors are neighbours if either is
+    among the 2 * (number of KPIs - 1) nearest weight vectors of the
+    other. With two KPIs these are the weight vectors to each side.
+
+    Parameters
+    ----------
+    weights: np.ndarray
+        (N, M) array of the optimized weight vectors
+    kpis: np.ndarray
+        (N, M) array of their optimal KPIs
+    threshold: float
+        Largest scaled KPI distance left between neighbouring points
+    decimals: int
+        Number of decimals of the midpoints that are compared
+
+    Returns
+    -------
+    candidates: list of tuple
+        (first, second) indices of the weight vectors of each pair
+    """
+    n_points, n_kpis = weights.shape
+    if n_points < 2:
+        return []
+
+    kpi_range = np.ptp(kpis, axis=0)
+    kpi_range[kpi_range == 0] = 1.0
+    scaled_kpis = kpis / kpi_range
+
+    weight_distances = np.linalg.norm(
+        weights[:, np.newaxis, :] - weights[np.newaxis, :, :], axis=-1)
+    np.fill_diagonal(weight_distances, np.inf)
+    n_neighbours = min(2 * (n_kpis - 1), n_points - 1)
+    nearest = np.argsort(weight_distances, axis=1)[:, :n_neighbours]
+
+    pairs = {
+        (min(first, second), max(first, second))
+        for first in range(n_points)
+        for second in nearest[first]
+    }
+    known = {tuple(np.round(vector, decimals)) for vector in weights}
+
+    candidates = []
+    for first, second in sorted(pairs):
+        distance = np.linalg.norm(scaled_kpis[first] - scaled_kpis[second])
+        midpoint = tuple(
+            np.round(0.5 * (weights[first] + weights[second]), decimals))
+        if distance > threshold and midpoint not in known:
+            known.add(midpoint)
+            candidates.append((distance, first, second))
+
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1:]))
+    return [(first, second) for _, first, second in candidates]
@@ -0,0 +1,188 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+from force_bdss.api import DataValue
+
+from itwm_example.core.constant_data_source_factory import (
+    is_constant_data_source
+)
+
+
+class BatchEvaluator:
+    """ Evaluates the states of a workflow for a whole population of
+    MCO parameter vectors at once.
+
+    The execution layers are walked once per population, rather than
+    once per point. Each data source is run on all points together with
+    its `run_batch` method where it has one. Otherwise it is run point
+    by point. Constant data sources are run only once per evaluator, and
+    their outputs are reused for every following population. Values are
+    passed between the data sources by name, as in the workflow.
+
+    Parameters
+    ----------
+    workflow: Workflow
+        Workflow to evaluate. Its MCO model provides the names of the
+        parameters and KPIs.
+    """
+
+    def __init__(self, workflow):
+        self.workflow = workflow
+        self._gradient_names = self._find_gradient_names()
+        #: Single point outputs of the constant data sources, by model
+        self._constant_outputs = {}
+
+    @property
+    def parameter_names(self):
+        return [
+            parameter.name for parameter in self.workflow.mco_model.parameters
+        ]
+
+    @property
+    def kpi_names(self):
+        return [kpi.name for kpi in self.workflow.mco_model.kpis]
+
+    def execute_batch(self, parameter_matrix):
+        """ Executes the workflow for each row of `parameter_matrix`.
+
+        Parameters
+        ----------
+        parameter_matrix: array_like
+            (N, P) array of MCO parameter values, one row per point and
+            one column per MCO parameter
+
+        Returns
+        -------
+        values: dict
+            Arrays of the MCO parameters and of all named data source
+            outputs, by name. The first dimension of each array is the
+            number of points N.
+        """
+        parameter_matrix = np.atleast_2d(
+            np.asarray(parameter_matrix, dtype=float))
+        n_points = parameter_matrix.shape[0]
+
+        values = dict(zip(self.parameter_names, parameter_matrix.T))
+        for layer in self.workflow.execution_layers:
+            layer_values = {}
+            for model in layer.data_sources:
+                if is_constant_data_source(model):
+                    outputs = self._run_constant_data_source(
+                        model, values, n_points)
+                else:
+                    outputs = _run_data_source_batch(
+                        model, values, n_points)
+                for info, output in zip(model.output_slot_info, outputs):
+                    if info.name:
+                        layer_values[info.name] = output
+            values.update(layer_values)
+        return values
+
+    def evaluate_batch(self, parameter_matrix):
+        """ Evaluates the KPIs, and their gradients where the data
+        sources provide them, for each row of `parameter_matrix`.
+
+        The gradient of a KPI is the output that follows the KPI among
+        the outputs of its data source, if its slot type is a gradient
+        type (for instance "COST_GRADIENT"). It is taken with respect to
+        the inputs of that data source.
+
+        Parameters
+        ----------
+        parameter_matrix: array_like
+            (N, P) array of MCO parameter values, one row per point and
+            one column per MCO parameter
+
+        Returns
+        -------
+        kpis: np.ndarray
+            (N, K) array of KPI values, one column per KPI
+        gradients: list
+            For each KPI, an (N, ...) array of the gradients reported by
+            its data source, or None
+        """
+        values = self.execute_batch(parameter_matrix)
+        kpis = np.column_stack([values[name] for name in self.kpi_names])
+        gradients = [
+            values.get(self._gradient_names.get(name))
+            for name in self.kpi_names
+        ]
+        return kpis, gradients
+
+    def kpi_gradient_names(self):
+        """ Names of the gradient outputs of the KPIs, by KPI name."""
+        return dict(self._gradient_names)
+
+    def _find_gradient_names(self):
+        gradient_names = {}
+        for layer in self.workflow.execution_layers:
+            for model in layer.data_sources:
+                data_source = model.factory.create_data_source()
+                _, output_slots = data_source.slots(model)
+                infos = model.output_slot_info
+                for index in range(len(infos) - 1):
+                    if output_slots[index + 1].type.endswith("_GRADIENT"):
+                        gradient_names[infos[index].name] = (
+                            infos[index + 1].name)
+        return gradient_names
+
+    def _run_constant_data_source(self, model, values, n_points):
+        """ Outputs of the constant data source of `model`, repeated for
+        all points. The data source is run on its first call only."""
+        if model not in self._constant_outputs:
+            self._constant_outputs[model] = _run_data_source_batch(
+                model, values, 1)
+        return [
+            np.repeat(output, n_points, axis=0)
+            for output in self._constant_outputs[model]
+        ]
+
+
+def parameter_grid(parameters):
+    """ Full grid of the values of ranged MCO parameters, with
+    `n_samples` values between the bounds of each parameter.
+
+    Returns
+    -------
+    parameter_matrix: np.ndarray
+        (N, P) array of the grid points, one column per parameter
+    """
+    axes = [
+        np.linspace(
+            parameter.lower_bound, parameter.upper_bound,
+            parameter.n_samples)
+        for parameter in parameters
+    ]
+    grid = np.meshgrid(*axes, indexing="ij")
+    return np.column_stack([axis.ravel() for axis in grid])
+
+
+def _run_data_source_batch(model, values, n_points):
+    """ Outputs of the data source of `model` for all points, as a list
+    of arrays, one per output slot."""
+    data_source = model.factory.create_data_source()
+    input_slots, output_slots = data_source.slots(model)
+    inputs = [values[info.name] for info in model.input_slot_info]
+
+    if hasattr(data_source, "run_batch"):
+        if inputs:
+            parameter_matrix = np.column_stack(inputs)
+        else:
+            parameter_matrix = np.empty((n_points, 0))
+        return list(data_source.run_batch(model, parameter_matrix))
+
+    rows = [
+        data_source.run(model, [
+            DataValue(type=slot.type, value=input_values[index])
+            for slot, input_values in zip(input_slots, inputs)
+        ])
+        for index in range(n_points)
+    ]
+    if not rows:
+        return [np.empty(0) for _ in output_slots]
+    return [
+        np.array([row[output].value for row in rows])
+        for output in range(len(rows[0]))
+    ]
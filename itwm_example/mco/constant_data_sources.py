@@ -0,0 +1,65 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from contextlib import contextmanager
+
+from traits.api import Dict, Instance
+
+from force_bdss.api import ExecutionLayer
+
+from itwm_example.core.constant_data_source_factory import (
+    is_constant_data_source
+)
+
+
+class ConstantCacheExecutionLayer(ExecutionLayer):
+    """ Execution layer that runs its constant data sources only once,
+    and returns their stored outputs on every following execution.
+    The other data sources are run as usual."""
+
+    #: Layer of the data sources that are not constant
+    _variable_layer = Instance(ExecutionLayer)
+
+    #: Outputs of the constant data sources, by data source model
+    _constant_results = Dict()
+
+    def execute_layer(self, available_data_values):
+        results = []
+        for model in self.data_sources:
+            if not is_constant_data_source(model):
+                continue
+            if model not in self._constant_results:
+                self._constant_results[model] = ExecutionLayer(
+                    data_sources=[model]
+                ).execute_layer(available_data_values)
+            results += self._constant_results[model]
+
+        if self._variable_layer.data_sources:
+            results += self._variable_layer.execute_layer(
+                available_data_values)
+        return results
+
+    def __variable_layer_default(self):
+        return ExecutionLayer(
+            data_sources=[
+                model for model in self.data_sources
+                if not is_constant_data_source(model)
+            ]
+        )
+
+
+@contextmanager
+def cache_constant_data_sources(workflow):
+    """ Context manager under which each constant data source of the
+    `workflow` is run once, on its first evaluation, and its outputs are
+    reused by all other evaluations. The original execution layers are
+    restored on exit."""
+    execution_layers = workflow.execution_layers
+    workflow.execution_layers = [
+        ConstantCacheExecutionLayer(data_sources=layer.data_sources)
+        for layer in execution_layers
+    ]
+    try:
+        yield workflow
+    finally:
+        workflow.execution_layers = execution_layers
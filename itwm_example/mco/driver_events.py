@@ -1,7 +1,9 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from force_bdss.api import MCOStartEvent
+from traits.api import Int
+
+from force_bdss.api import MCOStartEvent, WeightedMCOProgressEvent
 
 
 class ITWMMCOStartEvent(MCOStartEvent):
@@ -13,3 +15,12 @@ class ITWMMCOStartEvent(MCOStartEvent):
         header = super().serialize()
         header += [f"{name} weight" for name in self.kpi_names]
         return header
+
+
+class ITWMMCOProgressEvent(WeightedMCOProgressEvent):
+    """ ITWMMCOProgressEvent class adds the sequence id of the weight
+    vector to the WeightedMCOProgressEvent, so that listeners can
+    reorder events that are notified out of order."""
+
+    #: Position of the weight vector of the event in the weight sweep
+    sequence_id = Int()
@@ -0,0 +1,130 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from contextlib import contextmanager
+
+import numpy as np
+from traits.api import Any
+
+from force_bdss.api import Workflow
+
+from .fork_pool import fork_pool, shared_object
+
+
+class PooledWorkflow(Workflow):
+    """ Workflow whose states are evaluated by a pool of persistent
+    worker processes. The parameter values are sent to a worker, which
+    executes the workflow in-process and sends back the KPI values.
+    The states of a batch are shared between the workers, and evaluated
+    concurrently."""
+
+    #: Pool of worker processes
+    pool = Any(transient=True)
+
+    def execute(self, parameter_values):
+        return self.execute_batch([parameter_values])[0]
+
+    def execute_batch(self, parameter_matrix):
+        """ Executes the workflow for each row of `parameter_matrix`.
+
+        Parameters
+        ----------
+        parameter_matrix: array_like
+            (N, P) array of MCO parameter values, one row per state
+
+        Returns
+        -------
+        kpi_results: list
+            The KPI DataValues of each state, as returned by `execute`
+        """
+        return self.pool.map(
+            _execute,
+            [list(parameter_values) for parameter_values in parameter_matrix],
+            chunksize=1,
+        )
+
+
+class PooledKPIJacobian:
+    """ Evaluates the KPIs of a `PooledWorkflow` and their Jacobian with
+    respect to the MCO parameters, approximated by forward finite
+    differences. The point and its shifted points are evaluated in a
+    single batch, so the pool workers evaluate them concurrently. It is
+    called as `KPIJacobian`.
+
+    Parameters
+    ----------
+    workflow: PooledWorkflow
+        Workflow to evaluate
+    step: float
+        Relative step of the finite differences
+    """
+
+    def __init__(self, workflow, step=1e-7):
+        self.workflow = workflow
+        self.step = step
+
+    def __call__(self, parameter_values):
+        """ KPI values and Jacobian at the MCO parameter values.
+
+        Parameters
+        ----------
+        parameter_values: array_like
+            (P,) array of MCO parameter values
+
+        Returns
+        -------
+        kpis: np.ndarray
+            (K,) array of KPI values
+        jacobian: np.ndarray
+            (K, P) array of the KPI derivatives with respect to the MCO
+            parameters
+        """
+        x = np.asarray(parameter_values, dtype=float)
+        steps = self.step * np.maximum(1.0, np.abs(x))
+        kpi_results = self.workflow.execute_batch(
+            np.vstack([x, x + np.diag(steps)]))
+        kpis = np.array(
+            [[kpi.value for kpi in kpi_result] for kpi_result in kpi_results],
+            dtype=float,
+        )
+        return kpis[0], (kpis[1:] - kpis[0]).T / steps
+
+
+@contextmanager
+def evaluation_pool(workflow, processes, max_evaluations=0):
+    """ Context manager providing a `PooledWorkflow` that evaluates the
+    states of `workflow` on a pool of persistent worker processes.
+
+    The workers are forked from the current process, so the workflow
+    and plugins are loaded only once. Each worker is replaced by a new
+    one after `max_evaluations` evaluations, to contain resource leaks
+    of the data sources. Where forking is not available, the original
+    `workflow` is provided instead.
+
+    Parameters
+    ----------
+    workflow: Workflow
+        Workflow to evaluate
+    processes: int
+        Number of worker processes
+    max_evaluations: int
+        Number of evaluations after which a worker is replaced. Workers
+        are never replaced if 0.
+    """
+    workers_workflow = Workflow(
+        mco_model=workflow.mco_model,
+        execution_layers=workflow.execution_layers,
+    )
+    with fork_pool(processes, workers_workflow, max_evaluations) as pool:
+        if pool is None:
+            yield workflow
+        else:
+            yield PooledWorkflow(
+                mco_model=workflow.mco_model,
+                execution_layers=workflow.execution_layers,
+                pool=pool,
+            )
+
+
+def _execute(parameter_values):
+    return shared_object().execute(parameter_values)
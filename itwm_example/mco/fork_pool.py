@@ -0,0 +1,64 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from contextlib import contextmanager
+import logging
+import multiprocessing
+
+log = logging.getLogger(__name__)
+
+#: Object shared with the worker processes of the running `fork_pool`.
+#: It is set before the workers are forked, so that they inherit it
+#: instead of receiving a pickled copy.
+_shared = None
+
+
+@contextmanager
+def fork_pool(processes, shared, max_tasks=0):
+    """ Context manager providing a pool of worker processes forked from
+    the current process, which inherit the `shared` object. The
+    functions run by the workers get it with `shared_object()`.
+
+    Where forking is not available, None is provided instead of the
+    pool, so that the caller does the work in the current process.
+
+    Parameters
+    ----------
+    processes: int
+        Number of worker processes
+    shared: object
+        Object inherited by the worker processes
+    max_tasks: int
+        Number of tasks after which a worker is replaced. Workers are
+        never replaced if 0.
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        log.warning(
+            "Forked worker processes are not available on this platform, "
+            "the work is done in the current process"
+        )
+        yield None
+        return
+
+    global _shared
+    _shared = shared
+    try:
+        context = multiprocessing.get_context("fork")
+        pool = context.Pool(processes, maxtasksperchild=max_tasks or None)
+        try:
+            yield pool
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            # Let the workers finish their tasks and exit, as terminating
+            # them can hang while the pool replaces exited workers
+            pool.close()
+        pool.join()
+    finally:
+        _shared = None
+
+
+def shared_object():
+    """ The object shared with the workers of the running `fork_pool`."""
+    return _shared
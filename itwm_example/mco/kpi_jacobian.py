@@ -0,0 +1,181 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+from .batch_evaluator import BatchEvaluator
+
+
+class KPIJacobian:
+    """ Evaluates the KPIs of a workflow and their Jacobian with respect
+    to the MCO parameters.
+
+    The derivatives with respect to the MCO parameters are carried
+    through the execution layers by the chain rule. A data source output
+    that is followed by a gradient output (see
+    `BatchEvaluator.kpi_gradient_names`), with one entry per input of the
+    data source, has for derivative that gradient times the derivatives
+    of the inputs. Values that do not depend on the MCO parameters have
+    zero derivatives. The rows of the KPIs whose derivatives cannot be
+    composed this way are computed by forward finite differences, with
+    all the shifted points evaluated together in a single batch.
+
+    Parameters
+    ----------
+    workflow: Workflow
+        Workflow to evaluate
+    step: float
+        Relative step of the finite differences
+    """
+
+    def __init__(self, workflow, step=1e-7):
+        self.evaluator = BatchEvaluator(workflow)
+        self.step = step
+        self._gradient_graph, self._dependent = self._build_gradient_graph()
+
+    def __call__(self, parameter_values):
+        """ KPI values and Jacobian at the MCO parameter values.
+
+        Parameters
+        ----------
+        parameter_values: array_like
+            (P,) array of MCO parameter values
+
+        Returns
+        -------
+        kpis: np.ndarray
+            (K,) array of KPI values
+        jacobian: np.ndarray
+            (K, P) array of the KPI derivatives with respect to the MCO
+            parameters
+        """
+        x = np.asarray(parameter_values, dtype=float)
+        kpis, jacobian = self.evaluate_batch(x[np.newaxis, :])
+        return kpis[0], jacobian[0]
+
+    def evaluate_batch(self, parameter_matrix):
+        """ KPI values and Jacobians for each row of `parameter_matrix`.
+
+        Parameters
+        ----------
+        parameter_matrix: array_like
+            (N, P) array of MCO parameter values, one row per point
+
+        Returns
+        -------
+        kpis: np.ndarray
+            (N, K) array of KPI values
+        jacobian: np.ndarray
+            (N, K, P) array of the KPI derivatives with respect to the
+            MCO parameters
+        """
+        parameter_matrix = np.atleast_2d(
+            np.asarray(parameter_matrix, dtype=float))
+        n_points, n_parameters = parameter_matrix.shape
+        kpi_names = self.evaluator.kpi_names
+
+        values = self.evaluator.execute_batch(parameter_matrix)
+        kpis = np.column_stack([values[name] for name in kpi_names])
+        derivatives = self.chain_rule(values, n_points, n_parameters)
+
+        jacobian = np.empty((n_points, len(kpi_names), n_parameters))
+        numerical = []
+        for row, name in enumerate(kpi_names):
+            if derivatives.get(name) is None:
+                numerical.append(row)
+            else:
+                jacobian[:, row] = derivatives[name]
+
+        if numerical:
+            steps = self.step * np.maximum(1.0, np.abs(parameter_matrix))
+            shifted = (parameter_matrix[:, np.newaxis, :]
+                       + steps[:, np.newaxis, :] * np.eye(n_parameters))
+            shifted_values = self.evaluator.execute_batch(
+                shifted.reshape(-1, n_parameters))
+            for row in numerical:
+                shifted_kpis = shifted_values[kpi_names[row]].reshape(
+                    n_points, n_parameters)
+                jacobian[:, row] = (
+                    shifted_kpis - kpis[:, row, np.newaxis]) / steps
+
+        return kpis, jacobian
+
+    def chain_rule(self, values, n_points, n_parameters):
+        """ Derivatives of the named workflow values with respect to the
+        MCO parameters.
+
+        Parameters
+        ----------
+        values: dict
+            Workflow values of N points, as returned by
+            `BatchEvaluator.execute_batch`
+        n_points, n_parameters: int
+            Number of points N and of MCO parameters P
+
+        Returns
+        -------
+        derivatives: dict
+            (N, P) array of derivatives for each named value, by name.
+            The derivatives of values that depend on the MCO parameters
+            but cannot be composed from the data source gradients are
+            None.
+        """
+        identity = np.eye(n_parameters)
+        zeros = np.zeros((n_points, n_parameters))
+        derivatives = {
+            name: np.broadcast_to(identity[index], (n_points, n_parameters))
+            for index, name in enumerate(self.evaluator.parameter_names)
+        }
+        for name in values:
+            if name not in self._dependent:
+                derivatives[name] = zeros
+
+        for input_names, outputs in self._gradient_graph:
+            input_derivatives = [derivatives.get(name)
+                                 for name in input_names]
+            if any(derivative is None for derivative in input_derivatives):
+                input_derivatives = None
+            else:
+                input_derivatives = np.stack(input_derivatives, axis=1)
+
+            for output_name, gradient_name in outputs:
+                derivatives[output_name] = _compose(
+                    values.get(gradient_name), input_derivatives)
+
+        return derivatives
+
+    def _build_gradient_graph(self):
+        """ The data sources that depend on the MCO parameters, in
+        execution order, as pairs of their input names and of the
+        (output name, gradient name) of each of their named outputs,
+        together with the set of the names of all dependent values."""
+        gradient_names = self.evaluator.kpi_gradient_names()
+        dependent = set(self.evaluator.parameter_names)
+        graph = []
+        for layer in self.evaluator.workflow.execution_layers:
+            layer_dependent = set()
+            for model in layer.data_sources:
+                input_names = [info.name for info in model.input_slot_info]
+                if not dependent.intersection(input_names):
+                    continue
+                output_names = [
+                    info.name for info in model.output_slot_info if info.name
+                ]
+                layer_dependent.update(output_names)
+                graph.append((input_names, [
+                    (name, gradient_names.get(name)) for name in output_names
+                ]))
+            dependent.update(layer_dependent)
+        return graph, dependent
+
+
+def _compose(gradient, input_derivatives):
+    """ (N, P) derivatives of a data source output from its (N, I)
+    gradient with respect to the inputs and the (N, I, P) derivatives of
+    the inputs, or None if either is unavailable."""
+    if gradient is None or input_derivatives is None:
+        return None
+    gradient = np.asarray(gradient, dtype=float)
+    if gradient.shape != input_derivatives.shape[:2]:
+        return None
+    return np.einsum("ni,nip->np", gradient, input_derivatives)
@@ -0,0 +1,122 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+
+class ParetoArchive:
+    """ Non-dominated archive of points inserted one at a time, all
+    objectives being minimised.
+
+    A point is dominated by another one that is not larger in any
+    objective and smaller in at least one. Inserting a point that is
+    dominated by the archive leaves the archive unchanged, and inserting a
+    non-dominated point removes the archived points that it dominates.
+    Identical points do not dominate each other and are all kept.
+
+    With `epsilon`, the objective space is divided into boxes of that
+    size and dominance is tested between the boxes of the points instead.
+    Each box holds at most one point: of two points in the same box, the
+    archive keeps the one that dominates the other or, if neither does,
+    the one closest to the lower corner of the box. This bounds the size
+    of the archive whatever the number of points inserted.
+
+    Parameters
+    ----------
+    epsilon: float or array_like, optional
+        Size of the boxes, for all objectives or per objective. Dominance
+        is tested between the points themselves when None.
+    """
+
+    def __init__(self, epsilon=None):
+        if epsilon is not None:
+            epsilon = np.asarray(epsilon, dtype=float)
+            if np.any(epsilon <= 0):
+                raise ValueError("epsilon must be positive")
+        self.epsilon = epsilon
+        self._points = None
+        self._keys = None
+        self._data = []
+
+    def __len__(self):
+        return len(self._data)
+
+    def insert(self, point, data=None):
+        """ Inserts a point if it is not dominated by the archive.
+
+        Parameters
+        ----------
+        point: array_like
+            (M,) objective values of the point
+        data: object
+            Value archived with the point, e.g. its parameters
+
+        Returns
+        -------
+        inserted: bool
+            True if the point was added to the archive
+        """
+        point = np.asarray(point, dtype=float).ravel()
+        key = self._key(point)
+        if self._points is None:
+            self._points = np.empty((0, point.size))
+            self._keys = np.empty((0, point.size))
+
+        not_larger = np.all(self._keys <= key, axis=1)
+        not_smaller = np.all(self._keys >= key, axis=1)
+        same = not_larger & not_smaller
+        if np.any(not_larger & ~same):
+            return False
+
+        removed = not_smaller & ~same
+        if self.epsilon is not None and np.any(same):
+            # A single point per box
+            index = np.flatnonzero(same)[0]
+            if not self._replaces(point, key, self._points[index]):
+                return False
+            removed[index] = True
+
+        keep = ~removed
+        self._points = np.vstack([self._points[keep], point])
+        self._keys = np.vstack([self._keys[keep], key])
+        self._data = [
+            value for value, kept in zip(self._data, keep) if kept
+        ] + [data]
+        return True
+
+    def points(self):
+        """ Copy of the (N, M) objective values of the archived points,
+        in the order they were inserted."""
+        return self.snapshot()[0]
+
+    def snapshot(self):
+        """ Copy of the current content of the archive.
+
+        Returns
+        -------
+        points: np.ndarray
+            (N, M) objective values of the archived points, in the order
+            they were inserted
+        data: list
+            The values archived with the points
+        """
+        if self._points is None:
+            return np.empty((0, 0)), []
+        return self._points.copy(), list(self._data)
+
+    def _key(self, point):
+        """ The point, or its box when `epsilon` is given."""
+        if self.epsilon is None:
+            return point
+        return np.floor(point / self.epsilon)
+
+    def _replaces(self, point, key, archived):
+        """ Whether `point` takes the place of the `archived` point of
+        the same box."""
+        if np.all(point <= archived) and np.any(point < archived):
+            return True
+        if np.all(archived <= point):
+            return False
+        corner = key * self.epsilon
+        return (np.linalg.norm(point - corner)
+                < np.linalg.norm(archived - corner))
@@ -2,6 +2,11 @@
 #  All rights reserved.
 
 import numpy as np
+from traits.api import Callable, List
+
+from itwm_example.mco.weighted_optimizer_engine import (
+    ITWMWeightedOptimizerEngine
+)
 
 
 class MockOptimizer:
@@ -14,3 +19,33 @@ class MockOptimizer:
 
     def optimize(self, weights):
         return 0, self.min_values + weights * self.margins
+
+
+class MockWeightedOptimizerEngine(ITWMWeightedOptimizerEngine):
+    """ Weighted optimizer engine of a given weight sweep, whose optimal
+    point of a weight vector is the weight vector itself and whose
+    optimal KPIs are `kpi_function` of the weight vector. It records
+    the starting point of each optimization."""
+
+    #: Weight vectors of the sweep
+    sweep_weights = List()
+
+    #: Scaling factors of the KPIs
+    scaling_factors = List()
+
+    #: Optimal KPIs of a weight vector
+    kpi_function = Callable()
+
+    #: Starting point of each optimization
+    initial_points = List()
+
+    def weights_samples(self, **kwargs):
+        for weights in self.sweep_weights:
+            yield list(weights)
+
+    def get_scaling_factors(self):
+        return self.scaling_factors
+
+    def _weighted_optimize(self, weights):
+        self.initial_points.append(self.initial_point)
+        return np.array(weights), self.kpi_function(weights)
@@ -0,0 +1,20 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+
+from itwm_example.mco.adaptive_sweep import refinement_candidates
+
+
+class TestAdaptiveSweep(TestCase):
+    def test_refinement_candidates(self):
+        weights = np.array([[0.0, 1.0], [0.5, 0.5], [1.0, 0.0]])
+        kpis = np.array([[0.0, 1.0], [0.1, 0.9], [1.0, 0.0]])
+        self.assertEqual(
+            [(1, 2), (0, 1)], refinement_candidates(weights, kpis, 0.1))
+        self.assertEqual(
+            [(1, 2)], refinement_candidates(weights, kpis, 0.5))
+        self.assertEqual(
+            [], refinement_candidates(weights[:1], kpis[:1], 0.1))
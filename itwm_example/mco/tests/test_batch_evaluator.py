@@ -0,0 +1,91 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase, mock
+
+import numpy as np
+
+from itwm_example.arrhenius_parameters.arrhenius_parameters import \
+    ArrheniusParameters
+from itwm_example.itwm_example_plugin import ITWMExamplePlugin
+from itwm_example.mco.batch_evaluator import (
+    BatchEvaluator, _run_data_source_batch, parameter_grid
+)
+from itwm_example.tests.example_workflow import create_workflow
+
+
+class TestBatchEvaluator(TestCase):
+    def setUp(self):
+        self.plugin = ITWMExamplePlugin()
+        self.workflow = create_workflow(self.plugin)
+        self.evaluator = BatchEvaluator(self.workflow)
+
+    def test_parameter_grid(self):
+        grid = parameter_grid(self.workflow.mco_model.parameters)
+        self.assertEqual((81, 4), grid.shape)
+        np.testing.assert_allclose([0.01, 0.001, 270.0, 1.0], grid[0])
+        np.testing.assert_allclose([1.0, 0.1, 400.0, 3600.0], grid[-1])
+
+    def test_kpi_gradient_names(self):
+        self.assertEqual(
+            {"impurity_conc": "impurity_conc_grad",
+             "mat_cost": "mat_cost_grad",
+             "prod_cost": "prod_cost_grad"},
+            self.evaluator.kpi_gradient_names()
+        )
+
+    def test_evaluate_batch(self):
+        grid = parameter_grid(self.workflow.mco_model.parameters)
+        kpis, gradients = self.evaluator.evaluate_batch(grid)
+
+        self.assertEqual((81, 3), kpis.shape)
+        self.assertEqual((81, 12), gradients[0].shape)
+        self.assertEqual((81, 4), gradients[1].shape)
+        self.assertEqual((81, 2), gradients[2].shape)
+
+        for index in [0, 17, 80]:
+            expected = self.workflow.execute(list(grid[index]))
+            np.testing.assert_allclose(
+                [kpi.value for kpi in expected], kpis[index])
+
+    def test_execute_batch(self):
+        values = self.evaluator.execute_batch([[0.5, 0.05, 350.0, 100.0]])
+        np.testing.assert_allclose([1.0], values["reactor_volume"])
+        np.testing.assert_allclose([0.02], values["arr_nu_main"])
+        self.assertEqual((1,), values["impurity_conc"].shape)
+
+    def test_constant_outputs_cached(self):
+        with mock.patch.object(ArrheniusParameters, "run", autospec=True,
+                               side_effect=ArrheniusParameters.run) as run:
+            first = self.evaluator.execute_batch([[0.5, 0.05, 350.0, 100.0]])
+            second = self.evaluator.execute_batch(
+                [[0.5, 0.05, 350.0, 100.0], [0.1, 0.01, 300.0, 10.0]])
+            self.assertEqual(1, run.call_count)
+
+        np.testing.assert_allclose([0.02], first["arr_nu_main"])
+        np.testing.assert_allclose([0.02, 0.02], second["arr_nu_main"])
+
+    def test_run_data_source_point_by_point(self):
+        model = self.workflow.execution_layers[1].data_sources[2]
+        data_source = model.factory.create_data_source()
+        point_by_point = mock.Mock(
+            spec=["run", "slots"],
+            run=data_source.run,
+            slots=data_source.slots,
+        )
+        values = {"temperature": np.array([300.0, 350.0]),
+                  "reaction_time": np.array([10.0, 100.0])}
+        with mock.patch.object(
+                type(model.factory), "create_data_source",
+                return_value=point_by_point):
+            cost, cost_gradient = _run_data_source_batch(model, values, 2)
+            expected, expected_gradient = data_source.run_batch(
+                model, [[300.0, 10.0], [350.0, 100.0]])
+            np.testing.assert_allclose(expected, cost)
+            np.testing.assert_allclose(expected_gradient, cost_gradient)
+
+            # An empty population gives empty outputs
+            empty = {"temperature": np.empty(0),
+                     "reaction_time": np.empty(0)}
+            outputs = _run_data_source_batch(model, empty, 0)
+        self.assertEqual([(0,), (0,)], [output.shape for output in outputs])
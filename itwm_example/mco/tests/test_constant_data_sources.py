@@ -0,0 +1,57 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase, mock
+
+from force_bdss.api import ExecutionLayer, OutputSlotInfo, Workflow
+
+from itwm_example.arrhenius_parameters.arrhenius_parameters import \
+    ArrheniusParameters
+from itwm_example.itwm_example_plugin import ITWMExamplePlugin
+from itwm_example.mco.constant_data_sources import (
+    ConstantCacheExecutionLayer,
+    cache_constant_data_sources,
+)
+
+
+class TestConstantDataSources(TestCase):
+    def setUp(self):
+        self.plugin = ITWMExamplePlugin()
+        factories = self.plugin.data_source_factories
+        self.constant_model = factories[2].create_model()
+        self.constant_model.output_slot_info = [
+            OutputSlotInfo(name=name)
+            for name in ["nu_main", "delta_H_main",
+                         "nu_secondary", "delta_H_secondary"]
+        ]
+
+    def test_execute_layer_once(self):
+        layer = ConstantCacheExecutionLayer(
+            data_sources=[self.constant_model])
+        with mock.patch.object(ArrheniusParameters, "run", autospec=True,
+                               side_effect=ArrheniusParameters.run) as run:
+            first_results = layer.execute_layer([])
+            second_results = layer.execute_layer([])
+            self.assertEqual(1, run.call_count)
+
+        self.assertEqual(4, len(first_results))
+        self.assertEqual(
+            [data_value.value for data_value in first_results],
+            [data_value.value for data_value in second_results]
+        )
+        self.assertEqual(
+            ["nu_main", "delta_H_main", "nu_secondary", "delta_H_secondary"],
+            [data_value.name for data_value in second_results]
+        )
+
+    def test_cache_constant_data_sources(self):
+        layer = ExecutionLayer(data_sources=[self.constant_model])
+        workflow = Workflow(execution_layers=[layer])
+
+        with cache_constant_data_sources(workflow):
+            self.assertEqual(1, len(workflow.execution_layers))
+            cached_layer = workflow.execution_layers[0]
+            self.assertIsInstance(cached_layer, ConstantCacheExecutionLayer)
+            self.assertEqual([self.constant_model], cached_layer.data_sources)
+
+        self.assertEqual([layer], workflow.execution_layers)
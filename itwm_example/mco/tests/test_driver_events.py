@@ -3,7 +3,11 @@
 
 from unittest import TestCase
 
-from itwm_example.mco.driver_events import ITWMMCOStartEvent
+from force_bdss.api import DataValue
+
+from itwm_example.mco.driver_events import (
+    ITWMMCOStartEvent, ITWMMCOProgressEvent
+)
 
 
 class TestProgressEvents(TestCase):
@@ -24,3 +28,13 @@ class TestProgressEvents(TestCase):
         self.assertEqual(
             ["p1", "p2", "p3", "kpi", "kpi weight"], event.serialize()
         )
+
+    def test_progress_event(self):
+        event = ITWMMCOProgressEvent(
+            optimal_point=[DataValue(value=1.0), DataValue(value=2.0)],
+            optimal_kpis=[DataValue(value=3.0)],
+            weights=[1.0],
+            sequence_id=4,
+        )
+        self.assertEqual(4, event.sequence_id)
+        self.assertEqual([1.0, 2.0, 3.0, 1.0], event.serialize())
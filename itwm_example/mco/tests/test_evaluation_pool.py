@@ -0,0 +1,89 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+import time
+from unittest import TestCase, mock
+
+import numpy as np
+
+from force_bdss.api import DataValue, Workflow
+
+from itwm_example.mco.fork_pool import shared_object
+from itwm_example.mco.evaluation_pool import (
+    PooledKPIJacobian, PooledWorkflow, evaluation_pool
+)
+
+
+def execute_pid(workflow, parameter_values):
+    return [
+        DataValue(value=sum(parameter_values)),
+        DataValue(value=os.getpid()),
+    ]
+
+
+def execute_slowly(workflow, parameter_values):
+    time.sleep(0.05)
+    return execute_pid(workflow, parameter_values)
+
+
+def execute_linear(workflow, parameter_values):
+    return [
+        DataValue(value=sum(parameter_values)),
+        DataValue(value=2 * parameter_values[0]),
+    ]
+
+
+class TestEvaluationPool(TestCase):
+    def setUp(self):
+        self.workflow = Workflow()
+
+    def test_evaluation_pool(self):
+        with mock.patch.object(
+                Workflow, "execute", autospec=True, side_effect=execute_pid):
+            with evaluation_pool(self.workflow, 2) as pooled:
+                self.assertIsInstance(pooled, PooledWorkflow)
+                results = [pooled.execute([1.0, index]) for index in range(4)]
+
+        self.assertIsNone(shared_object())
+        for index, (value, pid) in enumerate(results):
+            self.assertEqual(1.0 + index, value.value)
+            self.assertNotEqual(os.getpid(), pid.value)
+
+    def test_execute_batch(self):
+        with mock.patch.object(
+                Workflow, "execute", autospec=True,
+                side_effect=execute_slowly):
+            with evaluation_pool(self.workflow, 2) as pooled:
+                results = pooled.execute_batch(
+                    [[1.0, index] for index in range(4)])
+
+        self.assertEqual(
+            [1.0, 2.0, 3.0, 4.0], [value.value for value, _ in results])
+        # The states are evaluated concurrently
+        self.assertEqual(2, len({pid.value for _, pid in results}))
+
+    def test_kpi_jacobian(self):
+        with mock.patch.object(
+                Workflow, "execute", autospec=True,
+                side_effect=execute_linear):
+            with evaluation_pool(self.workflow, 2) as pooled:
+                kpis, jacobian = PooledKPIJacobian(pooled)([1.0, 3.0])
+
+        np.testing.assert_allclose([4.0, 2.0], kpis)
+        np.testing.assert_allclose([[1.0, 1.0], [2.0, 0.0]], jacobian)
+
+    def test_recycling(self):
+        with mock.patch.object(
+                Workflow, "execute", autospec=True, side_effect=execute_pid):
+            with evaluation_pool(self.workflow, 1, 1) as pooled:
+                pids = {pooled.execute([1.0])[1].value for _ in range(3)}
+
+        self.assertEqual(3, len(pids))
+
+    def test_no_fork(self):
+        with mock.patch(
+                "multiprocessing.get_all_start_methods",
+                return_value=["spawn"]):
+            with evaluation_pool(self.workflow, 2) as pooled:
+                self.assertIs(self.workflow, pooled)
@@ -0,0 +1,36 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+from unittest import TestCase, mock
+
+from itwm_example.mco.fork_pool import fork_pool, shared_object
+
+
+def shared_pid(_):
+    return shared_object()["name"], os.getpid()
+
+
+class TestForkPool(TestCase):
+    def test_fork_pool(self):
+        with fork_pool(2, {"name": "shared"}) as pool:
+            results = pool.map(shared_pid, range(4))
+
+        self.assertIsNone(shared_object())
+        for name, pid in results:
+            self.assertEqual("shared", name)
+            self.assertNotEqual(os.getpid(), pid)
+
+    def test_max_tasks(self):
+        with fork_pool(1, {"name": "shared"}, max_tasks=1) as pool:
+            pids = {pool.apply(shared_pid, (None,))[1] for _ in range(3)}
+        self.assertEqual(3, len(pids))
+
+    def test_no_fork(self):
+        with mock.patch(
+                "multiprocessing.get_all_start_methods",
+                return_value=["spawn"]):
+            with self.assertLogs("itwm_example.mco.fork_pool", "WARNING"):
+                with fork_pool(2, {"name": "shared"}) as pool:
+                    self.assertIsNone(pool)
+        self.assertIsNone(shared_object())
@@ -0,0 +1,115 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+
+from force_bdss.api import ExecutionLayer, KPISpecification
+
+from itwm_example.itwm_example_plugin import ITWMExamplePlugin
+from itwm_example.mco.kpi_jacobian import KPIJacobian
+from itwm_example.tests.example_workflow import (
+    create_data_source_model, create_workflow)
+
+
+class TestKPIJacobian(TestCase):
+    def setUp(self):
+        self.plugin = ITWMExamplePlugin()
+        self.workflow = create_workflow(self.plugin)
+        self.kpi_jacobian = KPIJacobian(self.workflow)
+        self.point = np.array([0.5, 0.05, 350.0, 2670.0])
+
+    def central_differences(self, point, step=1e-6):
+        evaluator = self.kpi_jacobian.evaluator
+        steps = step * np.maximum(1.0, np.abs(point))
+        upper, _ = evaluator.evaluate_batch(point + np.diag(steps))
+        lower, _ = evaluator.evaluate_batch(point - np.diag(steps))
+        return ((upper - lower) / (2 * steps[:, np.newaxis])).T
+
+    def test_gradient_graph(self):
+        graph = self.kpi_jacobian._gradient_graph
+        self.assertEqual(3, len(graph))
+        self.assertEqual(
+            (["temperature", "reaction_time"],
+             [("prod_cost", "prod_cost_grad"), ("prod_cost_grad", None)]),
+            graph[2]
+        )
+        self.assertNotIn("reactor_volume", self.kpi_jacobian._dependent)
+        self.assertIn("impurity_conc", self.kpi_jacobian._dependent)
+
+    def test_chain_rule(self):
+        values = self.kpi_jacobian.evaluator.execute_batch(
+            self.point[np.newaxis, :])
+        derivatives = self.kpi_jacobian.chain_rule(values, 1, 4)
+
+        np.testing.assert_allclose(
+            [[0.0, 0.0] + list(values["prod_cost_grad"][0])],
+            derivatives["prod_cost"])
+        np.testing.assert_allclose(
+            values["impurity_conc_grad"][:, :4],
+            derivatives["impurity_conc"])
+        np.testing.assert_allclose(
+            np.zeros((1, 4)), derivatives["reactor_volume"])
+        self.assertIsNone(derivatives["impurity_conc_grad"])
+
+    def test_jacobian(self):
+        kpis, jacobian = self.kpi_jacobian(self.point)
+        expected_kpis, _ = self.kpi_jacobian.evaluator.evaluate_batch(
+            self.point)
+
+        np.testing.assert_allclose(expected_kpis[0], kpis)
+        self.assertEqual((3, 4), jacobian.shape)
+        np.testing.assert_allclose(
+            self.central_differences(self.point), jacobian,
+            rtol=1e-4, atol=1e-8)
+
+    def test_evaluate_batch(self):
+        points = np.array([self.point, [0.1, 0.01, 300.0, 100.0]])
+        kpis, jacobian = self.kpi_jacobian.evaluate_batch(points)
+        self.assertEqual((2, 3), kpis.shape)
+        self.assertEqual((2, 3, 4), jacobian.shape)
+        for index, point in enumerate(points):
+            point_kpis, point_jacobian = self.kpi_jacobian(point)
+            np.testing.assert_allclose(point_kpis, kpis[index])
+            np.testing.assert_allclose(point_jacobian, jacobian[index])
+
+    def test_chained_layers(self):
+        # The production cost is fed back as the temperature of a second
+        # production cost, whose KPI depends on the parameters through
+        # both layers
+        factory = self.plugin.data_source_factories[1]
+        self.workflow.execution_layers.append(ExecutionLayer(data_sources=[
+            create_data_source_model(
+                factory, ["prod_cost", "reaction_time"],
+                ["chained_cost", "chained_cost_grad"])
+        ]))
+        self.workflow.mco_model.kpis.append(
+            KPISpecification(name="chained_cost"))
+        kpi_jacobian = KPIJacobian(self.workflow)
+        point = np.array([0.5, 0.05, 350.0, 10.0])
+
+        values = kpi_jacobian.evaluator.execute_batch(point[np.newaxis, :])
+        derivatives = kpi_jacobian.chain_rule(values, 1, 4)
+        self.assertIsNotNone(derivatives["chained_cost"])
+
+        _, jacobian = kpi_jacobian(point)
+        np.testing.assert_allclose(
+            self.central_differences(point)[3], jacobian[3],
+            rtol=1e-4, atol=1e-8)
+
+    def test_finite_differences_fallback(self):
+        # Without the gradient output, the KPI row falls back to
+        # finite differences
+        model = self.workflow.execution_layers[1].data_sources[2]
+        model.output_slot_info[1].name = ""
+        kpi_jacobian = KPIJacobian(self.workflow)
+
+        values = kpi_jacobian.evaluator.execute_batch(
+            self.point[np.newaxis, :])
+        self.assertIsNone(kpi_jacobian.chain_rule(values, 1, 4)["prod_cost"])
+
+        _, jacobian = kpi_jacobian(self.point)
+        np.testing.assert_allclose(
+            self.central_differences(self.point), jacobian,
+            rtol=1e-4, atol=1e-8)
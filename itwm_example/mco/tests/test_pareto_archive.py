@@ -0,0 +1,92 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+
+from itwm_example.mco.pareto_archive import ParetoArchive
+
+
+def brute_force_front(points):
+    """ Mask of the points not dominated by any other point."""
+    not_larger = np.all(points[np.newaxis] <= points[:, np.newaxis], axis=2)
+    smaller = np.any(points[np.newaxis] < points[:, np.newaxis], axis=2)
+    return ~np.any(not_larger & smaller, axis=1)
+
+
+class TestParetoArchive(TestCase):
+
+    def test_insert(self):
+        archive = ParetoArchive()
+        self.assertTrue(archive.insert([1.0, 3.0], "a"))
+        self.assertTrue(archive.insert([3.0, 1.0], "b"))
+        self.assertFalse(archive.insert([3.0, 3.0], "c"))
+        self.assertFalse(archive.insert([1.0, 4.0], "d"))
+        self.assertTrue(archive.insert([1.0, 3.0], "e"))
+        self.assertTrue(archive.insert([0.5, 2.0], "f"))
+
+        points, data = archive.snapshot()
+        np.testing.assert_array_equal([[3.0, 1.0], [0.5, 2.0]], points)
+        self.assertEqual(["b", "f"], data)
+        np.testing.assert_array_equal(points, archive.points())
+        self.assertEqual(2, len(archive))
+
+    def test_snapshot_is_a_copy(self):
+        archive = ParetoArchive()
+        points, data = archive.snapshot()
+        self.assertEqual((0, 0), points.shape)
+        self.assertEqual([], data)
+
+        archive.insert([1.0, 2.0])
+        points, data = archive.snapshot()
+        points[0, 0] = 5.0
+        data.append("x")
+        np.testing.assert_array_equal([[1.0, 2.0]], archive.snapshot()[0])
+        self.assertEqual([None], archive.snapshot()[1])
+
+    def test_random_stream(self):
+        rng = np.random.default_rng(0)
+        points = rng.integers(0, 6, (300, 3)).astype(float)
+        archive = ParetoArchive()
+        for index, point in enumerate(points):
+            archive.insert(point, index)
+
+        _, data = archive.snapshot()
+        np.testing.assert_array_equal(
+            np.flatnonzero(brute_force_front(points)), sorted(data))
+
+    def test_epsilon_boxes(self):
+        archive = ParetoArchive(epsilon=1.0)
+        self.assertTrue(archive.insert([0.5, 0.5], "a"))
+        # Same box, dominating point
+        self.assertTrue(archive.insert([0.4, 0.5], "b"))
+        # Same box, not dominating but further from the corner
+        self.assertFalse(archive.insert([0.9, 0.1], "c"))
+        # Same box, closer to the corner
+        self.assertTrue(archive.insert([0.1, 0.3], "d"))
+        # Dominated box
+        self.assertFalse(archive.insert([1.5, 0.9], "e"))
+        self.assertTrue(archive.insert([-0.5, 1.5], "f"))
+
+        _, data = archive.snapshot()
+        self.assertEqual(["d", "f"], data)
+
+    def test_epsilon_bounds_size(self):
+        rng = np.random.default_rng(1)
+        angles = rng.uniform(0, np.pi / 2, 2000)
+        points = np.column_stack([np.cos(angles), np.sin(angles)])
+        archive = ParetoArchive(epsilon=[0.1, 0.1])
+        for point in points:
+            archive.insert(point)
+
+        front, _ = archive.snapshot()
+        self.assertLessEqual(len(archive), 21)
+        self.assertTrue(np.all(brute_force_front(front)))
+        # Every point is epsilon-dominated by the archive
+        for point in points:
+            self.assertTrue(np.any(np.all(front <= point + 0.1, axis=1)))
+
+    def test_epsilon_validation(self):
+        with self.assertRaises(ValueError):
+            ParetoArchive(epsilon=0.0)
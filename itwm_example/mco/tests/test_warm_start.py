@@ -0,0 +1,34 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from itertools import product
+from unittest import TestCase
+
+import numpy as np
+
+from itwm_example.mco.warm_start import snake_order, snake_ordered_samples
+
+
+class TestWarmStart(TestCase):
+    def setUp(self):
+        self.weights = np.array([
+            weights for weights in product(np.linspace(0, 1, 5), repeat=3)
+            if np.isclose(sum(weights), 1)
+        ])
+
+    def test_snake_order(self):
+        order = snake_order(self.weights)
+
+        self.assertEqual(list(range(15)), sorted(order))
+        steps = np.abs(np.diff(self.weights[order], axis=0))
+        self.assertLessEqual(steps.max(), 0.25 + 1e-12)
+
+        self.assertEqual([], snake_order([]))
+        self.assertEqual([1, 0], snake_order([[1.0, 0.0], [0.0, 1.0]]))
+
+    def test_snake_ordered_samples(self):
+        samples = [(list(weights), index)
+                   for index, weights in enumerate(self.weights)]
+        self.assertEqual(
+            snake_order(self.weights),
+            [index for _, index in snake_ordered_samples(samples)])
@@ -1,9 +1,12 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+import tempfile
+import time
 from unittest import TestCase, mock
 
-from traits.testing.unittest_tools import UnittestTools
+import numpy as np
 
 from force_bdss.api import (
     KPISpecification,
@@ -17,14 +20,16 @@ from force_bdss.api import (
 from itwm_example.mco.weighted_mco_factory import WeightedMCOFactory
 from itwm_example.mco.weighted_mco_model import WeightedMCOModel
 from itwm_example.mco.weighted_mco import WeightedMCO
+from itwm_example.mco.driver_events import ITWMMCOProgressEvent
 from itwm_example.itwm_example_plugin import ITWMExamplePlugin
 from itwm_example.mco.parameters import (
     ITWMRangedMCOParameterFactory,
     ITWMRangedMCOParameter,
 )
+from itwm_example.tests.example_workflow import create_workflow
 
 
-class TestWeightedMCO(TestCase, UnittestTools):
+class TestWeightedMCO(TestCase):
     def setUp(self):
         self.plugin = ITWMExamplePlugin()
         self.factory = self.plugin.mco_factories[0]
@@ -82,12 +87,37 @@ class TestWeightedMCO(TestCase, UnittestTools):
         self.assertEqual(True, self.model.verbose_run)
         self.assertEqual("Uniform", self.model.space_search_mode)
         self.assertEqual("Internal", self.model.evaluation_mode)
+        self.assertTrue(self.model.cache_constant_sources)
+        self.assertFalse(self.model.analytic_gradients)
+        self.assertEqual(1, self.model.parallel_workers)
+        self.assertFalse(self.model.warm_start)
+        self.assertEqual(0.1, self.model.adaptive_threshold)
+        self.assertEqual(50, self.model.adaptive_max_points)
         self.assertIsInstance(
             self.model._start_event_type(), WeightedMCOStartEvent)
         self.assertIsInstance(
             self.model._progress_event_type(), WeightedMCOProgressEvent)
+        self.assertIsInstance(
+            self.model._progress_event_type(), ITWMMCOProgressEvent)
+        self.assertFalse(self.model.asynchronous_events)
+        self.assertEqual(0, self.model.subprocess_pool_size)
+        self.assertEqual(0, self.model.subprocess_max_evaluations)
+        self.assertEqual(0.0, self.model.archive_epsilon)
 
-    def test_simple_run(self):
+    def _run_mco(self, side_effect=None, **model_traits):
+        """ Runs a new MCO whose model has the given traits, on a workflow
+        that always returns the same KPIs, or the KPIs returned by
+        `side_effect`.
+
+        Returns
+        -------
+        mco: WeightedMCO
+            The MCO after its run
+        events: list
+            The events notified by the model
+        execute: mock.Mock
+            The mocked `Workflow.execute`
+        """
         mco = self.factory.create_optimizer()
         model = self.factory.create_model()
         model.parameters = self.parameters
@@ -95,15 +125,107 @@ class TestWeightedMCO(TestCase, UnittestTools):
             KPISpecification(auto_scale=False),
             KPISpecification(auto_scale=False),
         ]
+        model.trait_set(**model_traits)
 
         evaluator = Workflow()
         evaluator.mco_model = model
+        events = []
+        model.on_trait_change(lambda event: events.append(event), "event")
         kpis = [DataValue(value=1), DataValue(value=2)]
-        with self.assertTraitChanges(evaluator.mco_model,
-                                     "event",
-                                     count=model.num_points):
-            with mock.patch(
-                "force_bdss.api.Workflow.execute", return_value=kpis
-            ) as mock_exec:
-                mco.run(evaluator)
-                self.assertEqual(54, mock_exec.call_count)
+        with mock.patch(
+            "force_bdss.api.Workflow.execute",
+            return_value=kpis,
+            side_effect=side_effect,
+        ) as execute:
+            mco.run(evaluator)
+        return mco, events, execute
+
+    def test_simple_run(self):
+        mco, events, execute = self._run_mco()
+        self.assertEqual(self.model.num_points, len(events))
+        self.assertEqual(54, execute.call_count)
+
+        # All points share the same KPIs, none dominates another
+        _, data = mco.pareto_archive.snapshot()
+        self.assertEqual(self.model.num_points, len(mco.pareto_archive))
+        self.assertEqual(list(range(self.model.num_points)),
+                         [sequence_id for sequence_id, *_ in data])
+
+    def test_archive_epsilon_run(self):
+        mco, _, _ = self._run_mco(archive_epsilon=0.5)
+        # The identical points share a box
+        self.assertEqual(1, len(mco.pareto_archive))
+
+    def test_parallel_run(self):
+        _, events, _ = self._run_mco(parallel_workers=2)
+        self.assertEqual(self.model.num_points, len(events))
+
+    def test_warm_start_run(self):
+        _, events, _ = self._run_mco(warm_start=True)
+        self.assertEqual(self.model.num_points, len(events))
+
+    def test_adaptive_run(self):
+        # All points share the same KPIs, so the front is not refined
+        _, events, _ = self._run_mco(space_search_mode="Adaptive")
+        self.assertEqual(self.model.num_points, len(events))
+
+    def test_asynchronous_run(self):
+        _, events, _ = self._run_mco(
+            parallel_workers=2, asynchronous_events=True)
+        self.assertEqual(
+            list(range(self.model.num_points)),
+            sorted(event.sequence_id for event in events))
+
+    def test_subprocess_pool_run(self):
+        _, events, execute = self._run_mco(
+            evaluation_mode="Subprocess", subprocess_pool_size=2)
+        self.assertEqual(self.model.num_points, len(events))
+        # All states are evaluated by the worker processes
+        self.assertEqual(0, execute.call_count)
+
+    def test_subprocess_pool_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pids")
+
+            def execute(parameter_values):
+                with open(path, "a") as pids:
+                    pids.write(f"{os.getpid()}\n")
+                time.sleep(0.01)
+                return [DataValue(value=1), DataValue(value=2)]
+
+            self._run_mco(
+                side_effect=execute,
+                evaluation_mode="Subprocess",
+                subprocess_pool_size=2,
+            )
+            with open(path) as pids:
+                pids = set(pids.read().split())
+
+        # Several workers serve the evaluations of the sweep
+        self.assertEqual(2, len(pids))
+        self.assertNotIn(str(os.getpid()), pids)
+
+    def test_analytic_gradients_run(self):
+        optimal_points = []
+        for analytic_gradients in [False, True]:
+            workflow = create_workflow(self.plugin)
+            model = workflow.mco_model
+            model.num_points = 3
+            model.analytic_gradients = analytic_gradients
+            events = []
+            model.on_trait_change(
+                lambda event: events.append(event), "event")
+            self.factory.create_optimizer().run(workflow)
+            optimal_points.append(
+                [[value.value for value in event.optimal_point]
+                 for event in events])
+
+        # The points are compared relative to the parameter ranges
+        lower = np.array([p.lower_bound for p in model.parameters])
+        upper = np.array([p.upper_bound for p in model.parameters])
+        finite_differences, analytic = (
+            (np.array(points) - lower) / (upper - lower)
+            for points in optimal_points
+        )
+        self.assertEqual(6, len(analytic))
+        np.testing.assert_allclose(analytic, finite_differences, atol=1e-2)
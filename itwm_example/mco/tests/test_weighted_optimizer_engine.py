@@ -0,0 +1,224 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from itertools import product
+import os
+from unittest import TestCase, mock
+
+import numpy as np
+
+from force_bdss.api import KPISpecification
+from force_bdss.mco.optimizers.scipy_optimizer import ScipyOptimizer
+
+from itwm_example.itwm_example_plugin import ITWMExamplePlugin
+from itwm_example.mco.fork_pool import shared_object
+from itwm_example.mco.parameters import ITWMRangedMCOParameterFactory
+from itwm_example.mco.tests.mock_classes import MockWeightedOptimizerEngine
+from itwm_example.mco.warm_start import snake_ordered_samples
+from itwm_example.mco.weighted_optimizer_engine import (
+    ITWMWeightedOptimizerEngine
+)
+
+
+class TestITWMWeightedOptimizerEngine(TestCase):
+    def setUp(self):
+        self.plugin = ITWMExamplePlugin()
+        self.factory = self.plugin.mco_factories[0]
+        parameter_factory = ITWMRangedMCOParameterFactory(self.factory)
+        self.parameters = [
+            parameter_factory.create_model(
+                {"lower_bound": 0.0, "upper_bound": 1.0,
+                 "initial_value": value}
+            )
+            for value in [0.25, 0.75]
+        ]
+        self.engine = ITWMWeightedOptimizerEngine(
+            kpis=[KPISpecification(),
+                  KPISpecification(objective="MAXIMISE")],
+            parameters=self.parameters,
+            optimizer=ScipyOptimizer(algorithms="SLSQP"),
+        )
+
+    def test_initial_parameter_value(self):
+        np.testing.assert_allclose(
+            [0.25, 0.75], self.engine.initial_parameter_value)
+
+        self.engine.initial_point = [0.5, 0.5]
+        np.testing.assert_allclose(
+            [0.5, 0.5], self.engine.initial_parameter_value)
+
+        self.engine.initial_point = None
+        np.testing.assert_allclose(
+            [0.25, 0.75], self.engine.initial_parameter_value)
+
+    def test_objective_signs(self):
+        np.testing.assert_array_equal(
+            [1.0, -1.0], self.engine.objective_signs())
+
+    def test_analytic_gradients(self):
+        calls = []
+
+        def kpi_jacobian(x):
+            calls.append(x)
+            kpis = np.array([
+                np.sum((x - [0.3, 0.6]) ** 2),
+                - np.sum((x - [0.5, 0.2]) ** 2),
+            ])
+            jacobian = np.array([2 * (x - [0.3, 0.6]), -2 * (x - [0.5, 0.2])])
+            return kpis, jacobian
+
+        self.engine.kpi_jacobian = kpi_jacobian
+        point, kpis = self.engine._weighted_optimize([1.0, 0.0])
+        np.testing.assert_allclose([0.3, 0.6], point, atol=1e-6)
+        self.assertAlmostEqual(0.0, kpis[0])
+
+        point, _ = self.engine._weighted_optimize([0.5, 0.5])
+        np.testing.assert_allclose([0.4, 0.4], point, atol=1e-6)
+        self.assertLess(len(calls), 50)
+
+
+class TestWarmStartOptimize(TestCase):
+    def setUp(self):
+        self.engine = MockWeightedOptimizerEngine(
+            sweep_weights=[
+                weights
+                for weights in product(np.linspace(0, 1, 5), repeat=3)
+                if np.isclose(sum(weights), 1)
+            ],
+            scaling_factors=[1.0, 2.0, 1.0],
+            kpi_function=lambda weights: [sum(weights)],
+        )
+
+    def test_scaled_weights_samples(self):
+        samples = self.engine.scaled_weights_samples()
+        self.assertEqual(15, len(samples))
+        for weights, scaled_weights in samples:
+            self.assertEqual(
+                [weights[0], 2 * weights[1], weights[2]], scaled_weights)
+
+    def test_warm_start_optimize(self):
+        samples = snake_ordered_samples(self.engine.scaled_weights_samples())
+        results = list(self.engine.warm_start_optimize())
+
+        self.assertEqual(len(samples), len(results))
+        initial_points = self.engine.initial_points
+        self.assertIsNone(initial_points[0])
+        for index in range(1, len(samples)):
+            # The previous weights are always among the nearest ones
+            np.testing.assert_allclose(
+                np.linalg.norm(
+                    np.array(samples[index][0])
+                    - np.array(samples[index - 1][0])),
+                np.linalg.norm(
+                    np.array(samples[index][0])
+                    - initial_points[index] / [1, 2, 1]),
+            )
+        for (_, scaled_weights), (point, _, result_weights) in zip(
+                samples, results):
+            self.assertEqual(scaled_weights, result_weights)
+            np.testing.assert_allclose(scaled_weights, point)
+        self.assertIsNone(self.engine.initial_point)
+
+
+class TestParallelOptimize(TestCase):
+    def setUp(self):
+        self.engine = MockWeightedOptimizerEngine(
+            sweep_weights=[[index / 5, 1 - index / 5] for index in range(6)],
+            scaling_factors=[1.0, 2.0],
+            kpi_function=lambda weights: [os.getpid()],
+        )
+        self.samples = self.engine.scaled_weights_samples()
+
+    def test_parallel_optimize(self):
+        results = list(self.engine.parallel_optimize(2))
+
+        self.assertEqual(
+            list(range(len(self.samples))),
+            [sequence_id for sequence_id, _ in results])
+        for (_, (point, kpis, weights)), (_, scaled_weights) in zip(
+                results, self.samples):
+            np.testing.assert_allclose(scaled_weights, point)
+            self.assertEqual(scaled_weights, weights)
+            self.assertNotEqual(os.getpid(), kpis[0])
+        self.assertIsNone(shared_object())
+
+    def test_parallel_warm_start(self):
+        expected = list(self.engine.warm_start_optimize())
+        results = list(self.engine.parallel_optimize(4, warm_start=True))
+
+        self.assertEqual(len(expected), len(results))
+        for (_, (point, _, weights)), (exp_point, _, exp_weights) in zip(
+                results, expected):
+            np.testing.assert_allclose(exp_point, point)
+            self.assertEqual(exp_weights, weights)
+
+    def test_serial_fallback(self):
+        with mock.patch(
+                "multiprocessing.get_all_start_methods",
+                return_value=["spawn"]):
+            results = list(self.engine.parallel_optimize(2))
+
+        self.assertEqual(len(self.samples), len(results))
+        for index, (sequence_id, (_, kpis, weights)) in enumerate(results):
+            self.assertEqual(index, sequence_id)
+            self.assertEqual(self.samples[index][1], weights)
+            self.assertEqual([os.getpid()], kpis)
+
+    def test_unordered(self):
+        results = list(self.engine.parallel_optimize(3, ordered=False))
+
+        self.assertEqual(len(self.samples), len(results))
+        for sequence_id, (point, _, weights) in results:
+            self.assertEqual(self.samples[sequence_id][1], weights)
+            np.testing.assert_allclose(weights, point)
+
+
+class TestAdaptiveOptimize(TestCase):
+    def setUp(self):
+        # The Pareto front is flat in the middle and bends at both ends
+        self.engine = MockWeightedOptimizerEngine(
+            sweep_weights=[
+                [weight, 1 - weight] for weight in np.linspace(0, 1, 5)],
+            scaling_factors=[1.0, 1.0],
+            kpi_function=lambda weights: [
+                weights[0] ** 4, (1 - weights[0]) ** 4],
+        )
+
+    def test_coarse_grid(self):
+        results = list(self.engine.adaptive_optimize(50, 2.0))
+        self.assertEqual(5, len(results))
+        np.testing.assert_allclose(
+            np.linspace(0, 1, 5),
+            [weights[0] for _, _, weights in results])
+
+    def test_refinement(self):
+        results = list(self.engine.adaptive_optimize(200, 0.1))
+        self.assertLess(5, len(results))
+        self.assertGreater(200, len(results))
+
+        weights = np.array(sorted(weights[0] for _, _, weights in results))
+        kpis = np.array([weights ** 4, (1 - weights) ** 4]).T
+        distances = np.linalg.norm(np.diff(kpis, axis=0), axis=1)
+        self.assertLessEqual(distances.max(), 0.1)
+
+        # The front is refined where it bends, not in its flat middle
+        steps = np.diff(weights)
+        self.assertLess(steps[0], steps[len(steps) // 2])
+        self.assertIsNone(self.engine.initial_point)
+        self.assertTrue(all(
+            point is None for point in self.engine.initial_points))
+
+    def test_max_points(self):
+        results = list(self.engine.adaptive_optimize(8, 0.01))
+        self.assertEqual(8, len(results))
+
+        results = list(self.engine.adaptive_optimize(3, 0.01))
+        self.assertEqual(3, len(results))
+
+    def test_warm_start(self):
+        list(self.engine.adaptive_optimize(10, 0.1, warm_start=True))
+        initial_points = self.engine.initial_points
+        self.assertTrue(all(point is None for point in initial_points[:5]))
+        self.assertTrue(all(
+            point is not None for point in initial_points[5:]))
+        self.assertIsNone(self.engine.initial_point)
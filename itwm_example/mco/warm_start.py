@@ -0,0 +1,52 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+
+def snake_order(weights, decimals=10):
+    """ Orders weight vectors along a snake path through the simplex.
+
+    The vectors are sorted by their first component, then within each
+    group of equal first components by their second component, and so
+    on, reversing the direction of every other group. Consecutive
+    vectors of a uniform simplex grid are then neighbours on the grid.
+
+    Parameters
+    ----------
+    weights: array_like
+        (N, M) array of weight vectors
+    decimals: int
+        Number of decimals of the components that are compared
+
+    Returns
+    -------
+    order: list of int
+        Indices of the weight vectors along the path
+    """
+    weights = np.round(np.asarray(weights, dtype=float), decimals)
+    if weights.size == 0:
+        return []
+    return _snake_order(weights, list(range(len(weights))), 0, False)
+
+
+def snake_ordered_samples(samples):
+    """ The (weights, scaled_weights) pairs of `samples`, ordered along
+    the snake path of their weights. See `snake_order`."""
+    order = snake_order([weights for weights, _ in samples])
+    return [samples[index] for index in order]
+
+
+def _snake_order(weights, indices, component, reverse):
+    if component >= weights.shape[1] - 1 or len(indices) <= 1:
+        return indices
+
+    values = sorted(set(weights[indices, component]), reverse=reverse)
+    order = []
+    for group_index, value in enumerate(values):
+        group = [
+            index for index in indices if weights[index, component] == value
+        ]
+        order += _snake_order(
+            weights, group, component + 1, group_index % 2 == 1)
+    return order
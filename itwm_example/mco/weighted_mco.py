@@ -1,46 +1,134 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+from contextlib import ExitStack
 import logging
 
+import numpy as np
+from traits.api import Instance
+
 from force_bdss.api import BaseMCO, DataValue
 
-from force_bdss.mco.optimizer_engines.weighted_optimizer_engine import (
-    WeightedOptimizerEngine
-)
 from force_bdss.mco.optimizers.scipy_optimizer import ScipyOptimizer
 
+from .constant_data_sources import cache_constant_data_sources
+from .evaluation_pool import (
+    PooledKPIJacobian, PooledWorkflow, evaluation_pool
+)
+from .kpi_jacobian import KPIJacobian
+from .pareto_archive import ParetoArchive
+from .weighted_optimizer_engine import ITWMWeightedOptimizerEngine
+
 
 log = logging.getLogger(__name__)
 
 
 class WeightedMCO(BaseMCO):
+
+    #: Non-dominated points of the last run, updated as each point is
+    #: notified. The archived data of a point is a tuple of its sequence
+    #: id, parameter values, KPI values and scaled weights.
+    pareto_archive = Instance(ParetoArchive)
+
     def run(self, evaluator):
 
         model = evaluator.mco_model
+        self.pareto_archive = ParetoArchive(
+            epsilon=model.archive_epsilon or None)
 
         optim = ScipyOptimizer(algorithms=model.algorithms)
 
-        optimizer = WeightedOptimizerEngine(
-            kpis=model.kpis,
-            parameters=model.parameters,
-            num_points=model.num_points,
-            space_search_mode=model.space_search_mode,
-            single_point_evaluator=evaluator,
-            verbose_run=model.verbose_run,
-            optimizer=optim,
-        )
-
-        for (
-            optimal_point,
-            optimal_kpis,
-            scaled_weights,
-        ) in optimizer.optimize():
-
-            # When there is new data, this operation informs the system that
-            # new data has been received. It must be a dictionary as given.
-            evaluator.mco_model.notify_progress_event(
-                [DataValue(value=v) for v in optimal_point],
-                [DataValue(value=v) for v in optimal_kpis],
-                weights=scaled_weights,
+        # The adaptive sweep starts from the uniform weights grid
+        if model.space_search_mode == "Adaptive":
+            space_search_mode = "Uniform"
+        else:
+            space_search_mode = model.space_search_mode
+
+        with ExitStack() as stack:
+            if model.cache_constant_sources:
+                stack.enter_context(cache_constant_data_sources(evaluator))
+
+            single_point_evaluator = evaluator
+            if (model.evaluation_mode == "Subprocess"
+                    and model.subprocess_pool_size > 0):
+                if model.parallel_workers > 1:
+                    log.warning(
+                        "The subprocess pool is not used together with "
+                        "parallel workers"
+                    )
+                else:
+                    single_point_evaluator = stack.enter_context(
+                        evaluation_pool(
+                            evaluator,
+                            model.subprocess_pool_size,
+                            model.subprocess_max_evaluations,
+                        )
+                    )
+
+            optimizer = ITWMWeightedOptimizerEngine(
+                kpis=model.kpis,
+                parameters=model.parameters,
+                num_points=model.num_points,
+                space_search_mode=space_search_mode,
+                single_point_evaluator=single_point_evaluator,
+                verbose_run=model.verbose_run,
+                optimizer=optim,
             )
+            if (model.analytic_gradients
+                    and model.evaluation_mode == "Internal"):
+                optimizer.kpi_jacobian = KPIJacobian(evaluator)
+            elif isinstance(single_point_evaluator, PooledWorkflow):
+                # The finite differences are shared between the workers
+                optimizer.kpi_jacobian = PooledKPIJacobian(
+                    single_point_evaluator)
+
+            signs = optimizer.objective_signs()
+            results = self._sweep_results(model, optimizer)
+            for sequence_id, (
+                optimal_point,
+                optimal_kpis,
+                scaled_weights,
+            ) in results:
+
+                self.pareto_archive.insert(
+                    signs * np.asarray(optimal_kpis, dtype=float),
+                    (sequence_id, optimal_point, optimal_kpis,
+                     scaled_weights),
+                )
+
+                # When there is new data, this operation informs the system
+                # that new data has been received. It must be a dictionary as
+                # given.
+                evaluator.mco_model.notify_progress_event(
+                    [DataValue(value=v) for v in optimal_point],
+                    [DataValue(value=v) for v in optimal_kpis],
+                    weights=scaled_weights,
+                    sequence_id=sequence_id,
+                )
+
+    def _sweep_results(self, model, optimizer):
+        """ Results of the weight sweep selected by the MCO `model`, each
+        paired with its sequence id."""
+        if model.space_search_mode == "Adaptive":
+            if model.parallel_workers > 1:
+                log.warning(
+                    "The Adaptive space search mode runs serially, "
+                    "parallel_workers is ignored"
+                )
+            return enumerate(optimizer.adaptive_optimize(
+                model.adaptive_max_points,
+                model.adaptive_threshold,
+                warm_start=model.warm_start,
+            ))
+
+        if model.parallel_workers > 1:
+            return optimizer.parallel_optimize(
+                model.parallel_workers,
+                warm_start=model.warm_start,
+                ordered=not model.asynchronous_events,
+            )
+
+        if model.warm_start:
+            return enumerate(optimizer.warm_start_optimize())
+
+        return enumerate(optimizer.optimize())
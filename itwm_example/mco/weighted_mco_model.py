@@ -1,18 +1,19 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from traits.api import Enum, Bool
+from traits.api import Enum, Bool, Float, Int
 from traitsui.api import View, Item
 
 from force_bdss.api import (
     BaseMCOModel,
     PositiveInt,
     WeightedMCOStartEvent,
-    WeightedMCOProgressEvent
 )
 
 from force_bdss.mco.optimizers.scipy_optimizer import ScipyOptimizer
 
+from .driver_events import ITWMMCOProgressEvent
+
 
 class WeightedMCOModel(BaseMCOModel):
 
@@ -27,24 +28,89 @@ class WeightedMCOModel(BaseMCOModel):
     #: Display the generated points at runtime
     verbose_run = Bool(True)
 
-    #: Space search distribution for weight points sampling
-    space_search_mode = Enum("Uniform", "Dirichlet")
+    #: Space search distribution for weight points sampling. "Adaptive"
+    #: starts from the uniform grid and refines it where the Pareto front
+    #: bends.
+    space_search_mode = Enum("Uniform", "Dirichlet", "Adaptive")
+
+    #: Largest distance between neighbouring Pareto points left by the
+    #: "Adaptive" mode, as a fraction of the extent of the front
+    adaptive_threshold = Float(0.1)
+
+    #: Maximum number of optimizations run by the "Adaptive" mode
+    adaptive_max_points = PositiveInt(50)
 
     #: 'Subprocess' mode performs evaluation of a state in the workflow via
     #: calling force_bdss on a new subprocess with SubprocessWorkflowEvaluator
     evaluation_mode = Enum("Internal", "Subprocess")
 
+    #: Number of persistent worker processes evaluating the states in the
+    #: 'Subprocess' mode. The states of the finite difference gradients
+    #: are evaluated concurrently by the workers. A new subprocess is
+    #: started for each evaluation when 0.
+    subprocess_pool_size = Int(0)
+
+    #: Number of evaluations after which a worker process of the pool is
+    #: replaced by a new one. Workers are never replaced when 0.
+    subprocess_max_evaluations = Int(0)
+
+    #: Chain the gradients output by the data sources into the Jacobian
+    #: of the KPIs passed to the optimizer, instead of approximating it by
+    #: finite differences of the whole workflow. Only used in the
+    #: 'Internal' evaluation mode.
+    analytic_gradients = Bool(False)
+
+    #: Run the constant data sources of the workflow only once, and reuse
+    #: their outputs for every evaluation
+    cache_constant_sources = Bool(True)
+
+    #: Number of worker processes sharing the optimizations of the weight
+    #: sweep. The sweep runs serially in the current process when 1.
+    parallel_workers = PositiveInt(1)
+
+    #: Notify the progress event of each optimization run by the parallel
+    #: workers as soon as it completes, instead of in the weight sweep
+    #: order. The sequence_id of the events gives their sweep order.
+    asynchronous_events = Bool(False)
+
+    #: Order the weight vectors along a snake path through the simplex, and
+    #: start each optimization from the optimum of the nearest weight
+    #: vector already optimized
+    warm_start = Bool(False)
+
+    #: Size, in the units of the KPIs, of the boxes of the epsilon
+    #: dominance used by the Pareto archive of the run. A box holds at
+    #: most one point, which bounds the size of the archive. Dominance is
+    #: tested between the points themselves when 0.
+    archive_epsilon = Float(0.0)
+
     def default_traits_view(self):
         return View(
             Item("evaluation_mode"),
+            Item("subprocess_pool_size",
+                 visible_when="evaluation_mode == 'Subprocess'"),
+            Item("subprocess_max_evaluations",
+                 visible_when="evaluation_mode == 'Subprocess'"),
             Item("algorithms"),
             Item("num_points", label="Weights grid resolution per KPI"),
             Item("space_search_mode"),
+            Item("adaptive_threshold",
+                 visible_when="space_search_mode == 'Adaptive'"),
+            Item("adaptive_max_points",
+                 visible_when="space_search_mode == 'Adaptive'"),
             Item("verbose_run"),
+            Item("analytic_gradients",
+                 enabled_when="evaluation_mode == 'Internal'"),
+            Item("cache_constant_sources"),
+            Item("parallel_workers"),
+            Item("asynchronous_events",
+                 enabled_when="parallel_workers > 1"),
+            Item("warm_start"),
+            Item("archive_epsilon"),
         )
 
     def __start_event_type_default(self):
         return WeightedMCOStartEvent
 
     def __progress_event_type_default(self):
-        return WeightedMCOProgressEvent
+        return ITWMMCOProgressEvent
@@ -0,0 +1,289 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from functools import partial
+import logging
+
+import numpy as np
+from scipy import optimize as scipy_optimize
+from traits.api import Any, Property
+
+from force_bdss.mco.optimizer_engines.weighted_optimizer_engine import (
+    WeightedOptimizerEngine
+)
+
+from .adaptive_sweep import refinement_candidates
+from .fork_pool import fork_pool, shared_object
+from .warm_start import snake_ordered_samples
+
+log = logging.getLogger(__name__)
+
+
+class ITWMWeightedOptimizerEngine(WeightedOptimizerEngine):
+    """ Weighted optimizer engine whose optimizations can be started
+    from a given point, instead of the initial values of the
+    parameters, and can use a given Jacobian of the KPIs.
+
+    Besides `optimize()`, the weight sweep can be warm started, run on
+    worker processes, or refined where the Pareto front bends."""
+
+    #: Starting point of the following optimizations. The initial values
+    #: of the parameters are used when None.
+    initial_point = Any()
+
+    #: Starting point of the optimizations
+    initial_parameter_value = Property(depends_on="initial_point")
+
+    #: Callable returning the KPI values and their Jacobian with respect
+    #: to the parameters, see `KPIJacobian` and `PooledKPIJacobian`. The
+    #: optimizer approximates the gradient of the weighted score by
+    #: finite differences when None.
+    kpi_jacobian = Any()
+
+    def _get_initial_parameter_value(self):
+        if self.initial_point is None:
+            return super()._get_initial_parameter_value()
+        return np.array(self.initial_point, dtype=float)
+
+    def _weighted_optimize(self, weights):
+        if self.kpi_jacobian is None:
+            return super()._weighted_optimize(weights)
+
+        log.info(
+            "Running optimisation with the KPI Jacobian. "
+            f"Initial point: {self.initial_parameter_value}. "
+            f"Bounds: {self.parameter_bounds}"
+        )
+        signed_weights = np.asarray(weights) * self.objective_signs()
+
+        def weighted_score(parameter_values):
+            kpis, jacobian = self.kpi_jacobian(parameter_values)
+            return signed_weights @ kpis, signed_weights @ jacobian
+
+        optimization_result = scipy_optimize.minimize(
+            weighted_score,
+            self.initial_parameter_value,
+            jac=True,
+            method=self.optimizer.algorithms,
+            bounds=self.parameter_bounds,
+        )
+        optimal_point = optimization_result.x
+        optimal_kpis, _ = self.kpi_jacobian(optimal_point)
+        return optimal_point, optimal_kpis
+
+    def objective_signs(self):
+        """ Signs turning each KPI into a quantity to minimise: 1 for
+        the KPIs to minimise, -1 for the KPIs to maximise."""
+        return np.array([
+            -1.0 if kpi.objective == "MAXIMISE" else 1.0
+            for kpi in self.kpis
+        ])
+
+    def scaled_weights_samples(self):
+        """ Weight vectors of the sweep.
+
+        Returns
+        -------
+        samples: list of tuple
+            (weights, scaled_weights) pairs, in `weights_samples()`
+            order. The scaled weights are multiplied by the KPI scaling
+            factors.
+        """
+        scaling_factors = self.get_scaling_factors()
+        return [
+            (
+                list(weights),
+                [weight * scale
+                 for weight, scale in zip(weights, scaling_factors)]
+            )
+            for weights in self.weights_samples()
+        ]
+
+    def warm_start_optimize(self, samples=None):
+        """ Runs the weighted optimizations of the sweep in the given
+        order, starting each one from the optimum of the nearest weight
+        vector already optimized.
+
+        Parameters
+        ----------
+        samples: list of tuple, optional
+            (weights, scaled_weights) pairs, see `scaled_weights_samples`.
+            The samples of the sweep ordered along their snake path (see
+            `snake_order`) when None.
+
+        Yields
+        ------
+        optimal_point, optimal_kpis, scaled_weights:
+            Results of each optimization, as yielded by `optimize()`
+        """
+        if samples is None:
+            samples = snake_ordered_samples(self.scaled_weights_samples())
+
+        converged_weights = []
+        converged_points = []
+        try:
+            for weights, scaled_weights in samples:
+                initial_point = None
+                if converged_points:
+                    distances = np.linalg.norm(
+                        np.array(converged_weights) - weights, axis=1)
+                    initial_point = converged_points[
+                        int(np.argmin(distances))]
+                result = self._optimize_weights(scaled_weights, initial_point)
+
+                converged_weights.append(weights)
+                converged_points.append(result[0])
+                yield result
+        finally:
+            self.initial_point = None
+
+    def parallel_optimize(self, processes, warm_start=False, ordered=True):
+        """ Distributes the weighted optimizations of the sweep across a
+        pool of worker processes.
+
+        Each weight vector is an independent optimization, so the sweep
+        is split into one task per weight vector. With `warm_start`, the
+        weight vectors are ordered along a snake path through the simplex
+        and the path is split into one contiguous section per worker,
+        each warm started serially.
+
+        Each result is paired with its sequence id, the position of its
+        weight vector in the sweep: the order of the weights samples, or
+        the path order. If `ordered`, results are yielded by sequence id.
+        Otherwise they are yielded as soon as their task completes, so
+        that a slow optimization does not hold back the others.
+
+        Worker processes are forked from the current process, see
+        `fork_pool`. Where forking is not available, the sweep runs
+        serially.
+
+        Parameters
+        ----------
+        processes: int
+            Number of worker processes
+        warm_start: bool
+            Whether to warm start the optimizations
+        ordered: bool
+            Whether to yield the results by sequence id
+
+        Yields
+        ------
+        sequence_id: int
+            Position of the weight vector in the sweep
+        result: tuple
+            The (optimal_point, optimal_kpis, scaled_weights) result of
+            the optimization, as yielded by `optimize()`
+        """
+        samples = self.scaled_weights_samples()
+        if warm_start:
+            samples = snake_ordered_samples(samples)
+        indexed_samples = list(enumerate(samples))
+
+        if warm_start:
+            chunks = [
+                [indexed_samples[index] for index in chunk]
+                for chunk in np.array_split(
+                    np.arange(len(indexed_samples)), processes)
+            ]
+        else:
+            chunks = [[indexed_sample] for indexed_sample in indexed_samples]
+
+        with fork_pool(processes, self) as pool:
+            if pool is None:
+                yield from self._optimize_chunk(indexed_samples, warm_start)
+                return
+
+            if ordered:
+                imap = pool.imap
+            else:
+                imap = pool.imap_unordered
+            for results in imap(
+                    partial(_worker_optimize, warm_start=warm_start),
+                    chunks):
+                yield from results
+
+    def adaptive_optimize(self, max_points, threshold, warm_start=False):
+        """ Weight sweep that refines the Pareto front where it bends.
+
+        The sweep starts with the coarse grid of weight vectors of the
+        engine. It then repeatedly adds the midpoint of neighbouring
+        weight vectors whose optimal KPIs are further apart than
+        `threshold`, until no such pair is left or `max_points`
+        optimizations have been run. See `refinement_candidates`.
+
+        Parameters
+        ----------
+        max_points: int
+            Maximum number of optimizations
+        threshold: float
+            Largest scaled KPI distance left between neighbouring points
+        warm_start: bool
+            Whether to start each refinement optimization from the
+            optimum of the weight vectors it is the midpoint of
+
+        Yields
+        ------
+        optimal_point, optimal_kpis, scaled_weights:
+            Results of each optimization, as yielded by `optimize()`
+        """
+        scaling_factors = np.asarray(self.get_scaling_factors(), dtype=float)
+
+        weights = []
+        points = []
+        kpis = []
+
+        def optimize(sample_weights, initial_point=None):
+            result = self._optimize_weights(
+                list(sample_weights * scaling_factors), initial_point)
+            weights.append(sample_weights)
+            points.append(result[0])
+            kpis.append(np.asarray(result[1], dtype=float))
+            return result
+
+        try:
+            for sample_weights in self.weights_samples():
+                if len(weights) >= max_points:
+                    return
+                yield optimize(np.asarray(sample_weights, dtype=float))
+
+            while len(weights) < max_points:
+                candidates = refinement_candidates(
+                    np.array(weights), np.array(kpis), threshold)
+                if not candidates:
+                    return
+                for first, second in candidates:
+                    if len(weights) >= max_points:
+                        return
+                    initial_point = points[first] if warm_start else None
+                    yield optimize(
+                        0.5 * (weights[first] + weights[second]),
+                        initial_point)
+        finally:
+            self.initial_point = None
+
+    def _optimize_weights(self, scaled_weights, initial_point=None):
+        """ Runs the weighted optimization of one weight vector, started
+        from `initial_point`, or from the initial values of the
+        parameters when None. Returns the (optimal_point, optimal_kpis,
+        scaled_weights) result, as yielded by `optimize()`."""
+        self.initial_point = initial_point
+        log.info(f"Doing MCO run with weights: {scaled_weights}")
+        optimal_point, optimal_kpis = self._weighted_optimize(scaled_weights)
+        return optimal_point, optimal_kpis, scaled_weights
+
+    def _optimize_chunk(self, indexed_samples, warm_start):
+        """ Runs the optimizations of (sequence_id, sample) pairs, and
+        yields their results paired with the sequence ids."""
+        sequence_ids = [sequence_id for sequence_id, _ in indexed_samples]
+        samples = [sample for _, sample in indexed_samples]
+        if warm_start:
+            yield from zip(sequence_ids, self.warm_start_optimize(samples))
+            return
+
+        for sequence_id, (_, scaled_weights) in zip(sequence_ids, samples):
+            yield sequence_id, self._optimize_weights(scaled_weights)
+
+
+def _worker_optimize(indexed_samples, warm_start):
+    return list(
+        shared_object()._optimize_chunk(indexed_samples, warm_start))
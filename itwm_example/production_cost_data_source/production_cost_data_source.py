@@ -1,6 +1,8 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import numpy as np
+
 from force_bdss.api import BaseDataSource, DataValue, Slot
 
 
@@ -11,32 +13,51 @@ class ProductionCostDataSource(BaseDataSource):
     temperature_zero_kelvin = -270
 
     def run(self, model, parameters):
-        temperature = parameters[0].value
-        reaction_time = parameters[1].value
-
-        temperature_celsius = self.kelvin_to_celsius(temperature)
-        temperature_difference = temperature_celsius - model.temperature_shift
-        cost = (
-                reaction_time
-                * temperature_difference**2
-                * model.W
-        )
-        cost_gradient = [
-                reaction_time * 2.0 * temperature_difference * model.W,
-                temperature_difference**2 * model.W
-        ]
-
+        cost, cost_gradient = self.run_batch(
+            model, [[parameter.value for parameter in parameters]])
         return [
             DataValue(
                 type="COST",
-                value=cost
+                value=float(cost[0])
             ),
             DataValue(
                 type="COST_GRADIENT",
-                value=cost_gradient
+                value=cost_gradient[0].tolist()
             )
         ]
 
+    def run_batch(self, model, parameter_matrix):
+        """ Evaluates the data source for many sets of input slot values
+        at once.
+
+        Parameters
+        ----------
+        model: ProductionCostDataSourceModel
+            Model of the data source
+        parameter_matrix: array_like
+            (N, 2) array of temperatures and reaction times, one row per
+            evaluation point
+
+        Returns
+        -------
+        cost: np.ndarray
+            (N,) array of production costs
+        cost_gradient: np.ndarray
+            (N, 2) array of production cost gradients
+        """
+        parameter_matrix = np.atleast_2d(
+            np.asarray(parameter_matrix, dtype=float))
+        temperature, reaction_time = parameter_matrix.T
+
+        temperature_celsius = self.kelvin_to_celsius(temperature)
+        temperature_difference = temperature_celsius - model.temperature_shift
+        cost = reaction_time * temperature_difference**2 * model.W
+        cost_gradient = np.column_stack([
+            reaction_time * 2.0 * temperature_difference * model.W,
+            temperature_difference**2 * model.W
+        ])
+        return cost, cost_gradient
+
     def slots(self, model):
         return (
             (
@@ -1,6 +1,8 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import numpy as np
+
 from itwm_example.tests.template_test_classes.template_test_data_source \
     import TemplateTestGradientDataSource
 
@@ -12,3 +14,15 @@ class TestProductionCostDataSource(TemplateTestGradientDataSource):
     @property
     def test_outputs(self):
         return [0.0, self.model.W]
+
+    def test_run_batch(self):
+        inputs = self.test_inputs + [[350.0, 2670.0]]
+        cost, cost_gradient = self.data_source.run_batch(
+            self.model, np.array(inputs))
+        self.assertEqual((3,), cost.shape)
+        self.assertEqual((3, 2), cost_gradient.shape)
+
+        for index, values in enumerate(inputs):
+            value, gradient = self.basic_evaluation(values)
+            self.assertAlmostEqual(value.value, cost[index])
+            np.testing.assert_allclose(gradient.value, cost_gradient[index])
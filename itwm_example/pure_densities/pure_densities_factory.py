@@ -1,14 +1,15 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+from itwm_example.core.constant_data_source_factory import (
+    ConstantDataSourceFactory
+)
 from itwm_example.pure_densities.pure_densities import PureDensities
 from itwm_example.pure_densities.pure_densities_model import PureDensitiesModel
 
-from force_bdss.data_sources.base_data_source_factory import \
-    BaseDataSourceFactory
 
+class PureDensitiesFactory(ConstantDataSourceFactory):
 
-class PureDensitiesFactory(BaseDataSourceFactory):
     def get_identifier(self):
         return "pure_densities"
 
@@ -0,0 +1,77 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from force_bdss.api import (
+    ExecutionLayer,
+    InputSlotInfo,
+    KPISpecification,
+    OutputSlotInfo,
+    Workflow,
+)
+
+from itwm_example.mco.parameters import ITWMRangedMCOParameterFactory
+
+
+def create_data_source_model(factory, inputs, outputs):
+    """ Model of the data source of `factory`, with the named input and
+    output slots."""
+    model = factory.create_model()
+    model.input_slot_info = [InputSlotInfo(name=name) for name in inputs]
+    model.output_slot_info = [OutputSlotInfo(name=name) for name in outputs]
+    return model
+
+
+def create_workflow(plugin):
+    """ Workflow of the ITWM example, as in itwm_weighted_mco.json."""
+    mco_factory = plugin.mco_factories[0]
+    parameter_factory = ITWMRangedMCOParameterFactory(mco_factory)
+    factories = plugin.data_source_factories
+
+    mco_model = mco_factory.create_model()
+    mco_model.parameters = [
+        parameter_factory.create_model({
+            "name": name, "lower_bound": lower, "upper_bound": upper,
+            "n_samples": 3,
+        })
+        for name, lower, upper in [
+            ("volume_a_tilde", 0.01, 1.0),
+            ("conc_e", 0.001, 0.1),
+            ("temperature", 270.0, 400.0),
+            ("reaction_time", 1.0, 3600.0),
+        ]
+    ]
+    mco_model.kpis = [
+        KPISpecification(name=name)
+        for name in ["impurity_conc", "mat_cost", "prod_cost"]
+    ]
+
+    constants = ExecutionLayer(data_sources=[
+        create_data_source_model(
+            factories[2], [],
+            ["arr_nu_main", "arr_dh_main", "arr_nu_sec", "arr_dh_sec"]),
+        create_data_source_model(
+            factories[5], [], ["a_density", "b_density", "c_density"]),
+        create_data_source_model(
+            factories[0], [], ["reactor_volume"]),
+    ])
+    constants.data_sources[2].cuba_type_out = "VOLUME"
+    constants.data_sources[2].value = 1.0
+
+    kpis = ExecutionLayer(data_sources=[
+        create_data_source_model(
+            factories[4],
+            ["volume_a_tilde", "conc_e", "temperature", "reaction_time",
+             "arr_nu_main", "arr_dh_main", "arr_nu_sec", "arr_dh_sec",
+             "reactor_volume", "a_density", "b_density", "c_density"],
+            ["impurity_conc", "impurity_conc_grad"]),
+        create_data_source_model(
+            factories[3],
+            ["volume_a_tilde", "conc_e", "reactor_volume", "c_density"],
+            ["mat_cost", "mat_cost_grad"]),
+        create_data_source_model(
+            factories[1],
+            ["temperature", "reaction_time"],
+            ["prod_cost", "prod_cost_grad"]),
+    ])
+
+    return Workflow(mco_model=mco_model, execution_layers=[constants, kpis])
@@ -46,14 +46,15 @@ class TaylorTest:
             function,
             gradient,
             input_dimension,
-            slope_tolerance=1.e-2
+            slope_tolerance=1.e-2,
+            step_size=1.e-6
     ):
         self._function = function
         self._gradient = gradient
         self._input_dimension = input_dimension
         self.slope_tolerance = slope_tolerance
 
-        self._default_step_size = 1.e-6
+        self._default_step_size = step_size
         self._default_nof_evaluations = 5
 
     def _evaluate_function(self, point):
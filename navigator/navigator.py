@@ -529,7 +529,12 @@ class PLayout(BoxLayout):
         #data_dump = np.load('../main/pareto_data.npz')
         data_dump = np.load('pareto_data.npz')
         self.N = len(self.names)
-        self.Ne = data_dump[self.names[0]].shape[0]
+        # only the Pareto front is navigated, when the ranks are stored
+        if "rank" in data_dump:
+            front = data_dump["rank"] == 1
+        else:
+            front = slice(None)
+        self.Ne = data_dump["volume_A_tilde"][front].shape[0]
         i = self.N
         for j in range(self.N):
             if "[min]" in self.names[j]:
@@ -537,13 +542,13 @@ class PLayout(BoxLayout):
                 self.names[j], self.names[i] = self.names[i], self.names[j]
         self.Np = i
         self.data = np.zeros((self.N, self.Ne), dtype=np.float)
-        self.data[0, :] = data_dump['volume_A_tilde']
-        self.data[1, :] = data_dump['conc_e']
-        self.data[2, :] = data_dump['temperature']
-        self.data[3, :] = data_dump['reaction_time']
-        self.data[4, :] = data_dump['impurity_conc']
-        self.data[5, :] = data_dump['prod_cost']
-        self.data[6, :] = data_dump['mat_cost']
+        self.data[0, :] = data_dump['volume_A_tilde'][front]
+        self.data[1, :] = data_dump['conc_e'][front]
+        self.data[2, :] = data_dump['temperature'][front]
+        self.data[3, :] = data_dump['reaction_time'][front]
+        self.data[4, :] = data_dump['impurity_conc'][front]
+        self.data[5, :] = data_dump['prod_cost'][front]
+        self.data[6, :] = data_dump['mat_cost'][front]
 
         # idxarray = np.array(range(self.Ne - 1, -1, -1))
         # self.data[self.N - 1, :] = self.data[self.N - 2, idxarray]